@@ -0,0 +1,71 @@
+"""
+Compare deux fichiers de résultats de benchmarks/run.py.
+
+Pour chaque cas présent dans les deux fichiers, affiche le rapport de
+temps (nouveau / ancien) et de pic mémoire. Un cas est une régression si
+son temps augmente de plus de `--threshold` (10 % par défaut) ; le code
+de sortie vaut alors 1, pour pouvoir bloquer une CI.
+
+Usage :
+    python -m benchmarks.compare ancien.json nouveau.json [--threshold 0.10]
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from typing import Any, Dict, List, Optional
+
+
+def load(path: str) -> Dict[str, Dict[str, Any]]:
+    with open(path, "r", encoding="utf-8") as f:
+        report = json.load(f)
+    return {r["name"]: r for r in report["results"]}
+
+
+def compare(
+    old: Dict[str, Dict[str, Any]],
+    new: Dict[str, Dict[str, Any]],
+    threshold: float,
+) -> List[Dict[str, Any]]:
+    rows = []
+    for name, n in new.items():
+        o = old.get(name)
+        if o is None:
+            continue
+        time_ratio = n["seconds"] / o["seconds"] if o["seconds"] else float("inf")
+        mem_ratio = n["peak_bytes"] / o["peak_bytes"] if o["peak_bytes"] else float("inf")
+        rows.append({
+            "name": name,
+            "old_seconds": o["seconds"],
+            "new_seconds": n["seconds"],
+            "time_ratio": time_ratio,
+            "memory_ratio": mem_ratio,
+            "regression": time_ratio > 1.0 + threshold,
+        })
+    return rows
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    ap.add_argument("old")
+    ap.add_argument("new")
+    ap.add_argument("--threshold", type=float, default=0.10,
+                    help="hausse de temps tolérée avant de signaler une régression")
+    args = ap.parse_args(argv)
+
+    rows = compare(load(args.old), load(args.new), args.threshold)
+    for r in rows:
+        flag = "  <-- RÉGRESSION" if r["regression"] else ""
+        print(
+            f"{r['name']:<42} {r['old_seconds'] * 1e3:>10.3f} ms -> {r['new_seconds'] * 1e3:>10.3f} ms"
+            f"  x{r['time_ratio']:.2f} temps  x{r['memory_ratio']:.2f} mémoire{flag}"
+        )
+    regressions = sum(r["regression"] for r in rows)
+    print(f"{len(rows)} cas comparés, {regressions} régression(s)")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
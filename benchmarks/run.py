@@ -0,0 +1,267 @@
+"""
+Suite de benchmarks du pipeline DSL -> Manim.
+
+Mesure, sur des corpus déterministes :
+- parse.lark.tree       : parse Lark seul (construction du Tree)
+- parse.lark.transform  : transformation ASTBuilder d'un Tree déjà construit
+- parse_string.<backend>: parse complet, pour chaque backend
+- codegen               : generate_manim_scene
+- codec.dumps / codec.loads : codec binaire (parser_manim.codec), un
+                          enregistrement par corpus ; l'aller-retour est
+                          vérifié avant la mesure, et aussi à la limite
+                          des tailles de programme u16 (65535 / 65536)
+- generate_pairs        : génération de paires de bout en bout
+
+Corpus :
+- "pairs"        : les programmes DSL de generate_pairs(N_PAIRS, seed=SEED),
+                   traités un par un (coût par programme typique) ;
+- "synthetic-<n>": un seul programme de n instructions (1 à 100k), tiré avec
+                   le même échantillonneur que le générateur de paires.
+
+Pour chaque cas : meilleur temps sur `repeat` mesures (chaque mesure
+enchaîne assez d'appels pour durer ~0.2 s), ops/s, coût par instruction
+et pic mémoire (tracemalloc, mesure séparée). Les résultats sont écrits
+en JSON, à comparer entre commits avec benchmarks/compare.py.
+
+Usage :
+    python -m benchmarks.run [--out bench.json] [--max-size 100000] [--repeat 3]
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import platform
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional
+
+from generer_manim.pair_generator import _build_program_ast, generate_pairs
+from parser_manim import codec
+from parser_manim.ast_nodes import Program
+from parser_manim.parser_engine import BACKENDS, _get_builder, _get_parser, parse_string
+from parser_manim.unparser import unparse
+from traducteur_manim.generator import generate_manim_scene
+
+
+SEED = 1234
+N_PAIRS = 2_000
+SIZES = (1, 10, 100, 1_000, 10_000, 100_000)
+MIN_MEASURE_SECONDS = 0.2
+
+
+# ---------- Corpus ----------
+
+def synthetic_program(n_instructions: int, seed: int = SEED) -> Program:
+    """Programme déterministe d'exactement n_instructions instructions."""
+    rng = random.Random(f"bench:{seed}:{n_instructions}")
+    instructions = []
+    while len(instructions) < n_instructions:
+        instructions.extend(_build_program_ast(rng).instructions)
+    return Program(instructions=instructions[:n_instructions])
+
+
+# ---------- Mesure ----------
+
+def _time(fn: Callable[[], Any], repeat: int) -> tuple[float, int]:
+    """Meilleur temps par appel (s) et nombre d'appels par mesure."""
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        elapsed = time.perf_counter() - start
+        if elapsed >= MIN_MEASURE_SECONDS or number >= 1 << 20:
+            break
+        number *= 2
+
+    best = elapsed / number
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeat - 1):
+            start = time.perf_counter()
+            for _ in range(number):
+                fn()
+            best = min(best, (time.perf_counter() - start) / number)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    return best, number
+
+
+def _peak_memory(fn: Callable[[], Any]) -> int:
+    gc.collect()
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def measure(
+    name: str,
+    corpus: str,
+    fn: Callable[[], Any],
+    ops: int,
+    instructions: int,
+    repeat: int,
+) -> Dict[str, Any]:
+    """
+    fn traite `ops` opérations (programmes / paires) totalisant
+    `instructions` instructions.
+    """
+    seconds, number = _time(fn, repeat)
+    result = {
+        "name": f"{name}[{corpus}]",
+        "stage": name,
+        "corpus": corpus,
+        "ops": ops,
+        "instructions": instructions,
+        "seconds": seconds,
+        "ops_per_sec": ops / seconds if seconds else None,
+        "ns_per_instruction": seconds / instructions * 1e9 if instructions else None,
+        "peak_bytes": _peak_memory(fn),
+        "calls_per_measure": number,
+    }
+    print(
+        f"{result['name']:<42} {seconds * 1e3:>10.3f} ms"
+        f"  {result['ops_per_sec']:>12.1f} ops/s"
+        f"  {result['ns_per_instruction'] or 0:>10.0f} ns/instr"
+        f"  {result['peak_bytes'] / 1e6:>8.2f} MB",
+        flush=True,
+    )
+    return result
+
+
+# ---------- Cas ----------
+
+def _bench_sources(corpus: str, sources: List[str], instructions: int, repeat: int) -> List[Dict[str, Any]]:
+    results = []
+    parser = _get_parser()
+    builder = _get_builder()
+    trees = [parser.parse(s) for s in sources]
+    programs = [parse_string(s, backend="fast") for s in sources]
+    ops = len(sources)
+
+    results.append(measure(
+        "parse.lark.tree", corpus, lambda: [parser.parse(s) for s in sources],
+        ops, instructions, repeat,
+    ))
+    results.append(measure(
+        "parse.lark.transform", corpus, lambda: [builder.transform(t) for t in trees],
+        ops, instructions, repeat,
+    ))
+    for backend in BACKENDS:
+        results.append(measure(
+            f"parse_string.{backend}", corpus,
+            lambda backend=backend: [parse_string(s, backend=backend) for s in sources],
+            ops, instructions, repeat,
+        ))
+    results.append(measure(
+        "codegen", corpus, lambda: [generate_manim_scene(p) for p in programs],
+        ops, instructions, repeat,
+    ))
+    data = codec.dumps_many(programs)
+    _check_round_trip(programs, data, corpus)
+    results.append(measure(
+        "codec.dumps", corpus, lambda: codec.dumps_many(programs),
+        ops, instructions, repeat,
+    ))
+    results.append(measure(
+        "codec.loads", corpus, lambda: codec.loads_many(data),
+        ops, instructions, repeat,
+    ))
+    return results
+
+
+def _check_round_trip(programs: List[Program], data: bytes, corpus: str) -> None:
+    if codec.loads_many(data) != programs:
+        raise AssertionError(f"Aller-retour du codec inexact sur {corpus}")
+
+
+def check_codec_limits() -> None:
+    """Aller-retour du codec de part et d'autre de la limite u16 des tailles."""
+    for size in (0xFFFF, 0x10000):
+        program = synthetic_program(size)
+        _check_round_trip([program], codec.dumps(program), f"synthetic-{size}")
+
+
+def run(max_size: int = SIZES[-1], repeat: int = 3) -> Dict[str, Any]:
+    parse_string("CREATE circle(id=warmup)", backend="lark")  # construit le parseur
+    check_codec_limits()
+    results: List[Dict[str, Any]] = []
+
+    pairs = generate_pairs(N_PAIRS, seed=SEED)
+    sources = [p["dsl"] for p in pairs]
+    counts = [len(parse_string(s, backend="fast").instructions) for s in sources]
+    n_instr = sum(counts)
+    results += _bench_sources("pairs", sources, n_instr, repeat)
+
+    for size in SIZES:
+        if size > max_size:
+            break
+        source = unparse(synthetic_program(size))
+        results += _bench_sources(f"synthetic-{size}", [source], size, repeat)
+
+    # la paire i ne dépend que de (seed, i) : les n_gen paires générées
+    # sont les n_gen premières du corpus, d'où leur nombre d'instructions
+    n_gen = N_PAIRS // 2
+    results.append(measure(
+        "generate_pairs", f"n={n_gen}", lambda: generate_pairs(n_gen, seed=SEED),
+        n_gen, sum(counts[:n_gen]), repeat,
+    ))
+
+    return {"meta": _metadata(repeat), "results": results}
+
+
+def _metadata(repeat: int) -> Dict[str, Any]:
+    meta: Dict[str, Any] = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": sys.version.split()[0],
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "seed": SEED,
+        "repeat": repeat,
+        "commit": _git_commit(),
+    }
+    try:
+        import lark
+        meta["lark"] = lark.__version__
+    except ImportError:
+        pass
+    return meta
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+        )
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    ap.add_argument("--out", default="bench_results.json", help="fichier JSON de sortie")
+    ap.add_argument("--max-size", type=int, default=SIZES[-1], help="taille max des programmes synthétiques")
+    ap.add_argument("--repeat", type=int, default=3, help="nombre de mesures par cas (meilleur temps retenu)")
+    args = ap.parse_args(argv)
+
+    report = run(max_size=args.max_size, repeat=max(1, args.repeat))
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"Résultats écrits dans {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,254 @@
+"""
+Déduplication des paires (dsl, code_manim) générées.
+
+Le générateur tire dans de petits espaces discrets (1 à 8 instructions,
+ids obj1..obj8, coordonnées arrondies) : à grande échelle une part non
+négligeable des programmes se répète. Chaque programme est identifié par
+l'empreinte (blake2b, 16 octets) de sa forme canonique, c'est-à-dire son
+texte rendu par unparse() : espaces et écriture des nombres (1 / 1.0 /
+1.00) sont normalisés. Le code Manim étant une fonction du programme, deux
+paires de même empreinte sont identiques.
+
+Deux filtres :
+- ExactDeduper : ensemble des empreintes (exact, ~100 octets par paire) ;
+- BloomDeduper : filtre de Bloom, mémoire fixe choisie à l'avance
+  (~1.8 octet par paire pour 0.1 % de faux positifs). Un faux positif
+  écarte à tort une paire unique, jamais l'inverse.
+make_deduper() choisit selon le volume attendu.
+
+    stats = DedupStats()
+    for pair in iter_unique_pairs(1_000_000, seed=42, workers=8, stats=stats):
+        ...
+    print(f"{stats.duplicate_rate:.2%} de doublons écartés")
+"""
+
+from __future__ import annotations
+
+import hashlib
+import math
+import sys
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, Optional, Union
+
+from parser_manim import instrumentation
+from parser_manim.fast_parser import parse_fast
+from parser_manim.unparser import unparse
+
+from .pair_generator import iter_pairs
+
+
+# Au-delà de ce volume attendu, make_deduper() passe au filtre de Bloom
+EXACT_LIMIT = 5_000_000
+
+_DIGEST_SIZE = 16
+
+
+# ---------- Empreintes ----------
+
+def canonical_form(dsl: str) -> str:
+    """Texte canonique d'un programme DSL (lève DslParseError si invalide)."""
+    return unparse(parse_fast(dsl))
+
+
+def canonical_key(dsl: str, canonical: bool = False) -> bytes:
+    """
+    Empreinte d'un programme DSL. Avec canonical=True, `dsl` est supposé
+    déjà canonique (sortie de unparse, comme dans le générateur) et n'est
+    pas re-parsé.
+    """
+    text = dsl if canonical else canonical_form(dsl)
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=_DIGEST_SIZE).digest()
+
+
+# ---------- Filtres ----------
+
+class ExactDeduper:
+    """Ensemble exact des empreintes déjà vues."""
+
+    def __init__(self) -> None:
+        self._seen: set = set()
+
+    def add(self, key: bytes) -> bool:
+        """Enregistre key ; renvoie True si elle n'avait jamais été vue."""
+        seen = self._seen
+        if key in seen:
+            return False
+        seen.add(key)
+        return True
+
+    def __len__(self) -> int:
+        return len(self._seen)
+
+    @property
+    def nbytes(self) -> int:
+        return sys.getsizeof(self._seen) + len(self._seen) * sys.getsizeof(b"\0" * _DIGEST_SIZE)
+
+
+class BloomDeduper:
+    """
+    Filtre de Bloom dimensionné pour `capacity` empreintes avec un taux de
+    faux positifs `error_rate` (au-delà de capacity, le taux se dégrade).
+    Les k positions sont dérivées de l'empreinte par double hachage.
+    """
+
+    def __init__(self, capacity: int, error_rate: float = 1e-3):
+        if capacity <= 0:
+            raise ValueError("capacity doit être > 0")
+        if not 0.0 < error_rate < 1.0:
+            raise ValueError("error_rate doit être dans ]0, 1[")
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.n_bits = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.n_hashes = max(1, round(self.n_bits / capacity * math.log(2)))
+        self._bits = bytearray((self.n_bits + 7) // 8)
+        self._count = 0
+
+    def add(self, key: bytes) -> bool:
+        """Enregistre key ; renvoie True si elle n'était (probablement) pas présente."""
+        h1 = int.from_bytes(key[:8], "little")
+        h2 = int.from_bytes(key[8:16], "little") | 1
+        bits = self._bits
+        m = self.n_bits
+        new = False
+        for i in range(self.n_hashes):
+            pos = (h1 + i * h2) % m
+            byte, mask = pos >> 3, 1 << (pos & 7)
+            if not bits[byte] & mask:
+                bits[byte] |= mask
+                new = True
+        if new:
+            self._count += 1
+        return new
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def nbytes(self) -> int:
+        return len(self._bits)
+
+
+Deduper = Union[ExactDeduper, BloomDeduper]
+
+
+def make_deduper(
+    expected: int,
+    method: str = "auto",
+    error_rate: float = 1e-3,
+) -> Deduper:
+    """
+    method : "exact", "bloom" ou "auto" (exact jusqu'à EXACT_LIMIT paires
+    attendues, Bloom au-delà).
+    """
+    if method == "auto":
+        method = "exact" if expected <= EXACT_LIMIT else "bloom"
+    if method == "exact":
+        return ExactDeduper()
+    if method == "bloom":
+        return BloomDeduper(max(1, expected), error_rate)
+    raise ValueError(f"Méthode de déduplication inconnue : {method!r}")
+
+
+# ---------- Étape du pipeline ----------
+
+@dataclass
+class DedupStats:
+    seen: int = 0
+    unique: int = 0
+
+    @property
+    def duplicates(self) -> int:
+        return self.seen - self.unique
+
+    @property
+    def duplicate_rate(self) -> float:
+        return self.duplicates / self.seen if self.seen else 0.0
+
+    def as_dict(self) -> Dict[str, float]:
+        return {
+            "seen": self.seen,
+            "unique": self.unique,
+            "duplicates": self.duplicates,
+            "duplicate_rate": self.duplicate_rate,
+        }
+
+
+def dedup_pairs(
+    pairs: Iterable[Dict[str, str]],
+    deduper: Deduper,
+    stats: Optional[DedupStats] = None,
+    canonical: bool = False,
+) -> Iterator[Dict[str, str]]:
+    """
+    Filtre un flux de paires : seule la première occurrence de chaque
+    programme est gardée. canonical=True si les "dsl" sont déjà canoniques
+    (paires issues de iter_pairs) : pas de re-parse.
+    """
+    if stats is None:
+        stats = DedupStats()
+    blake2b = hashlib.blake2b
+    for pair in pairs:
+        dsl = pair["dsl"]
+        text = dsl if canonical else canonical_form(dsl)
+        stats.seen += 1
+        if deduper.add(blake2b(text.encode("utf-8"), digest_size=_DIGEST_SIZE).digest()):
+            stats.unique += 1
+            yield pair
+        elif instrumentation.ENABLED:
+            instrumentation.count("duplicates")
+
+
+def iter_unique_pairs(
+    n: int = 10,
+    seed: int | None = None,
+    workers: int | None = 1,
+    verify: float = 0.0,
+    engine: str = "python",
+    valid_only: bool = False,
+    method: str = "auto",
+    error_rate: float = 1e-3,
+    fill: bool = True,
+    max_factor: float = 10.0,
+    stats: Optional[DedupStats] = None,
+) -> Iterator[Dict[str, str]]:
+    """
+    Comme iter_pairs, sans doublons.
+
+    - fill=True : la génération continue jusqu'à obtenir n paires uniques
+      (au plus n * max_factor paires tirées, pour ne pas boucler si
+      l'espace des programmes est épuisé) ; fill=False : on tire n paires
+      et on écarte les doublons.
+    - stats : DedupStats mis à jour au fil de l'eau (taux de doublons).
+
+    Déterministe pour une seed donnée : les n premières paires tirées sont
+    celles de iter_pairs(n, seed), les suivantes prolongent la même suite
+    (generate_pair(seed, i)).
+    """
+    n = max(0, n)
+    if stats is None:
+        stats = DedupStats()
+    deduper = make_deduper(n, method, error_rate)
+
+    budget = max(n, math.ceil(n * max_factor)) if fill else n
+    source = iter_pairs(
+        budget, seed=seed, workers=workers, verify=verify, engine=engine, valid_only=valid_only,
+    )
+    try:
+        for pair in dedup_pairs(source, deduper, stats, canonical=True):
+            yield pair
+            if stats.unique >= n:
+                break
+    finally:
+        source.close()  # arrête les workers encore en avance
+
+
+__all__ = [
+    "canonical_form",
+    "canonical_key",
+    "ExactDeduper",
+    "BloomDeduper",
+    "make_deduper",
+    "DedupStats",
+    "dedup_pairs",
+    "iter_unique_pairs",
+]
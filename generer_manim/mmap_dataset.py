@@ -0,0 +1,215 @@
+"""
+Format de dataset à accès aléatoire, lu via mmap.
+
+Un seul fichier (little-endian) :
+    en-tête   : MAGIC (8 octets) | u64 count | u64 index_offset | u64 réservé
+    blob      : chaînes utf-8 concaténées dsl_0, code_0, dsl_1, code_1, ...
+    (bourrage jusqu'à un multiple de 8)
+    index     : 2 * count + 1 offsets u64 (relatifs au début du blob) ;
+                la chaîne k occupe [offsets[k], offsets[k + 1])
+
+Écriture (MmapPairSink, un PairSink comme ceux de sinks.py) : le blob est
+écrit au fil de l'eau, seuls les offsets (16 octets par paire) restent en
+mémoire ; l'index et l'en-tête sont écrits à la fermeture, puis le fichier
+est renommé atomiquement depuis son .tmp. Si une exception sort du bloc
+`with`, le .tmp est supprimé (abort) : aucun dataset partiel n'est publié.
+
+Lecture (MmapPairDataset) : le fichier est projeté en mémoire (mmap) et
+l'index est lu en place (memoryview), donc :
+- dataset[i] est en O(1) et ne décode que la paire i ;
+- dataset[a:b] est une vue (aucune copie, aucun décodage) ;
+- les pages sont partagées par le cache du système : N workers de
+  DataLoader qui ouvrent le même fichier ne dupliquent pas les données.
+  Le pickle d'un dataset ne contient que (chemin, indices) ; chaque worker
+  rouvre sa propre projection.
+
+    convert_pickle("dataset_dsl_manim.pkl", "dataset_dsl_manim.pairs")
+    dataset = MmapPairDataset("dataset_dsl_manim.pairs")
+    dataset[123]     # {"dsl": ..., "code": ...}
+"""
+
+from __future__ import annotations
+
+import mmap
+import os
+import pickle
+import struct
+import sys
+from array import array
+from collections.abc import Sequence as SequenceABC
+from typing import BinaryIO, Dict, Iterable, Optional, Tuple
+
+from .sinks import PairSink, write_pairs
+
+Pair = Dict[str, str]
+
+MMAP_MAGIC = b"DSLMMAP1"
+_HEADER = struct.Struct("<8sQQQ")
+
+
+class MmapPairSink(PairSink):
+    """Écrit les paires dans un fichier au format mmap (voir docstring du module)."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.count = 0
+        self._tmp_path = path + ".tmp"
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file: Optional[BinaryIO] = open(self._tmp_path, "wb")
+        self._file.write(_HEADER.pack(MMAP_MAGIC, 0, 0, 0))
+        self._offsets = array("Q", [0])
+        self._size = 0
+
+    def write(self, pair: Pair) -> None:
+        assert self._file is not None, "MmapPairSink déjà fermé"
+        for field in ("dsl", "code"):
+            data = pair[field].encode("utf-8")
+            self._file.write(data)
+            self._size += len(data)
+            self._offsets.append(self._size)
+        self.count += 1
+
+    def close(self) -> None:
+        if self._file is None:
+            return
+        f, self._file = self._file, None
+        blob_end = _HEADER.size + self._size
+        padding = -blob_end % 8
+        f.write(b"\0" * padding)
+        offsets = self._offsets
+        if sys.byteorder != "little":
+            offsets = array("Q", offsets)
+            offsets.byteswap()
+        f.write(offsets.tobytes())
+        f.seek(0)
+        f.write(_HEADER.pack(MMAP_MAGIC, self.count, blob_end + padding, 0))
+        f.close()
+        os.replace(self._tmp_path, self.path)
+
+    def abort(self) -> None:
+        if self._file is None:
+            return
+        self._file.close()
+        self._file = None
+        os.remove(self._tmp_path)
+
+
+class _Mapping:
+    """Projection d'un fichier : partagée par un dataset et ses vues."""
+
+    __slots__ = ("path", "count", "mm", "blob", "offsets")
+
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            header = f.read(_HEADER.size)
+            if len(header) < _HEADER.size or header[:len(MMAP_MAGIC)] != MMAP_MAGIC:
+                raise ValueError(f"{path} n'est pas un dataset mmap de paires")
+            magic, count, index_offset, _ = _HEADER.unpack(header)
+            self.mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.path = path
+        self.count = count
+        view = memoryview(self.mm)
+        self.blob = view[_HEADER.size:]
+        index = view[index_offset:index_offset + 8 * (2 * count + 1)]
+        if sys.byteorder == "little":
+            self.offsets = index.cast("Q")
+        else:
+            swapped = array("Q", index.tobytes())
+            swapped.byteswap()
+            self.offsets = swapped
+
+    def close(self) -> None:
+        for view in (self.blob, self.offsets):
+            if isinstance(view, memoryview):
+                view.release()
+        self.mm.close()
+
+
+class MmapPairDataset(SequenceABC):
+    """
+    Séquence de paires lue depuis un fichier au format mmap : len(), index
+    négatifs, slices (vues sans copie), picklable pour les workers d'un
+    DataLoader PyTorch (le fichier est rouvert dans chaque processus).
+    """
+
+    def __init__(self, path: str):
+        self._mapping = _Mapping(path)
+        self._indices = range(self._mapping.count)
+
+    @classmethod
+    def _view(cls, mapping: _Mapping, indices: range) -> "MmapPairDataset":
+        view = cls.__new__(cls)
+        view._mapping = mapping
+        view._indices = indices
+        return view
+
+    @classmethod
+    def _reopen(cls, path: str, indices: range) -> "MmapPairDataset":
+        return cls._view(_Mapping(path), indices)
+
+    @property
+    def path(self) -> str:
+        return self._mapping.path
+
+    def __len__(self) -> int:
+        return len(self._indices)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return MmapPairDataset._view(self._mapping, self._indices[i])
+        dsl, code = self.raw(i)
+        return {"dsl": str(dsl, "utf-8"), "code": str(code, "utf-8")}
+
+    def raw(self, i: int) -> Tuple[memoryview, memoryview]:
+        """(dsl, code) de la paire i en octets utf-8, sans copie (memoryview sur le mmap)."""
+        k = 2 * self._indices[i]  # IndexError hors limites, index négatifs gérés
+        offsets, blob = self._mapping.offsets, self._mapping.blob
+        start, middle, end = offsets[k], offsets[k + 1], offsets[k + 2]
+        return blob[start:middle], blob[middle:end]
+
+    def close(self) -> None:
+        """
+        Ferme la projection (partagée avec les vues issues de ce dataset).
+        Les memoryview renvoyées par raw() doivent avoir été libérées.
+        """
+        self._mapping.close()
+
+    def __enter__(self) -> "MmapPairDataset":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def __reduce__(self):
+        return (MmapPairDataset._reopen, (self._mapping.path, self._indices))
+
+    def __repr__(self) -> str:
+        r = self._indices
+        return f"MmapPairDataset({self._mapping.path!r}, indices=range({r.start}, {r.stop}, {r.step}))"
+
+
+def write_mmap_dataset(pairs: Iterable[Pair], path: str) -> int:
+    """Écrit les paires dans `path` au format mmap ; renvoie leur nombre."""
+    with MmapPairSink(path) as sink:
+        return write_pairs(pairs, sink)
+
+
+def convert_pickle(pickle_path: str, path: str) -> int:
+    """
+    Convertit un dataset pickle (liste de paires, ancien format de
+    main_generate_dataset.py) au format mmap ; renvoie le nombre de paires.
+    """
+    with open(pickle_path, "rb") as f:
+        pairs = pickle.load(f)
+    return write_mmap_dataset(pairs, path)
+
+
+__all__ = [
+    "MMAP_MAGIC",
+    "MmapPairSink",
+    "MmapPairDataset",
+    "write_mmap_dataset",
+    "convert_pickle",
+]
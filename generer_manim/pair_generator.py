@@ -4,18 +4,44 @@ Générateur de paires (dsl, code_manim).
 generate_pairs(n, seed) renvoie une liste de dicts :
     {"dsl": "<programme DSL>", "code": "<code manim généré>"}
 
-Pas d'écriture de fichier : juste une liste Python.
+iter_pairs(n, seed) produit les mêmes dicts un par un (mémoire constante).
+
+generate_pair(seed, i) régénère directement la paire i, et PairDataset(n, seed)
+est une séquence paresseuse (len, index, slices) qui ne matérialise rien.
+
+Pas d'écriture de fichier ici : voir generer_manim.sinks pour l'écriture
+en shards JSONL / binaires.
+
 Dataset visé : diversité de structures (CREATE/MOVE/ROTATE dans n'importe quel ordre),
 tout en restant SYNTAXIQUEMENT valide (pas forcément exécutable Manim).
 """
 
 from __future__ import annotations
 
+import functools
+import multiprocessing
+import os
 import random
+from collections import deque
+from collections.abc import Sequence as SequenceABC
 from dataclasses import dataclass
-from typing import Dict, List, Sequence
-
-from traducteur_manim.generator import generate_manim_from_source
+from itertools import islice
+from multiprocessing.pool import AsyncResult
+from time import perf_counter
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, List, Sequence, Tuple
+
+from parser_manim import instrumentation
+from parser_manim.ast_nodes import (
+    Program,
+    CreateInstruction,
+    MoveInstruction,
+    RotateInstruction,
+    Instruction,
+)
+from parser_manim.parser_engine import parse_string
+from parser_manim.semantics import prune_invalid
+from parser_manim.unparser import unparse
+from traducteur_manim.generator import generate_manim_scene
 
 
 # --- Modèles de génération ---
@@ -24,6 +50,9 @@ from traducteur_manim.generator import generate_manim_from_source
 SHAPES = ("circle", "square", "rectangle", "line", "text")
 TEXT_CONTENTS = ("Hello", "Manim", "DSL", "Demo", "Test", "Circle", "Square")
 
+# Ids partagés par tous les programmes (évite une chaîne par programme)
+OBJ_IDS = tuple(f"obj{i}" for i in range(1, 9))
+
 
 @dataclass
 class ObjectSpec:
@@ -31,40 +60,388 @@ class ObjectSpec:
     shape: str
 
 
-def generate_pairs(n: int = 10, seed: int | None = None) -> List[Dict[str, str]]:
+def generate_pairs(
+    n: int = 10,
+    seed: int | None = None,
+    workers: int | None = 1,
+    verify: float = 0.0,
+    engine: str = "python",
+    valid_only: bool = False,
+) -> List[Dict[str, str]]:
     """
     Génère n paires (dsl, code_manim) et les retourne sous forme de liste.
     - seed permet de rendre la génération déterministe.
+    - workers : nombre de processus (None = tous les cœurs).
+    - verify : fraction des paires re-parsées pour contrôle (0 = aucune).
+    - engine : moteur de tirage, "python" (random.Random, défaut) ou
+      "numpy" (tirages vectorisés par shard, voir vector_sampler.py ;
+      plus rapide, mais autre dataset pour une même seed).
+    - valid_only : programmes sémantiquement valides uniquement (voir
+      parser_manim.semantics) : les instructions en erreur (MOVE / ROTATE
+      sur un id pas encore créé...) sont retirées, et un programme vidé
+      par ce nettoyage est re-tiré.
+
+    Pour de gros volumes, préférer iter_pairs() + un sink (generer_manim.sinks) :
+    la liste complète n'est alors jamais construite en mémoire.
+    """
+    return list(iter_pairs(
+        n, seed=seed, workers=workers, verify=verify, engine=engine, valid_only=valid_only,
+    ))
+
+
+def iter_pairs(
+    n: int = 10,
+    seed: int | None = None,
+    workers: int | None = 1,
+    verify: float = 0.0,
+    engine: str = "python",
+    valid_only: bool = False,
+) -> Iterator[Dict[str, str]]:
+    """
+    Version générateur de generate_pairs : produit les paires une par une,
+    dans le même ordre et avec le même contenu.
+
+    Chaque paire a son propre RNG, dérivé de (seed, index de la paire) :
+    la paire i vaut generate_pair(seed, i), le résultat est identique octet
+    pour octet quel que soit le nombre de workers, et l'état global du
+    module random n'est jamais modifié. Les paires sont réparties entre
+    workers par shards de SHARD_SIZE paires.
+
+    La mémoire reste bornée : au plus quelques shards par worker sont en vol.
+
+    Chaque programme est tiré directement sous forme d'AST, puis rendu
+    en texte DSL (unparse) et en code Manim (generate_manim_scene), sans
+    repasser par le parseur. Avec verify > 0, une paire sur 1/verify est
+    re-parsée et comparée (ValueError en cas de divergence).
+
+    Si parser_manim.instrumentation est activé, les temps par étape
+    (tirage, unparse, codegen, vérification) sont collectés, y compris
+    dans les workers : leurs statistiques sont fusionnées dans celles du
+    processus appelant au fil des shards.
     """
-    if seed is not None:
-        random.seed(seed)
+    if engine not in ENGINES:
+        raise ValueError(f"Moteur inconnu : {engine!r} (attendu : {', '.join(ENGINES)})")
+    n = max(0, n)
+    master_seed = _resolve_seed(seed)
+    verify_every = _verify_stride(verify)
+    tasks = (
+        (master_seed, shard, count, verify_every, engine, valid_only)
+        for shard, count in _shard_counts(n)
+    )
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    workers = min(workers, -(-n // SHARD_SIZE))
+
+    if workers <= 1:
+        for task in tasks:
+            yield from _generate_shard(task)
+        return
+
+    profiled = instrumentation.ENABLED
+    run_shard = _generate_shard_profiled if profiled else _generate_shard
+
+    with multiprocessing.Pool(processes=workers) as pool:
+        # Fenêtre glissante de tâches : pool.imap soumettrait tout d'un coup
+        # et accumulerait les résultats si le consommateur est plus lent.
+        pending: Deque[AsyncResult] = deque()
+        for task in islice(tasks, workers * _INFLIGHT_PER_WORKER):
+            pending.append(pool.apply_async(run_shard, (task,)))
+
+        while pending:
+            result = pending.popleft().get()
+            next_task = next(tasks, None)
+            if next_task is not None:
+                pending.append(pool.apply_async(run_shard, (next_task,)))
+            if profiled:
+                result, shard_stats = result
+                instrumentation.merge(shard_stats)
+            yield from result
+
+
+# Moteurs de tirage disponibles (paramètre engine)
+ENGINES = ("python", "numpy")
+
+
+# --- Découpage en shards ---
+
+# Taille fixe d'un shard : elle ne dépend PAS du nombre de workers,
+# sinon la sortie changerait avec le parallélisme.
+SHARD_SIZE = 1_000
+
+# Nombre de shards soumis d'avance par worker (borne la mémoire en vol)
+_INFLIGHT_PER_WORKER = 2
+
+
+def _resolve_seed(seed: int | None) -> int:
+    # Sans seed, on en tire une "vraie" sans toucher à l'état global de random
+    if seed is None:
+        return random.SystemRandom().getrandbits(64)
+    return seed
+
+
+def _shard_counts(n: int) -> Iterator[tuple[int, int]]:
+    """Produit (numéro de shard, nombre de paires) pour couvrir n paires."""
+    for shard, start in enumerate(range(0, n, SHARD_SIZE)):
+        yield shard, min(SHARD_SIZE, n - start)
+
+
+def _pair_rng(master_seed: int, index: int) -> random.Random:
+    # Une graine str est hachée (sha512) par random : stable entre processus
+    # et entre exécutions, contrairement à hash().
+    return random.Random(f"{master_seed}:{index}")
+
+
+def _verify_stride(verify: float) -> int:
+    """Convertit une fraction de vérification en pas (0 = jamais)."""
+    if verify <= 0.0:
+        return 0
+    return max(1, round(1.0 / min(verify, 1.0)))
+
+
+ShardTask = Tuple[int, int, int, int, str, bool]
+
+
+def _generate_shard(task: ShardTask) -> List[Dict[str, str]]:
+    """Génère les paires d'un shard (exécuté dans un worker si parallèle)."""
+    master_seed, shard, count, verify_every, engine, valid_only = task
+
+    if instrumentation.ENABLED:
+        return _generate_shard_timed(task)
 
     pairs: List[Dict[str, str]] = []
-    for _ in range(max(0, n)):
-        dsl_program = _build_program()
-        code = generate_manim_from_source(dsl_program)
+    for i, program in enumerate(_shard_programs(master_seed, shard, count, engine, valid_only)):
+        dsl_program = unparse(program)
+        code = generate_manim_scene(program)
+        if verify_every and i % verify_every == 0:
+            _verify_pair(program, dsl_program, code)
         pairs.append({"dsl": dsl_program, "code": code})
     return pairs
 
 
+def _generate_shard_timed(task: ShardTask) -> List[Dict[str, str]]:
+    """Même boucle que _generate_shard, avec un timer par étape."""
+    master_seed, shard, count, verify_every, engine, valid_only = task
+    record = instrumentation.record
+    t0 = perf_counter()
+    programs = iter(_shard_programs(master_seed, shard, count, engine, valid_only))
+    # tirage en lot (numpy) : compté dans le premier tirage, pour garder
+    # un appel "generate.sample" par paire
+    batch = perf_counter() - t0
+
+    pairs: List[Dict[str, str]] = []
+    for i in range(count):
+        t0 = perf_counter()
+        program = next(programs)
+        t1 = perf_counter()
+        dsl_program = unparse(program)
+        t2 = perf_counter()
+        code = generate_manim_scene(program)  # étape "codegen"
+        record("generate.sample", t1 - t0 + batch)
+        batch = 0.0
+        record("generate.unparse", t2 - t1)
+        if verify_every and i % verify_every == 0:
+            t3 = perf_counter()
+            _verify_pair(program, dsl_program, code)
+            record("generate.verify", perf_counter() - t3)
+        pairs.append({"dsl": dsl_program, "code": code})
+    instrumentation.count("pairs", count)
+    return pairs
+
+
+def _generate_shard_profiled(
+    task: ShardTask,
+) -> Tuple[List[Dict[str, str]], Dict[str, Any]]:
+    """
+    Version worker instrumentée : renvoie aussi les statistiques du shard.
+    Le callback éventuel, hérité du parent avec fork, est retiré : c'est le
+    parent qui le rejoue en fusionnant les statistiques (instrumentation.merge).
+    """
+    instrumentation.set_callback(None)
+    instrumentation.reset()
+    instrumentation.enable()
+    pairs = _generate_shard(task)
+    return pairs, instrumentation.stats()
+
+
+def _shard_programs(
+    master_seed: int,
+    shard: int,
+    count: int,
+    engine: str,
+    valid_only: bool,
+) -> Iterable[Program]:
+    """Programmes (AST) d'un shard, tirés par le moteur demandé."""
+    first = shard * SHARD_SIZE
+    if engine == "numpy":
+        # Le lot est toujours tiré pour un shard complet (un shard incomplet
+        # donne ainsi les mêmes programmes que le début du shard complet)
+        from .vector_sampler import sample_programs, shard_generator
+        programs = sample_programs(shard_generator(master_seed, shard), SHARD_SIZE, stop=count)
+        if valid_only:
+            programs = [
+                _make_valid(program, functools.partial(_numpy_redraw, master_seed, first + j))
+                for j, program in enumerate(programs)
+            ]
+        return programs
+    return (_python_program(master_seed, i, valid_only) for i in range(first, first + count))
+
+
+def _python_program(master_seed: int, index: int, valid_only: bool) -> Program:
+    rng = _pair_rng(master_seed, index)
+    program = _build_program_ast(rng)
+    if valid_only:
+        # les re-tirages continuent le RNG de la paire : toujours déterministe
+        program = _make_valid(program, lambda attempt: _build_program_ast(rng))
+    return program
+
+
+def _numpy_redraw(master_seed: int, index: int, attempt: int) -> Program:
+    from .vector_sampler import redraw_generator, sample_programs
+    return sample_programs(redraw_generator(master_seed, index, attempt), 1)[0]
+
+
+def _make_valid(program: Program, redraw: Callable[[int], Program]) -> Program:
+    """
+    Retire les instructions sémantiquement invalides ; si le programme est
+    vidé, en tire un autre (redraw(numéro de tentative)).
+    """
+    attempt = 0
+    while True:
+        pruned, _ = prune_invalid(program)
+        if pruned.instructions:
+            return pruned
+        attempt += 1
+        program = redraw(attempt)
+
+
+def _verify_pair(program: Program, dsl_program: str, code: str) -> None:
+    """Contrôle qu'un aller-retour texte -> parseur redonne le même résultat."""
+    reparsed = parse_string(dsl_program)
+    if reparsed != program:
+        raise ValueError(f"AST divergent après re-parse :\n{dsl_program}")
+    if generate_manim_scene(reparsed) != code:
+        raise ValueError(f"Code Manim divergent après re-parse :\n{dsl_program}")
+
+
+# --- Accès direct à une paire ---
+
+def generate_pair(
+    seed: int,
+    index: int,
+    engine: str = "python",
+    valid_only: bool = False,
+) -> Dict[str, str]:
+    """
+    Régénère la paire `index` de generate_pairs(n, seed) (pour tout n > index)
+    sans rejouer les précédentes.
+
+    Moteur "python" : un seul programme tiré, O(1). Moteur "numpy" : les
+    colonnes du shard de la paire sont tirées en lot, mais seul son
+    programme est construit.
+    """
+    if engine not in ENGINES:
+        raise ValueError(f"Moteur inconnu : {engine!r} (attendu : {', '.join(ENGINES)})")
+    if index < 0:
+        raise IndexError("index de paire négatif")
+
+    if engine == "numpy":
+        from .vector_sampler import sample_programs, shard_generator
+        shard, j = divmod(index, SHARD_SIZE)
+        program = sample_programs(shard_generator(seed, shard), SHARD_SIZE, start=j, stop=j + 1)[0]
+        if valid_only:
+            program = _make_valid(program, functools.partial(_numpy_redraw, seed, index))
+    else:
+        program = _python_program(seed, index, valid_only)
+    return {"dsl": unparse(program), "code": generate_manim_scene(program)}
+
+
+class PairDataset(SequenceABC):
+    """
+    Dataset paresseux de n paires : dataset[i] == generate_pair(seed, i, ...),
+    calculé à la demande. Supporte len(), les index négatifs et les slices
+    (qui renvoient une vue, sans rien générer), et s'utilise tel quel comme
+    "map-style dataset" PyTorch (picklable pour les workers du DataLoader).
+
+    Sans seed, une seed est tirée une fois à la construction : les accès
+    restent cohérents entre eux.
+    """
+
+    def __init__(
+        self,
+        n: int,
+        seed: int | None = None,
+        engine: str = "python",
+        valid_only: bool = False,
+    ):
+        if engine not in ENGINES:
+            raise ValueError(f"Moteur inconnu : {engine!r} (attendu : {', '.join(ENGINES)})")
+        self.seed = _resolve_seed(seed)
+        self.engine = engine
+        self.valid_only = valid_only
+        self._indices = range(max(0, n))
+        self._shard_cache: tuple[int, List[Program]] | None = None
+
+    @classmethod
+    def _view(cls, seed: int, engine: str, valid_only: bool, indices: range) -> "PairDataset":
+        view = cls(0, seed, engine, valid_only)
+        view._indices = indices
+        return view
+
+    def __len__(self) -> int:
+        return len(self._indices)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return PairDataset._view(self.seed, self.engine, self.valid_only, self._indices[i])
+        index = self._indices[i]  # IndexError hors limites, index négatifs gérés
+        if self.engine == "python":
+            return generate_pair(self.seed, index, valid_only=self.valid_only)
+        program = self._numpy_program(index)
+        return {"dsl": unparse(program), "code": generate_manim_scene(program)}
+
+    def _numpy_program(self, index: int) -> Program:
+        # Le dernier shard est gardé : un parcours séquentiel ne tire
+        # chaque shard qu'une fois.
+        shard, j = divmod(index, SHARD_SIZE)
+        if self._shard_cache is None or self._shard_cache[0] != shard:
+            from .vector_sampler import sample_programs, shard_generator
+            programs = sample_programs(shard_generator(self.seed, shard), SHARD_SIZE)
+            self._shard_cache = (shard, programs)
+        program = self._shard_cache[1][j]
+        if self.valid_only:
+            program = _make_valid(program, functools.partial(_numpy_redraw, self.seed, index))
+        return program
+
+    def __reduce__(self):
+        return (PairDataset._view, (self.seed, self.engine, self.valid_only, self._indices))
+
+    def __repr__(self) -> str:
+        r = self._indices
+        return (
+            f"PairDataset(seed={self.seed}, engine={self.engine!r}, valid_only={self.valid_only}, "
+            f"indices=range({r.start}, {r.stop}, {r.step}))"
+        )
+
+
 # --- Construction d'un programme DSL varié ---
 
-def _build_program() -> str:
+def _build_program_ast(rng: random.Random) -> Program:
     """
-    Produit un programme DSL sous forme de texte multi-lignes.
+    Produit directement l'AST d'un programme DSL varié.
 
     Stratégie :
     - on choisit un nombre total d'instructions (1..8)
     - chaque instruction est tirée au hasard parmi CREATE/MOVE/ROTATE
     - on peut utiliser des ids qui n'ont jamais été créés (dataset syntaxique)
     """
-    instructions: List[str] = []
+    instructions: List[Instruction] = []
 
-    total_instr = random.randint(1, 8)
+    total_instr = rng.randint(1, 8)
 
     # pool d'ids potentiels (certains créés, certains non)
     # (ça permet d'avoir des MOVE/ROTATE sans CREATE préalable)
-    id_pool = [f"obj{i}" for i in range(1, random.randint(2, 8) + 1)]
+    id_pool = OBJ_IDS[:rng.randint(2, 8)]
 
     # on garde quand même une chance de créer des objets,
     # sinon le code Manim généré sera souvent "vide"
@@ -73,11 +450,12 @@ def _build_program() -> str:
     p_rotate = 0.15
 
     # possibilité de "forcer" au moins un CREATE une partie du temps
-    force_one_create = random.random() < 0.7
+    force_one_create = rng.random() < 0.7
 
     created_any = False
     for k in range(total_instr):
         kind = _choice_weighted(
+            rng,
             [("CREATE", p_create), ("MOVE", p_move), ("ROTATE", p_rotate)]
         )
 
@@ -86,99 +464,95 @@ def _build_program() -> str:
             kind = "CREATE"
 
         if kind == "CREATE":
-            spec = _random_object_spec(id_pool=id_pool)
-            instructions.append(_emit_create(spec))
+            spec = _random_object_spec(rng, id_pool=id_pool)
+            instructions.append(_sample_create(rng, spec))
             created_any = True
         elif kind == "MOVE":
-            target_id = random.choice(id_pool)
-            instructions.append(_emit_move(target_id))
+            target_id = rng.choice(id_pool)
+            instructions.append(_sample_move(rng, target_id))
         else:
-            target_id = random.choice(id_pool)
-            instructions.append(_emit_rotate(target_id))
+            target_id = rng.choice(id_pool)
+            instructions.append(_sample_rotate(rng, target_id))
 
-    return "\n".join(instructions)
+    return Program(instructions=instructions)
 
 
-def _random_object_spec(id_pool: Sequence[str]) -> ObjectSpec:
+def _random_object_spec(rng: random.Random, id_pool: Sequence[str]) -> ObjectSpec:
     # On choisit un id au hasard (peut être "déjà utilisé" : syntaxiquement ok)
-    obj_id = random.choice(id_pool)
-    shape = random.choice(SHAPES)
+    obj_id = rng.choice(id_pool)
+    shape = rng.choice(SHAPES)
     return ObjectSpec(obj_id=obj_id, shape=shape)
 
 
-# --- Emission des instructions DSL ---
+# --- Tirage des instructions (AST) ---
 
-def _emit_create(spec: ObjectSpec) -> str:
-    base = f"CREATE {spec.shape}(id={spec.obj_id}"
+def _sample_create(rng: random.Random, spec: ObjectSpec) -> CreateInstruction:
+    instr = CreateInstruction(shape=spec.shape, id=spec.obj_id)
 
     if spec.shape == "circle":
-        radius = _rand_in(0.5, 2.0, ndigits=2)
-        base += f", radius={radius}"
+        instr.radius = _rand_in(rng, 0.5, 2.0, ndigits=2)
 
     elif spec.shape == "square":
-        size = _rand_in(0.5, 2.0, ndigits=2)
-        base += f", size={size}"
+        instr.size = _rand_in(rng, 0.5, 2.0, ndigits=2)
 
     elif spec.shape == "rectangle":
-        width = _rand_in(1.0, 3.0, ndigits=2)
-        height = _rand_in(0.5, 2.0, ndigits=2)
-        base += f", width={width}, height={height}"
+        instr.width = _rand_in(rng, 1.0, 3.0, ndigits=2)
+        instr.height = _rand_in(rng, 0.5, 2.0, ndigits=2)
 
     elif spec.shape == "line":
-        x1, y1, x2, y2 = [_rand_coord() for _ in range(4)]
-        base += f", start=({x1},{y1}), end=({x2},{y2})"
+        x1, y1, x2, y2 = [_rand_coord(rng) for _ in range(4)]
+        instr.start = (x1, y1)
+        instr.end = (x2, y2)
 
     elif spec.shape == "text":
-        content = random.choice(TEXT_CONTENTS)
-        base += f', content="{content}"'
+        instr.content = rng.choice(TEXT_CONTENTS)
 
     # x,y toujours présents (comme dans ton générateur initial)
-    x, y = _rand_coord(), _rand_coord()
-    base += f", x={x}, y={y})"
-    return base
+    instr.x, instr.y = _rand_coord(rng), _rand_coord(rng)
+    return instr
 
 
-def _emit_move(target_id: str) -> str:
-    dx, dy = _rand_delta(), _rand_delta()
+def _sample_move(rng: random.Random, target_id: str) -> MoveInstruction:
+    dx, dy = _rand_delta(rng), _rand_delta(rng)
 
     # duration optionnelle parfois (pour diversifier)
-    if random.random() < 0.25:
-        return f"MOVE(id={target_id}, dx={dx}, dy={dy})"
+    if rng.random() < 0.25:
+        return MoveInstruction(target_id=target_id, dx=dx, dy=dy)
 
-    dur = _rand_duration()
-    return f"MOVE(id={target_id}, dx={dx}, dy={dy}, duration={dur})"
+    dur = _rand_duration(rng)
+    return MoveInstruction(target_id=target_id, dx=dx, dy=dy, duration=dur)
 
 
-def _emit_rotate(target_id: str) -> str:
-    angle = _rand_in(15.0, 180.0, ndigits=1)
+def _sample_rotate(rng: random.Random, target_id: str) -> RotateInstruction:
+    angle = _rand_in(rng, 15.0, 180.0, ndigits=1)
 
     # duration optionnelle parfois
-    if random.random() < 0.25:
-        return f"ROTATE(id={target_id}, angle={angle})"
+    if rng.random() < 0.25:
+        return RotateInstruction(target_id=target_id, angle=angle)
 
-    dur = _rand_duration()
-    return f"ROTATE(id={target_id}, angle={angle}, duration={dur})"
+    dur = _rand_duration(rng)
+    return RotateInstruction(target_id=target_id, angle=angle, duration=dur)
 
 
 # --- Helpers aléatoires ---
 
-def _rand_coord() -> float:
-    return _rand_in(-3.0, 3.0, ndigits=2)
+def _rand_coord(rng: random.Random) -> float:
+    return _rand_in(rng, -3.0, 3.0, ndigits=2)
 
 
-def _rand_delta() -> float:
-    return _rand_in(-2.0, 2.0, ndigits=2)
+def _rand_delta(rng: random.Random) -> float:
+    return _rand_in(rng, -2.0, 2.0, ndigits=2)
 
 
-def _rand_duration() -> float:
-    return _rand_in(0.5, 3.0, ndigits=2)
+def _rand_duration(rng: random.Random) -> float:
+    return _rand_in(rng, 0.5, 3.0, ndigits=2)
 
 
-def _rand_in(a: float, b: float, ndigits: int) -> float:
-    return round(random.uniform(a, b), ndigits)
+def _rand_in(rng: random.Random, a: float, b: float, ndigits: int) -> float:
+    return round(rng.uniform(a, b), ndigits)
 
 
-def _choice_weighted(items: Sequence[tuple[str, float]]) -> str:
+def _choice_weighted(rng: random.Random, items: Sequence[tuple[str, float]]) -> str:
     """
     Choisit un item selon des poids.
     items = [("CREATE", 0.5), ("MOVE", 0.3), ("ROTATE", 0.2)]
@@ -187,7 +561,7 @@ def _choice_weighted(items: Sequence[tuple[str, float]]) -> str:
     for _, w in items:
         total += max(0.0, w)
 
-    r = random.uniform(0.0, total)
+    r = rng.uniform(0.0, total)
     upto = 0.0
     for name, w in items:
         w = max(0.0, w)
@@ -199,5 +573,5 @@ def _choice_weighted(items: Sequence[tuple[str, float]]) -> str:
     return items[-1][0]
 
 
-__all__ = ["generate_pairs"]
+__all__ = ["generate_pairs", "iter_pairs", "generate_pair", "PairDataset"]
 
@@ -0,0 +1,230 @@
+"""
+Sinks d'écriture pour les paires (dsl, code_manim).
+
+Un sink reçoit les paires une par une (write) : combiné à iter_pairs(),
+la mémoire reste constante quelle que soit la taille du dataset.
+
+Deux formats, tous deux découpés en shards tournants :
+- JsonlShardSink  : une paire JSON par ligne  -> <prefix>-00000.jsonl
+- BinaryShardSink : enregistrements préfixés par leur longueur -> <prefix>-00000.bin
+
+Un shard est d'abord écrit sous un nom temporaire (.tmp) puis renommé
+atomiquement une fois complet : un consommateur qui liste les fichiers
+.jsonl / .bin ne voit donc que des shards terminés, et peut commencer
+à les lire pendant que la génération continue. Si une exception sort du
+bloc `with`, le shard en cours est supprimé au lieu d'être publié.
+
+Format binaire (little-endian) :
+    MAGIC (8 octets)
+    puis pour chaque paire : u32 len(dsl) | dsl utf-8 | u32 len(code) | code utf-8
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import struct
+from abc import ABC, abstractmethod
+from typing import BinaryIO, Dict, Iterable, Iterator, List, Optional
+
+Pair = Dict[str, str]
+
+BINARY_MAGIC = b"DSLPAIR1"
+_LEN = struct.Struct("<I")
+
+
+class PairSink(ABC):
+    """
+    Interface commune des sinks.
+    S'utilise comme context manager :
+
+        with JsonlShardSink("out/") as sink:
+            write_pairs(iter_pairs(1_000_000, seed=42), sink)
+
+    En sortie normale du bloc, close() publie ce qui a été écrit ; si une
+    exception en sort, abort() abandonne l'écriture en cours.
+    """
+
+    @abstractmethod
+    def write(self, pair: Pair) -> None:
+        ...
+
+    def close(self) -> None:
+        pass
+
+    def abort(self) -> None:
+        """Abandonne l'écriture en cours sans la publier (par défaut : close())."""
+        self.close()
+
+    def __enter__(self) -> "PairSink":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+
+class _RotatingShardSink(PairSink):
+    """
+    Base des sinks à shards tournants : ouvre un nouveau fichier toutes les
+    shard_size paires et publie (rename) le précédent.
+    """
+
+    extension = ""
+
+    def __init__(self, directory: str, prefix: str = "pairs", shard_size: int = 100_000):
+        if shard_size <= 0:
+            raise ValueError("shard_size doit être > 0")
+        self.directory = directory
+        self.prefix = prefix
+        self.shard_size = shard_size
+        self.shard_paths: List[str] = []   # shards terminés, dans l'ordre
+        self.count = 0                     # nombre total de paires écrites
+
+        self._file: Optional[BinaryIO] = None
+        self._tmp_path = ""
+        self._final_path = ""
+        self._in_shard = 0
+
+        os.makedirs(directory, exist_ok=True)
+
+    # --- API ---
+
+    def write(self, pair: Pair) -> None:
+        if self._file is None:
+            self._open_shard()
+        assert self._file is not None
+        self._file.write(self._encode(pair))
+        self.count += 1
+        self._in_shard += 1
+        if self._in_shard >= self.shard_size:
+            self._finish_shard()
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._finish_shard()
+
+    def abort(self) -> None:
+        # le shard en cours est incomplet : supprimé, jamais publié
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            os.remove(self._tmp_path)
+
+    # --- À redéfinir ---
+
+    def _header(self) -> bytes:
+        return b""
+
+    @abstractmethod
+    def _encode(self, pair: Pair) -> bytes:
+        ...
+
+    # --- Gestion des shards ---
+
+    def _open_shard(self) -> None:
+        name = f"{self.prefix}-{len(self.shard_paths):05d}{self.extension}"
+        self._final_path = os.path.join(self.directory, name)
+        self._tmp_path = self._final_path + ".tmp"
+        self._file = open(self._tmp_path, "wb")
+        self._file.write(self._header())
+        self._in_shard = 0
+
+    def _finish_shard(self) -> None:
+        assert self._file is not None
+        self._file.close()
+        self._file = None
+        # rename atomique : le shard n'apparaît qu'une fois complet
+        os.replace(self._tmp_path, self._final_path)
+        self.shard_paths.append(self._final_path)
+
+
+class JsonlShardSink(_RotatingShardSink):
+    """Shards JSON Lines : une paire {"dsl", "code"} par ligne."""
+
+    extension = ".jsonl"
+
+    def _encode(self, pair: Pair) -> bytes:
+        line = json.dumps(pair, ensure_ascii=False)
+        return (line + "\n").encode("utf-8")
+
+
+class BinaryShardSink(_RotatingShardSink):
+    """Shards binaires : chaînes utf-8 préfixées par leur longueur (u32)."""
+
+    extension = ".bin"
+
+    def _header(self) -> bytes:
+        return BINARY_MAGIC
+
+    def _encode(self, pair: Pair) -> bytes:
+        dsl = pair["dsl"].encode("utf-8")
+        code = pair["code"].encode("utf-8")
+        return b"".join((_LEN.pack(len(dsl)), dsl, _LEN.pack(len(code)), code))
+
+
+def write_pairs(pairs: Iterable[Pair], sink: PairSink) -> int:
+    """Écrit toutes les paires dans le sink et renvoie leur nombre."""
+    count = 0
+    write = sink.write
+    for pair in pairs:
+        write(pair)
+        count += 1
+    return count
+
+
+# ---------- Lecture ----------
+
+def iter_jsonl_shard(path: str) -> Iterator[Pair]:
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def iter_binary_shard(path: str) -> Iterator[Pair]:
+    with open(path, "rb") as f:
+        if f.read(len(BINARY_MAGIC)) != BINARY_MAGIC:
+            raise ValueError(f"{path} n'est pas un shard binaire de paires")
+        while True:
+            raw = f.read(_LEN.size)
+            if not raw:
+                return
+            dsl = f.read(_LEN.unpack(raw)[0]).decode("utf-8")
+            (code_len,) = _LEN.unpack(f.read(_LEN.size))
+            code = f.read(code_len).decode("utf-8")
+            yield {"dsl": dsl, "code": code}
+
+
+def finished_shards(directory: str, prefix: str = "pairs") -> List[str]:
+    """
+    Liste (triée) des shards terminés d'un répertoire.
+    Les fichiers .tmp en cours d'écriture sont ignorés.
+    """
+    names = sorted(
+        name for name in os.listdir(directory)
+        if name.startswith(prefix + "-")
+        and name.endswith((JsonlShardSink.extension, BinaryShardSink.extension))
+    )
+    return [os.path.join(directory, name) for name in names]
+
+
+def iter_shard(path: str) -> Iterator[Pair]:
+    """Lit un shard en choisissant le format d'après l'extension."""
+    if path.endswith(BinaryShardSink.extension):
+        return iter_binary_shard(path)
+    return iter_jsonl_shard(path)
+
+
+__all__ = [
+    "PairSink",
+    "JsonlShardSink",
+    "BinaryShardSink",
+    "write_pairs",
+    "iter_jsonl_shard",
+    "iter_binary_shard",
+    "iter_shard",
+    "finished_shards",
+]
@@ -0,0 +1,373 @@
+"""
+Export pré-tokenisé des paires (dsl, code) : tableaux d'entiers NumPy,
+tokenisés une seule fois, que l'entraînement n'a plus qu'à charger et
+découper.
+
+Vocabulaire fixe (build_vocabulary), dans cet ordre :
+- spéciaux       : <pad>, <bos>, <eos> (ids 0, 1, 2 ; jamais produits par encode) ;
+- octets         : <0x00> ... <0xff>, repli utf-8 pour tout caractère hors
+                   vocabulaire : la tokenisation est sans perte ;
+- caractères     : ASCII imprimable, "\n" et "\t" (nombres, ids, contenus) ;
+- littéraux de DSL_GRAMMAR : mots-clés, valeurs de SHAPE, noms de
+                   paramètres, ponctuation ;
+- gabarits du générateur : fragments fixes du code émis par
+                   generate_manim_scene, obtenus en émettant une scène
+                   sonde dont tous les champs variables valent une
+                   sentinelle, puis en découpant sur la sentinelle.
+Le vocabulaire suit donc la grammaire et GENERATOR_VERSION ; il est
+enregistré avec l'export (vocab.json) et relu de là.
+
+encode() découpe le texte au plus long token du vocabulaire à chaque
+position (sinon un caractère, sinon ses octets utf-8).
+
+Disposition d'un export (répertoire) :
+    vocab.json         : {"tokens": [...], "generator_version": ...}
+    dsl_tokens.npy     : tous les tokens dsl concaténés (uint16)
+    dsl_offsets.npy    : n + 1 offsets (int64) ; paire i = tokens[off[i]:off[i + 1]]
+    code_tokens.npy, code_offsets.npy : idem pour le code Manim
+Des .npy séparés (et non un .npz) pour pouvoir les ouvrir en mmap_mode="r".
+
+Nécessite NumPy (dépendance optionnelle, comme vector_sampler).
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import re
+from array import array
+from collections.abc import Sequence as SequenceABC
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from parser_manim.ast_nodes import (
+    Program,
+    CreateInstruction,
+    MoveInstruction,
+    RotateInstruction,
+)
+from parser_manim.grammar import DSL_GRAMMAR
+from traducteur_manim.generator import GENERATOR_VERSION, generate_manim_scene
+from traducteur_manim.optimizer import PlayGroup
+
+Pair = Dict[str, str]
+
+PAD, BOS, EOS = 0, 1, 2
+SPECIAL_TOKENS = ("<pad>", "<bos>", "<eos>")
+_BYTE_TOKENS = tuple(f"<0x{b:02x}>" for b in range(256))
+_CHAR_TOKENS = tuple(chr(c) for c in range(32, 127)) + ("\n", "\t")
+
+TOKEN_DTYPE = np.uint16
+VOCAB_FILE = "vocab.json"
+FIELDS = ("dsl", "code")
+
+# Sentinelle injectée dans les champs variables de la scène sonde
+_SENTINEL = "\x00"
+
+
+class Vocabulary:
+    """Table token <-> id, avec encode / decode sans perte."""
+
+    def __init__(self, tokens: Sequence[str]):
+        self.tokens: List[str] = list(tokens)
+        self.index: Dict[str, int] = {tok: i for i, tok in enumerate(self.tokens)}
+        if len(self.index) != len(self.tokens):
+            raise ValueError("Vocabulaire avec des tokens en double")
+        if len(self.tokens) > np.iinfo(TOKEN_DTYPE).max + 1:
+            raise ValueError(f"Vocabulaire trop grand pour {np.dtype(TOKEN_DTYPE).name}")
+        self._byte_base = self.index[_BYTE_TOKENS[0]]
+        # Tokens à plusieurs caractères, du plus long au plus court : le
+        # premier qui correspond est le plus long ; sinon un caractère.
+        words = sorted(
+            (tok for tok in self.tokens[self._byte_base + 256:] if len(tok) > 1),
+            key=len, reverse=True,
+        )
+        self._split = re.compile("|".join([*map(re.escape, words), "."]), re.S).findall
+
+    def __len__(self) -> int:
+        return len(self.tokens)
+
+    def encode(self, text: str) -> List[int]:
+        pieces = self._split(text)
+        index = self.index
+        try:
+            return [index[piece] for piece in pieces]
+        except KeyError:
+            pass
+        ids: List[int] = []
+        for piece in pieces:
+            i = index.get(piece)
+            if i is None:
+                ids.extend(self._byte_base + b for b in piece.encode("utf-8"))
+            else:
+                ids.append(i)
+        return ids
+
+    def decode(self, ids: Iterable[int]) -> str:
+        out: List[str] = []
+        pending = bytearray()
+        base, tokens = self._byte_base, self.tokens
+        for i in ids:
+            i = int(i)
+            if base <= i < base + 256:
+                pending.append(i - base)
+                continue
+            if pending:
+                out.append(pending.decode("utf-8", errors="replace"))
+                pending.clear()
+            if i >= len(SPECIAL_TOKENS):
+                out.append(tokens[i])
+        if pending:
+            out.append(pending.decode("utf-8", errors="replace"))
+        return "".join(out)
+
+    def to_json(self) -> str:
+        return json.dumps(
+            {"tokens": self.tokens, "generator_version": GENERATOR_VERSION},
+            ensure_ascii=False, indent=0,
+        )
+
+    @classmethod
+    def from_json(cls, text: str) -> "Vocabulary":
+        return cls(json.loads(text)["tokens"])
+
+
+def build_vocabulary() -> Vocabulary:
+    """Vocabulaire fixe dérivé de la grammaire et des gabarits du générateur."""
+    tokens = [*SPECIAL_TOKENS, *_BYTE_TOKENS, *_CHAR_TOKENS]
+    tokens.extend(grammar_literals())
+    tokens.extend(template_fragments())
+    return Vocabulary(dict.fromkeys(tokens))  # sans doublons, ordre conservé
+
+
+def grammar_literals() -> List[str]:
+    """Chaînes littérales de DSL_GRAMMAR ("CREATE", "circle", "radius", "(" ...)."""
+    literals: List[str] = []
+    for line in DSL_GRAMMAR.splitlines():
+        if not line.lstrip().startswith("//"):
+            literals.extend(re.findall(r'"([^"\s]+)"', line))
+    return list(dict.fromkeys(literals))
+
+
+def template_fragments() -> List[str]:
+    """
+    Fragments fixes du code émis par generate_manim_scene (une ligne au
+    plus chacun), pour toutes les formes de SHAPE, MOVE, ROTATE et PlayGroup.
+    """
+    s = _SENTINEL
+    shapes = re.search(r"SHAPE:(.*?)\n\n", DSL_GRAMMAR, re.S).group(1)
+    probe = [
+        CreateInstruction(
+            shape=shape, id=s, x=s, y=s, radius=s, size=s, width=s, height=s,
+            start=(s, s), end=(s, s), content=s,
+        )
+        for shape in re.findall(r'"(\w+)"', shapes)
+    ]
+    probe.append(CreateInstruction(shape="line", id=s, x=s, y=s))  # Line() sans extrémités
+    move = MoveInstruction(target_id=s, dx=s, dy=s, duration=s)
+    rotate = RotateInstruction(target_id=s, angle=s, duration=s)
+    probe += [move, rotate, PlayGroup(animations=[move, rotate], duration=s)]
+    code = generate_manim_scene(Program(instructions=probe), class_name=s)
+
+    fragments: List[str] = []
+    for part in code.split(s):
+        for line in part.split("\n"):
+            if len(line) > 1:
+                fragments.append(line)
+    return list(dict.fromkeys(fragments))
+
+
+# ---------- Export ----------
+
+def export_tokenized(
+    pairs: Iterable[Pair],
+    directory: str,
+    vocab: Optional[Vocabulary] = None,
+) -> int:
+    """
+    Tokenise les paires et écrit l'export dans `directory` (voir docstring
+    du module) ; renvoie le nombre de paires. Les tokens et les offsets
+    sont écrits au fil de l'eau (tampons de _FLUSH_ITEMS valeurs) : la
+    mémoire reste constante, comme avec les sinks de generer_manim.sinks.
+    Tous les fichiers (vocab.json compris) sont écrits en .tmp et renommés
+    seulement une fois tous complets ; en cas d'exception, rien n'est
+    publié et les fichiers partiels sont supprimés.
+    """
+    if vocab is None:
+        vocab = build_vocabulary()
+    os.makedirs(directory, exist_ok=True)
+    files: List[_NpyWriter] = []
+    vocab_path = os.path.join(directory, VOCAB_FILE)
+    published: List[str] = []
+    try:
+        writers = []
+        for field in FIELDS:
+            files.append(_NpyWriter(os.path.join(directory, f"{field}_tokens.npy"), "H", TOKEN_DTYPE))
+            files.append(_NpyWriter(os.path.join(directory, f"{field}_offsets.npy"), "q", np.int64))
+            writers.append((field, files[-2], files[-1]))
+            files[-1].append((0,))
+        encode = vocab.encode
+        count = 0
+        for pair in pairs:
+            for field, tokens, offsets in writers:
+                tokens.append(encode(pair[field]))
+                offsets.append((tokens.size,))
+            count += 1
+
+        for writer in files:
+            writer.close()
+        with open(vocab_path + ".tmp", "w", encoding="utf-8") as f:
+            f.write(vocab.to_json())
+        for path in [*(writer.path for writer in files), vocab_path]:
+            os.replace(path + ".tmp", path)
+            published.append(path)
+    except BaseException:
+        for path in [*(writer.path for writer in files), vocab_path]:
+            _remove(path + ".tmp")
+        for path in published:
+            _remove(path)
+        for writer in files:
+            writer.abort()
+        raise
+    return count
+
+
+def _remove(path: str) -> None:
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+# Nombre de valeurs tamponnées avant écriture, par fichier
+_FLUSH_ITEMS = 1 << 20
+
+
+class _NpyWriter:
+    """
+    Écrit un tableau .npy 1-D au fil de l'eau : l'en-tête est écrit pour
+    une longueur nulle, les valeurs sont ajoutées par tampons, puis
+    l'en-tête est réécrit avec la longueur finale (sa taille est fixe :
+    bourrage à 64 octets). Le fichier reste en .tmp : export_tokenized ne
+    le renomme qu'une fois tout l'export écrit.
+    """
+
+    def __init__(self, path: str, typecode: str, dtype):
+        self.path = path
+        self.size = 0
+        self._tmp_path = path + ".tmp"
+        # les valeurs sont écrites dans l'ordre natif : l'en-tête le déclare
+        self._descr = np.lib.format.dtype_to_descr(np.dtype(dtype).newbyteorder("="))
+        self._buffer = array(typecode)
+        self._file = open(self._tmp_path, "wb")
+        self._write_header()
+        self._data_start = self._file.tell()
+
+    def append(self, values: Iterable[int]) -> None:
+        buffer = self._buffer
+        before = len(buffer)
+        buffer.extend(values)
+        self.size += len(buffer) - before
+        if len(buffer) >= _FLUSH_ITEMS:
+            buffer.tofile(self._file)
+            del buffer[:]
+
+    def close(self) -> None:
+        f = self._file
+        self._buffer.tofile(f)
+        del self._buffer[:]
+        f.seek(0)
+        self._write_header()
+        if f.tell() != self._data_start:
+            raise ValueError(f"En-tête .npy de taille variable pour {self.path}")
+        f.close()
+
+    def abort(self) -> None:
+        if not self._file.closed:
+            self._file.close()
+        _remove(self._tmp_path)
+
+    def _write_header(self) -> None:
+        np.lib.format.write_array_header_1_0(
+            self._file,
+            {"descr": self._descr, "fortran_order": False, "shape": (self.size,)},
+        )
+
+
+def load_vocabulary(directory: str) -> Vocabulary:
+    with open(os.path.join(directory, VOCAB_FILE), "r", encoding="utf-8") as f:
+        return Vocabulary.from_json(f.read())
+
+
+class TokenizedDataset(SequenceABC):
+    """
+    Lecture d'un export : dataset[i] == {"dsl": ids, "code": ids}, tableaux
+    NumPy en lecture seule, vues sur les fichiers ouverts en mmap (aucune
+    copie). Slices = vues ; picklable par chemin (workers de DataLoader).
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._arrays = {
+            name: np.load(os.path.join(directory, f"{name}.npy"), mmap_mode="r")
+            for field in FIELDS
+            for name in (f"{field}_tokens", f"{field}_offsets")
+        }
+        self._indices = range(len(self._arrays["dsl_offsets"]) - 1)
+        self._vocab: Optional[Vocabulary] = None
+
+    @classmethod
+    def _view(cls, directory: str, indices: range) -> "TokenizedDataset":
+        view = cls(directory)
+        view._indices = indices
+        return view
+
+    @property
+    def vocab(self) -> Vocabulary:
+        if self._vocab is None:
+            self._vocab = load_vocabulary(self.directory)
+        return self._vocab
+
+    def __len__(self) -> int:
+        return len(self._indices)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            view = TokenizedDataset.__new__(TokenizedDataset)
+            view.directory, view._arrays, view._vocab = self.directory, self._arrays, self._vocab
+            view._indices = self._indices[i]
+            return view
+        index = self._indices[i]  # IndexError hors limites, index négatifs gérés
+        arrays = self._arrays
+        out = {}
+        for field in FIELDS:
+            offsets = arrays[f"{field}_offsets"]
+            out[field] = arrays[f"{field}_tokens"][offsets[index]:offsets[index + 1]]
+        return out
+
+    def decode(self, i: int) -> Pair:
+        """Paire i retraduite en texte (contrôle de l'export)."""
+        item = self[i]
+        return {field: self.vocab.decode(item[field]) for field in FIELDS}
+
+    def __reduce__(self):
+        return (TokenizedDataset._view, (self.directory, self._indices))
+
+    def __repr__(self) -> str:
+        r = self._indices
+        return f"TokenizedDataset({self.directory!r}, indices=range({r.start}, {r.stop}, {r.step}))"
+
+
+__all__ = [
+    "PAD",
+    "BOS",
+    "EOS",
+    "Vocabulary",
+    "build_vocabulary",
+    "grammar_literals",
+    "template_fragments",
+    "export_tokenized",
+    "load_vocabulary",
+    "TokenizedDataset",
+]
@@ -0,0 +1,174 @@
+"""
+Moteur de tirage vectorisé (NumPy) pour le générateur de paires.
+
+Même distribution que _build_program_ast (pair_generator.py), mais tous
+les tirages d'un lot de programmes sont faits en quelques appels NumPy :
+nombre d'instructions, taille du pool d'ids, types d'instruction, ids,
+formes, contenus, puis un bloc (N, 6) de réels uniformes mis à l'échelle
+et arrondis selon la colonne. Il ne reste en Python que la construction
+des nœuds de l'AST.
+
+Sens des 6 colonnes numériques selon le type de ligne :
+- CREATE : x, y, puis radius | size | width, height | x1, y1, x2, y2
+- MOVE   : dx, dy, duration, tirage "duration présente"
+- ROTATE : angle, duration, tirage "duration présente"
+
+Le flux aléatoire n'est pas celui du moteur "python" : pour une même
+seed, les deux moteurs donnent des datasets différents (chacun
+déterministe). L'état global de random / numpy.random n'est pas touché.
+
+Nécessite NumPy (dépendance optionnelle : importé seulement avec
+engine="numpy").
+"""
+
+from __future__ import annotations
+
+from typing import List
+
+import numpy as np
+
+from parser_manim.ast_nodes import (
+    Program,
+    CreateInstruction,
+    MoveInstruction,
+    RotateInstruction,
+    Instruction,
+)
+
+from .pair_generator import OBJ_IDS, SHAPES, TEXT_CONTENTS
+
+
+# Probabilités cumulées CREATE / MOVE / ROTATE (cf. _build_program_ast)
+_KIND_CDF = np.cumsum([0.55, 0.30, 0.15])
+_P_FORCE_CREATE = 0.7
+_P_NO_DURATION = 0.25
+
+# Types de ligne : 0..4 = CREATE de SHAPES[i], puis MOVE, ROTATE
+_ROW_MOVE = len(SHAPES)
+_ROW_ROTATE = len(SHAPES) + 1
+
+_COORD = (-3.0, 3.0)
+_DELTA = (-2.0, 2.0)
+_DURATION = (0.5, 3.0)
+_UNIT = (0.0, 1.0)  # colonne non mise à l'échelle (tirage de probabilité)
+
+# Bornes [lo, hi) et nombre de décimales de chaque colonne, par type de ligne
+_RANGES = {
+    "circle":    (_COORD, _COORD, (0.5, 2.0), _UNIT, _UNIT, _UNIT),
+    "square":    (_COORD, _COORD, (0.5, 2.0), _UNIT, _UNIT, _UNIT),
+    "rectangle": (_COORD, _COORD, (1.0, 3.0), (0.5, 2.0), _UNIT, _UNIT),
+    "line":      (_COORD, _COORD, _COORD, _COORD, _COORD, _COORD),
+    "text":      (_COORD, _COORD, _UNIT, _UNIT, _UNIT, _UNIT),
+    "MOVE":      (_DELTA, _DELTA, _DURATION, _UNIT, _UNIT, _UNIT),
+    "ROTATE":    ((15.0, 180.0), _DURATION, _UNIT, _UNIT, _UNIT, _UNIT),
+}
+_ROW_NAMES = (*SHAPES, "MOVE", "ROTATE")
+_LO = np.array([[r[0] for r in _RANGES[name]] for name in _ROW_NAMES])
+_SPAN = np.array([[r[1] - r[0] for r in _RANGES[name]] for name in _ROW_NAMES])
+# L'angle de ROTATE est arrondi à 1 décimale, tout le reste à 2
+_ONE_DIGIT = np.zeros_like(_LO, dtype=bool)
+_ONE_DIGIT[_ROW_ROTATE, 0] = True
+
+
+def shard_generator(master_seed: int, shard: int) -> np.random.Generator:
+    """Generator NumPy propre au shard (stable entre processus et exécutions)."""
+    return np.random.default_rng([master_seed % (1 << 64), shard])
+
+
+def redraw_generator(master_seed: int, index: int, attempt: int) -> np.random.Generator:
+    """Generator d'un re-tirage isolé de la paire `index` (mode valid_only)."""
+    return np.random.default_rng([master_seed % (1 << 64), index, attempt])
+
+
+def sample_programs(
+    rng: np.random.Generator,
+    count: int,
+    start: int = 0,
+    stop: int | None = None,
+) -> List[Program]:
+    """
+    Tire les colonnes de `count` programmes en un lot (voir docstring du
+    module), puis ne construit que les programmes [start, stop) : les
+    tirages, eux, ne dépendent que de count.
+    """
+    if stop is None:
+        stop = count
+    start, stop = max(0, start), min(stop, count)
+    if start >= stop:
+        return []
+
+    # --- Structure des programmes ---
+    lengths = rng.integers(1, 9, size=count)
+    pool_sizes = rng.integers(2, 9, size=count)
+    force_create = rng.random(count) < _P_FORCE_CREATE
+
+    n = int(lengths.sum())
+    ends = np.cumsum(lengths)
+    starts = ends - lengths
+    program_of = np.repeat(np.arange(count), lengths)
+
+    # --- Type de chaque instruction (0 = CREATE, 1 = MOVE, 2 = ROTATE) ---
+    kinds = np.searchsorted(_KIND_CDF, rng.random(n) * _KIND_CDF[-1])
+    has_create = np.add.reduceat(kinds == 0, starts) > 0
+    kinds[(ends - 1)[force_create & ~has_create]] = 0
+
+    # --- Champs discrets ---
+    ids = rng.integers(0, pool_sizes[program_of])
+    shapes = rng.integers(0, len(SHAPES), size=n)
+    contents = rng.integers(0, len(TEXT_CONTENTS), size=n)
+
+    # --- Champs numériques : un bloc (n, 6) mis à l'échelle par type de ligne ---
+    row_types = np.where(kinds == 0, shapes, np.where(kinds == 1, _ROW_MOVE, _ROW_ROTATE))
+    raw = _LO[row_types] + rng.random((n, 6)) * _SPAN[row_types]
+    values = np.where(_ONE_DIGIT[row_types], np.round(raw, 1), np.round(raw, 2))
+    # le tirage "duration présente" doit rester brut
+    with_duration = np.where(kinds == 1, raw[:, 3], raw[:, 2]) >= _P_NO_DURATION
+
+    lo, hi = int(starts[start]), int(ends[stop - 1])
+    return _build(
+        (starts[start:stop] - lo).tolist(), (ends[start:stop] - lo).tolist(),
+        row_types[lo:hi].tolist(), ids[lo:hi].tolist(), contents[lo:hi].tolist(),
+        values[lo:hi].tolist(), with_duration[lo:hi].tolist(),
+    )
+
+
+def _build(
+    starts: List[int],
+    ends: List[int],
+    row_types: List[int],
+    ids: List[int],
+    contents: List[int],
+    values: List[List[float]],
+    with_duration: List[bool],
+) -> List[Program]:
+    """Construit les nœuds de l'AST à partir des colonnes (listes Python)."""
+    instructions: List[Instruction] = []
+    for row, obj_i, content_i, v, timed in zip(row_types, ids, contents, values, with_duration):
+        obj_id = OBJ_IDS[obj_i]
+        if row == _ROW_MOVE:
+            instructions.append(MoveInstruction(
+                target_id=obj_id, dx=v[0], dy=v[1], duration=v[2] if timed else None,
+            ))
+        elif row == _ROW_ROTATE:
+            instructions.append(RotateInstruction(
+                target_id=obj_id, angle=v[0], duration=v[1] if timed else None,
+            ))
+        else:
+            shape = SHAPES[row]
+            instr = CreateInstruction(shape=shape, id=obj_id, x=v[0], y=v[1])
+            if shape == "circle":
+                instr.radius = v[2]
+            elif shape == "square":
+                instr.size = v[2]
+            elif shape == "rectangle":
+                instr.width, instr.height = v[2], v[3]
+            elif shape == "line":
+                instr.start, instr.end = (v[2], v[3]), (v[4], v[5])
+            else:
+                instr.content = TEXT_CONTENTS[content_i]
+            instructions.append(instr)
+
+    return [Program(instructions=instructions[lo:hi]) for lo, hi in zip(starts, ends)]
+
+
+__all__ = ["sample_programs", "shard_generator", "redraw_generator"]
@@ -1,30 +1,94 @@
 """
-Script principal pour générer un dataset DSL -> Manim
-et l'enregistrer au format Pickle (.pkl).
+Script principal pour générer un dataset DSL -> Manim.
+
+Par défaut, les paires sont écrites au fil de l'eau en shards JSONL
+(mémoire constante, shards lisibles dès qu'ils sont terminés).
+Les formats "bin" (binaire préfixé par la longueur) et "pickle"
+(ancien format : une seule liste en mémoire) restent disponibles, ainsi
+que "mmap" : un seul fichier indexé, à accès aléatoire, pour les loaders
+d'entraînement (generer_manim.mmap_dataset), et "tokens" : paires déjà
+tokenisées en tableaux NumPy (generer_manim.tokenized).
 """
 
+import os
 import pickle
-from generer_manim.pair_generator import generate_pairs
+from generer_manim.dedup import DedupStats, iter_unique_pairs
+from generer_manim.mmap_dataset import MmapPairSink
+from generer_manim.pair_generator import generate_pairs, iter_pairs
+from generer_manim.sinks import BinaryShardSink, JsonlShardSink, write_pairs
+from parser_manim import instrumentation
 
 
 def main() -> None:
     # Paramètres du dataset
     N_PAIRS = 10_000
     SEED = 42
+    WORKERS = os.cpu_count() or 1  # la sortie ne dépend pas de cette valeur
+    OUTPUT_FORMAT = "jsonl"        # "jsonl" | "bin" | "pickle" | "mmap" | "tokens"
+    OUTPUT_DIR = "dataset_dsl_manim"
     OUTPUT_FILE = "dataset_dsl_manim.pkl"
+    MMAP_FILE = "dataset_dsl_manim.pairs"
+    TOKENS_DIR = "dataset_dsl_manim_tokens"
+    SHARD_SIZE = 100_000           # paires par shard (jsonl / bin)
+    ENGINE = "python"              # "python" | "numpy" (tirages vectorisés)
+    VALID_ONLY = False             # retire les instructions sémantiquement invalides
+    DEDUP = False                  # N paires uniques (sauf pickle)
+    PROFILE = False                # affiche le temps par étape en fin de run
+
+    if PROFILE:
+        instrumentation.enable()
 
-    print("Génération du dataset...")
-    pairs = generate_pairs(n=N_PAIRS, seed=SEED)
+    print(f"Génération du dataset ({WORKERS} workers)...")
 
-    print(f"Nombre de paires générées : {len(pairs)}")
+    if OUTPUT_FORMAT == "pickle":
+        pairs = generate_pairs(
+            n=N_PAIRS, seed=SEED, workers=WORKERS, engine=ENGINE, valid_only=VALID_ONLY,
+        )
+        print(f"Nombre de paires générées : {len(pairs)}")
 
-    # Sauvegarde en Pickle
-    print(f"Sauvegarde dans {OUTPUT_FILE} ...")
-    with open(OUTPUT_FILE, "wb") as f:
-        pickle.dump(pairs, f)
+        # Sauvegarde en Pickle
+        print(f"Sauvegarde dans {OUTPUT_FILE} ...")
+        with open(OUTPUT_FILE, "wb") as f:
+            pickle.dump(pairs, f)
+    else:
+        dedup_stats = DedupStats()
+        if DEDUP:
+            pairs_iter = iter_unique_pairs(
+                n=N_PAIRS, seed=SEED, workers=WORKERS, engine=ENGINE, valid_only=VALID_ONLY,
+                stats=dedup_stats,
+            )
+        else:
+            pairs_iter = iter_pairs(
+                n=N_PAIRS, seed=SEED, workers=WORKERS, engine=ENGINE, valid_only=VALID_ONLY,
+            )
+        if OUTPUT_FORMAT == "mmap":
+            print(f"Écriture du dataset mmap dans {MMAP_FILE} ...")
+            with MmapPairSink(MMAP_FILE) as sink:
+                count = write_pairs(pairs_iter, sink)
+            print(f"Nombre de paires générées : {count}")
+        elif OUTPUT_FORMAT == "tokens":
+            from generer_manim.tokenized import export_tokenized  # NumPy requis
+            print(f"Export tokenisé dans {TOKENS_DIR}/ ...")
+            count = export_tokenized(pairs_iter, TOKENS_DIR)
+            print(f"Nombre de paires générées : {count}")
+        else:
+            sink_cls = JsonlShardSink if OUTPUT_FORMAT == "jsonl" else BinaryShardSink
+            print(f"Écriture en shards {OUTPUT_FORMAT} dans {OUTPUT_DIR}/ ...")
+            with sink_cls(OUTPUT_DIR, shard_size=SHARD_SIZE) as sink:
+                count = write_pairs(pairs_iter, sink)
+            print(f"Nombre de paires générées : {count} ({len(sink.shard_paths)} shards)")
+        if DEDUP:
+            print(
+                f"Doublons écartés : {dedup_stats.duplicates} / {dedup_stats.seen} "
+                f"({dedup_stats.duplicate_rate:.3%})"
+            )
 
     print("Dataset sauvegardé avec succès ✅")
 
+    if PROFILE:
+        print()
+        print(instrumentation.format_stats())
+
 
 if __name__ == "__main__":
     main()
@@ -2,11 +2,16 @@
 Définition de l'AST (Abstract Syntax Tree) pour le DSL Manim.
 On définit ici des classes Python simples qui représentent
 les instructions de notre langage.
+
+Les nœuds utilisent __slots__ (pas de __dict__ par instance) et internent
+shape / id : des millions d'instructions partagent alors quelques chaînes.
+Pour de très gros corpus, voir aussi ProgramBatch (columnar.py).
 """
 
 from __future__ import annotations
 
 from dataclasses import dataclass
+from sys import intern
 from typing import List, Optional, Tuple, Union
 
 
@@ -17,7 +22,7 @@ Point = Tuple[float, float]
 
 # ---------- Instructions ----------
 
-@dataclass
+@dataclass(slots=True)
 class CreateInstruction:
     """
     Représente une instruction de type :
@@ -35,8 +40,13 @@ class CreateInstruction:
     end: Optional[Point] = None     # fin de segment (pour line)
     content: Optional[str] = None   # texte (pour text)
 
+    def __post_init__(self) -> None:
+        self.shape = intern(self.shape)
+        if self.id is not None:
+            self.id = intern(self.id)
+
 
-@dataclass
+@dataclass(slots=True)
 class MoveInstruction:
     """
     Représente une instruction de type :
@@ -47,8 +57,11 @@ class MoveInstruction:
     dy: float = 0.0
     duration: Optional[float] = None
 
+    def __post_init__(self) -> None:
+        self.target_id = intern(self.target_id)
 
-@dataclass
+
+@dataclass(slots=True)
 class RotateInstruction:
     """
     Représente une instruction de type :
@@ -58,12 +71,15 @@ class RotateInstruction:
     angle: float
     duration: Optional[float] = None
 
+    def __post_init__(self) -> None:
+        self.target_id = intern(self.target_id)
+
 
 # Union pratique pour typer les listes d'instructions
 Instruction = Union[CreateInstruction, MoveInstruction, RotateInstruction]
 
 
-@dataclass
+@dataclass(slots=True)
 class Program:
     """
     Représente un programme complet :
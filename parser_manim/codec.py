@@ -0,0 +1,401 @@
+"""
+Codec binaire versionné pour les Program (cache entre étapes de pipeline).
+
+Plus compact et plus rapide que pickle sur des listes de petits nœuds
+avec beaucoup de champs None, et aller-retour exact :
+loads(dumps(p)) == p (valeurs float64 bit à bit, None conservés).
+
+Un enregistrement contient un bloc de programmes (un seul pour dumps) ;
+little-endian :
+    en-tête (HEADER, 36 octets) :
+        MAGIC "DSLB" | u8 version | u8 flags | u16 réservé
+        | u32 longueur du corps | u32 nb programmes | u32 nb instructions
+        | u32 nb chaînes | u32 nb CREATE | u32 nb références | u32 nb réels
+    corps, en sections (toutes les sections numériques sont lues par un
+    seul struct.unpack_from) :
+        tailles        : par programme, son nombre d'instructions,
+                         u8 / u16 / u32 selon flags ;
+        longueurs      : des chaînes, u8 / u16 / u32 selon flags ;
+        opcodes        : 1 octet par instruction : opcode (bits 0-1)
+                         + présence des champs MOVE / ROTATE (bits 4-6) ;
+        masques CREATE : u16 par CREATE, un bit par champ optionnel
+                         (voir _CREATE_FIELDS) ;
+        références     : index dans la table des chaînes (u8 / u16 / u32),
+                         pour shape, id, content et target_id ;
+        réels          : float64 des champs présents, dans l'ordre ;
+        chaînes        : utf-8 concaténé.
+La table des chaînes est commune au bloc : chaque id, forme ou contenu n'y
+apparaît qu'une fois. En-tête, table et lecture des sections sont des
+coûts fixes par enregistrement : pour beaucoup de petits programmes,
+dumps_many / dump_many (blocs de BLOCK_SIZE) sont nettement plus rapides
+et plus compacts qu'un enregistrement par programme.
+
+    data = dumps(program)
+    assert loads(data) == program
+
+    with open("programs.bin", "wb") as f:
+        dump_many(programs, f)
+    with open("programs.bin", "rb") as f:
+        for program in iter_load(f):
+            ...
+"""
+
+from __future__ import annotations
+
+import functools
+import struct
+from itertools import islice
+from typing import BinaryIO, Dict, Iterable, Iterator, List, Sequence, Tuple
+
+from .ast_nodes import (
+    Program,
+    CreateInstruction,
+    MoveInstruction,
+    RotateInstruction,
+    Instruction,
+)
+
+
+MAGIC = b"DSLB"
+CODEC_VERSION = 2   # 1 : tailles de programmes toujours en u16 (encore lisible)
+
+HEADER = struct.Struct("<4sBBHIIIIIII")
+BLOCK_SIZE = 1024           # programmes par enregistrement dans dump_many
+
+OP_CREATE = 0
+OP_MOVE = 1
+OP_ROTATE = 2
+_OP_MASK = 0x03
+
+# Présence des champs MOVE / ROTATE, dans l'octet d'opcode
+_HAS_DELTA_1 = 0x10   # dx (MOVE) ou angle (ROTATE)
+_HAS_DELTA_2 = 0x20   # dy (MOVE)
+_HAS_DURATION = 0x40
+
+# Champs optionnels de CREATE, bit i du masque = _CREATE_FIELDS[i]
+_CREATE_FIELDS = (
+    "id", "radius", "size", "width", "height", "x", "y", "start", "end", "content",
+)
+_ID, _RADIUS, _SIZE, _WIDTH, _HEIGHT, _X, _Y, _START, _END, _CONTENT = (
+    1 << i for i in range(len(_CREATE_FIELDS))
+)
+
+# flags : largeur des références (bits 0-1), des longueurs de chaînes
+# (bits 2-3) et des tailles de programmes (bits 4-5)
+_WIDTHS = ("B", "H", "I")
+_LIMITS = (0xFF, 0xFFFF, 0xFFFFFFFF)
+
+
+# ---------- API ----------
+
+def dumps(program: Program) -> bytes:
+    """Encode un Program en un enregistrement binaire."""
+    return _encode((program,))
+
+
+def loads(data: bytes) -> Program:
+    """Décode un enregistrement produit par dumps()."""
+    programs = loads_many(data)
+    if len(programs) != 1:
+        raise ValueError(f"Enregistrement de {len(programs)} programmes (loads_many attendu)")
+    return programs[0]
+
+
+def dumps_many(programs: Sequence[Program]) -> bytes:
+    """Encode une liste de Program en un seul enregistrement (bloc)."""
+    return _encode(programs)
+
+
+def loads_many(data: bytes) -> List[Program]:
+    """Décode un enregistrement produit par dumps() ou dumps_many()."""
+    programs, end = _decode(data, 0)
+    if end != len(data):
+        raise ValueError("Données en trop après l'enregistrement")
+    return programs
+
+
+def dump(program: Program, f: BinaryIO) -> int:
+    """Écrit un enregistrement dans un flux binaire ; renvoie sa taille."""
+    return f.write(dumps(program))
+
+
+def dump_many(programs: Iterable[Program], f: BinaryIO, block_size: int = BLOCK_SIZE) -> int:
+    """Écrit les programmes par blocs de block_size ; renvoie leur nombre."""
+    if block_size <= 0:
+        raise ValueError("block_size doit être > 0")
+    count = 0
+    programs = iter(programs)
+    while True:
+        block = list(islice(programs, block_size))
+        if not block:
+            return count
+        f.write(_encode(block))
+        count += len(block)
+
+
+def load(f: BinaryIO) -> Program:
+    """Lit un enregistrement d'un seul programme ; EOFError en fin de flux (comme pickle.load)."""
+    programs = load_many(f)
+    if len(programs) != 1:
+        raise ValueError(f"Enregistrement de {len(programs)} programmes (load_many attendu)")
+    return programs[0]
+
+
+def load_many(f: BinaryIO) -> List[Program]:
+    """Lit l'enregistrement suivant (un bloc) ; EOFError en fin de flux."""
+    header = f.read(HEADER.size)
+    if not header:
+        raise EOFError("Fin du flux")
+    length = _read_header(header, 0)[4]
+    body = f.read(length)
+    if len(body) < length:
+        raise ValueError("Enregistrement binaire tronqué")
+    return loads_many(header + body)
+
+
+def iter_load(f: BinaryIO) -> Iterator[Program]:
+    """Produit les programmes d'un flux écrit avec dump / dump_many."""
+    while True:
+        try:
+            programs = load_many(f)
+        except EOFError:
+            return
+        yield from programs
+
+
+# ---------- Encodage ----------
+
+def _encode(programs: Sequence[Program]) -> bytes:
+    table: Dict[str, int] = {}
+    sizes: List[int] = []
+    ops: List[int] = []
+    masks: List[int] = []
+    refs: List[int] = []
+    floats: List[float] = []
+
+    def ref(s: str) -> int:
+        i = table.get(s)
+        if i is None:
+            i = table[s] = len(table)
+        return i
+
+    for program in programs:
+        instructions = program.instructions
+        sizes.append(len(instructions))
+        for instr in instructions:
+            kind = type(instr)
+            if kind is CreateInstruction:
+                mask = 0
+                refs.append(ref(instr.shape))
+                if instr.id is not None:
+                    mask |= _ID
+                    refs.append(ref(instr.id))
+                if instr.radius is not None:
+                    mask |= _RADIUS
+                    floats.append(instr.radius)
+                if instr.size is not None:
+                    mask |= _SIZE
+                    floats.append(instr.size)
+                if instr.width is not None:
+                    mask |= _WIDTH
+                    floats.append(instr.width)
+                if instr.height is not None:
+                    mask |= _HEIGHT
+                    floats.append(instr.height)
+                if instr.x is not None:
+                    mask |= _X
+                    floats.append(instr.x)
+                if instr.y is not None:
+                    mask |= _Y
+                    floats.append(instr.y)
+                if instr.start is not None:
+                    mask |= _START
+                    floats.extend(instr.start)
+                if instr.end is not None:
+                    mask |= _END
+                    floats.extend(instr.end)
+                if instr.content is not None:
+                    mask |= _CONTENT
+                    refs.append(ref(instr.content))
+                ops.append(OP_CREATE)
+                masks.append(mask)
+            elif kind is MoveInstruction:
+                op = OP_MOVE
+                refs.append(ref(instr.target_id))
+                if instr.dx is not None:
+                    op |= _HAS_DELTA_1
+                    floats.append(instr.dx)
+                if instr.dy is not None:
+                    op |= _HAS_DELTA_2
+                    floats.append(instr.dy)
+                if instr.duration is not None:
+                    op |= _HAS_DURATION
+                    floats.append(instr.duration)
+                ops.append(op)
+            elif kind is RotateInstruction:
+                op = OP_ROTATE
+                refs.append(ref(instr.target_id))
+                if instr.angle is not None:
+                    op |= _HAS_DELTA_1
+                    floats.append(instr.angle)
+                if instr.duration is not None:
+                    op |= _HAS_DURATION
+                    floats.append(instr.duration)
+                ops.append(op)
+            else:
+                raise TypeError(f"Instruction inconnue : {instr!r}")
+
+    encoded = [s.encode("utf-8") for s in table]
+    lengths = [len(b) for b in encoded]
+    flags = (
+        _width(len(table) - 1)
+        | _width(max(lengths, default=0)) << 2
+        | _width(max(sizes, default=0)) << 4
+    )
+    body = _body_struct(
+        flags, len(sizes), len(table), len(ops), len(masks), len(refs), len(floats),
+    ).pack(*sizes, *lengths, *ops, *masks, *refs, *floats)
+    body += b"".join(encoded)
+    header = HEADER.pack(
+        MAGIC, CODEC_VERSION, flags, 0, len(body), len(sizes), len(ops),
+        len(table), len(masks), len(refs), len(floats),
+    )
+    return header + body
+
+
+# ---------- Décodage ----------
+
+def _decode(data: bytes, pos: int) -> Tuple[List[Program], int]:
+    (_, version, flags, _, length, n_programs, n_instr,
+     n_strings, n_creates, n_refs, n_floats) = _read_header(data, pos)
+    if version == 1:
+        flags = flags & 0x0F | 1 << 4   # tailles en u16
+    pos += HEADER.size
+    end = pos + length
+    if end > len(data):
+        raise ValueError("Enregistrement binaire tronqué")
+    body = _body_struct(flags, n_programs, n_strings, n_instr, n_creates, n_refs, n_floats)
+    try:
+        values = body.unpack_from(data, pos)
+    except struct.error:
+        raise ValueError("Enregistrement binaire tronqué") from None
+
+    # sections, dans l'ordre de _encode()
+    a = n_programs
+    b = a + n_strings
+    c = b + n_instr
+    d = c + n_creates
+    e = d + n_refs
+    lengths = values[a:b]
+    pos += body.size
+    if pos + sum(lengths) != end:
+        raise ValueError("Enregistrement binaire incohérent")
+    strings: List[str] = []
+    for n in lengths:
+        strings.append(str(data[pos:pos + n], "utf-8"))
+        pos += n
+
+    next_mask = iter(values[c:d]).__next__
+    next_ref = iter(values[d:e]).__next__
+    next_float = iter(values[e:]).__next__
+    instructions: List[Instruction] = []
+    append = instructions.append
+    try:
+        for op in values[b:c]:
+            kind = op & _OP_MASK
+            if kind == OP_CREATE:
+                mask = next_mask()
+                shape = strings[next_ref()]
+                # arguments positionnels, dans l'ordre des champs (plus rapide)
+                append(CreateInstruction(
+                    shape,
+                    strings[next_ref()] if mask & _ID else None,
+                    next_float() if mask & _RADIUS else None,
+                    next_float() if mask & _SIZE else None,
+                    next_float() if mask & _WIDTH else None,
+                    next_float() if mask & _HEIGHT else None,
+                    next_float() if mask & _X else None,
+                    next_float() if mask & _Y else None,
+                    (next_float(), next_float()) if mask & _START else None,
+                    (next_float(), next_float()) if mask & _END else None,
+                    strings[next_ref()] if mask & _CONTENT else None,
+                ))
+            elif kind == OP_MOVE:
+                append(MoveInstruction(
+                    strings[next_ref()],
+                    next_float() if op & _HAS_DELTA_1 else None,
+                    next_float() if op & _HAS_DELTA_2 else None,
+                    next_float() if op & _HAS_DURATION else None,
+                ))
+            elif kind == OP_ROTATE:
+                append(RotateInstruction(
+                    strings[next_ref()],
+                    next_float() if op & _HAS_DELTA_1 else None,
+                    next_float() if op & _HAS_DURATION else None,
+                ))
+            else:
+                raise ValueError(f"Opcode inconnu : {op}")
+    except (IndexError, StopIteration):
+        raise ValueError("Enregistrement binaire incohérent") from None
+
+    if n_programs == 1 and values[0] == n_instr:
+        return [Program(instructions)], end
+    programs: List[Program] = []
+    start = 0
+    for size in values[:a]:
+        programs.append(Program(instructions[start:start + size]))
+        start += size
+    if start != n_instr:
+        raise ValueError("Enregistrement binaire incohérent")
+    return programs, end
+
+
+def _read_header(data: bytes, pos: int) -> tuple:
+    if len(data) - pos < HEADER.size:
+        raise ValueError("Enregistrement binaire tronqué")
+    fields = HEADER.unpack_from(data, pos)
+    if fields[0] != MAGIC:
+        raise ValueError("Données qui ne sont pas un Program encodé (MAGIC invalide)")
+    if fields[1] not in (1, CODEC_VERSION):
+        raise ValueError(f"Version du codec non supportée : {fields[1]} (attendu : {CODEC_VERSION})")
+    return fields
+
+
+@functools.lru_cache(maxsize=4096)
+def _body_struct(
+    flags: int,
+    n_programs: int,
+    n_strings: int,
+    n_instr: int,
+    n_creates: int,
+    n_refs: int,
+    n_floats: int,
+) -> struct.Struct:
+    """Struct des sections numériques du corps (tout sauf l'utf-8)."""
+    return struct.Struct(
+        f"<{n_programs}{_WIDTHS[(flags >> 4) & 0x03]}"
+        f"{n_strings}{_WIDTHS[(flags >> 2) & 0x03]}{n_instr}B"
+        f"{n_creates}H{n_refs}{_WIDTHS[flags & 0x03]}{n_floats}d"
+    )
+
+
+def _width(largest: int) -> int:
+    for code, limit in enumerate(_LIMITS):
+        if largest <= limit:
+            return code
+    raise ValueError(f"Valeur trop grande pour le codec : {largest}")
+
+
+__all__ = [
+    "CODEC_VERSION",
+    "BLOCK_SIZE",
+    "dumps",
+    "loads",
+    "dumps_many",
+    "loads_many",
+    "dump",
+    "dump_many",
+    "load",
+    "load_many",
+    "iter_load",
+]
@@ -0,0 +1,281 @@
+"""
+Représentation columnar (struct-of-arrays) d'un lot de programmes.
+
+Un Program est une liste d'objets Python : ~220 octets par instruction.
+ProgramBatch range N programmes dans quelques tableaux NumPy contigus
+(~95 octets par instruction, sans objet Python par instruction) et permet
+des requêtes vectorisées sur des dizaines de millions d'instructions.
+
+Colonnes (une ligne par instruction, tous programmes confondus) :
+- opcodes  : uint8, OP_CREATE / OP_MOVE / OP_ROTATE
+- ids      : int32, index dans strings (id ou target_id), -1 = None
+- shapes   : int32, index dans strings (CREATE uniquement), -1 sinon
+- contents : int32, index dans strings (content de CREATE), -1 = None
+- values   : float64 (n, 10), NaN = None ; sens des colonnes selon l'opcode
+             (voir FIELDS) ;
+- offsets  : int64 (nb_programmes + 1), lignes [offsets[i], offsets[i+1])
+             du programme i.
+
+Exemple :
+    batch = ProgramBatch.from_programs(programs)
+    moves = batch.opcodes == OP_MOVE
+    mean_dx = batch.column("dx")[moves].mean()
+    assert batch[0] == programs[0]
+
+Nécessite NumPy (dépendance optionnelle : seul ce module l'importe).
+"""
+
+from __future__ import annotations
+
+from array import array
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence
+
+import numpy as np
+
+from .ast_nodes import (
+    Program,
+    CreateInstruction,
+    MoveInstruction,
+    RotateInstruction,
+    Instruction,
+)
+
+
+OP_CREATE = 0
+OP_MOVE = 1
+OP_ROTATE = 2
+
+# Sens des colonnes de `values` pour chaque opcode
+FIELDS = {
+    OP_CREATE: (
+        "radius", "size", "width", "height", "x", "y",
+        "start_x", "start_y", "end_x", "end_y",
+    ),
+    OP_MOVE: ("dx", "dy", "duration"),
+    OP_ROTATE: ("angle", "duration"),
+}
+N_VALUES = max(len(names) for names in FIELDS.values())
+
+_NAN = float("nan")
+_NO_VALUES = (_NAN,) * N_VALUES
+
+# nom de champ -> (opcodes concernés, colonne)
+_COLUMNS: Dict[str, List[tuple]] = {}
+for _op, _names in FIELDS.items():
+    for _j, _name in enumerate(_names):
+        _COLUMNS.setdefault(_name, []).append((_op, _j))
+
+
+class ProgramBatch:
+    """Lot de programmes stocké en colonnes NumPy (voir docstring du module)."""
+
+    __slots__ = ("opcodes", "ids", "shapes", "contents", "values", "offsets", "strings")
+
+    def __init__(
+        self,
+        opcodes: np.ndarray,
+        ids: np.ndarray,
+        shapes: np.ndarray,
+        contents: np.ndarray,
+        values: np.ndarray,
+        offsets: np.ndarray,
+        strings: Sequence[str],
+    ):
+        self.opcodes = opcodes
+        self.ids = ids
+        self.shapes = shapes
+        self.contents = contents
+        self.values = values
+        self.offsets = offsets
+        self.strings = list(strings)
+
+    # ---------- Construction ----------
+
+    @classmethod
+    def from_programs(cls, programs: Iterable[Program]) -> "ProgramBatch":
+        """
+        Construit un lot à partir de Program. Les colonnes sont accumulées
+        dans des array.array compacts, jamais dans des listes d'objets.
+        """
+        opcodes = array("B")
+        ids = array("i")
+        shapes = array("i")
+        contents = array("i")
+        values = array("d")
+        offsets = array("q", [0])
+
+        strings: List[str] = []
+        index: Dict[str, int] = {}
+
+        def intern_index(s: Optional[str]) -> int:
+            if s is None:
+                return -1
+            i = index.get(s)
+            if i is None:
+                i = index[s] = len(strings)
+                strings.append(s)
+            return i
+
+        for program in programs:
+            for instr in program.instructions:
+                if isinstance(instr, CreateInstruction):
+                    start = instr.start or (None, None)
+                    end = instr.end or (None, None)
+                    row = (
+                        instr.radius, instr.size, instr.width, instr.height,
+                        instr.x, instr.y, start[0], start[1], end[0], end[1],
+                    )
+                    opcodes.append(OP_CREATE)
+                    ids.append(intern_index(instr.id))
+                    shapes.append(intern_index(instr.shape))
+                    contents.append(intern_index(instr.content))
+                elif isinstance(instr, MoveInstruction):
+                    row = (instr.dx, instr.dy, instr.duration)
+                    opcodes.append(OP_MOVE)
+                    ids.append(intern_index(instr.target_id))
+                    shapes.append(-1)
+                    contents.append(-1)
+                elif isinstance(instr, RotateInstruction):
+                    row = (instr.angle, instr.duration)
+                    opcodes.append(OP_ROTATE)
+                    ids.append(intern_index(instr.target_id))
+                    shapes.append(-1)
+                    contents.append(-1)
+                else:
+                    raise TypeError(f"Instruction inconnue : {instr!r}")
+
+                values.extend(_NAN if v is None else v for v in row)
+                values.extend(_NO_VALUES[len(row):])
+            offsets.append(len(opcodes))
+
+        return cls(
+            opcodes=np.frombuffer(opcodes, dtype=np.uint8),
+            ids=np.frombuffer(ids, dtype=np.int32),
+            shapes=np.frombuffer(shapes, dtype=np.int32),
+            contents=np.frombuffer(contents, dtype=np.int32),
+            values=np.frombuffer(values, dtype=np.float64).reshape(-1, N_VALUES),
+            offsets=np.frombuffer(offsets, dtype=np.int64),
+            strings=strings,
+        )
+
+    @classmethod
+    def from_program(cls, program: Program) -> "ProgramBatch":
+        return cls.from_programs([program])
+
+    # ---------- Retour vers l'AST ----------
+
+    def to_program(self, i: int) -> Program:
+        """Reconstruit le Program i (égal, au sens ==, à l'original)."""
+        n = len(self)
+        if i < 0:
+            i += n
+        if not 0 <= i < n:
+            raise IndexError("index de programme hors limites")
+
+        lo, hi = int(self.offsets[i]), int(self.offsets[i + 1])
+        strings = self.strings
+        rows = zip(
+            self.opcodes[lo:hi].tolist(),
+            self.ids[lo:hi].tolist(),
+            self.shapes[lo:hi].tolist(),
+            self.contents[lo:hi].tolist(),
+            self.values[lo:hi].tolist(),
+        )
+
+        instructions: List[Instruction] = []
+        for op, id_i, shape_i, content_i, vals in rows:
+            v = [None if x != x else x for x in vals]  # NaN -> None
+            obj_id = strings[id_i] if id_i >= 0 else None
+            if op == OP_CREATE:
+                instructions.append(CreateInstruction(
+                    shape=strings[shape_i],
+                    id=obj_id,
+                    radius=v[0], size=v[1], width=v[2], height=v[3],
+                    x=v[4], y=v[5],
+                    start=(v[6], v[7]) if v[6] is not None else None,
+                    end=(v[8], v[9]) if v[8] is not None else None,
+                    content=strings[content_i] if content_i >= 0 else None,
+                ))
+            elif op == OP_MOVE:
+                instructions.append(MoveInstruction(
+                    target_id=obj_id, dx=v[0], dy=v[1], duration=v[2],
+                ))
+            else:
+                instructions.append(RotateInstruction(
+                    target_id=obj_id, angle=v[0], duration=v[1],
+                ))
+        return Program(instructions=instructions)
+
+    def to_programs(self) -> List[Program]:
+        return [self.to_program(i) for i in range(len(self))]
+
+    # ---------- Protocole séquence ----------
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i: int) -> Program:
+        return self.to_program(i)
+
+    def __iter__(self) -> Iterator[Program]:
+        for i in range(len(self)):
+            yield self.to_program(i)
+
+    # ---------- Requêtes vectorisées ----------
+
+    @property
+    def n_instructions(self) -> int:
+        return len(self.opcodes)
+
+    def column(self, name: str) -> np.ndarray:
+        """
+        Valeurs du champ `name` pour toutes les instructions (NaN pour les
+        instructions qui n'ont pas ce champ ou où il vaut None).
+        Ex. column("duration") couvre MOVE et ROTATE.
+        """
+        try:
+            locations = _COLUMNS[name]
+        except KeyError:
+            raise KeyError(f"Champ inconnu : {name!r}") from None
+        out = np.full(len(self.opcodes), np.nan)
+        for op, j in locations:
+            rows = self.opcodes == op
+            out[rows] = self.values[rows, j]
+        return out
+
+    def counts(self) -> Dict[str, int]:
+        """Nombre d'instructions par type."""
+        c = np.bincount(self.opcodes, minlength=3)
+        return {"CREATE": int(c[OP_CREATE]), "MOVE": int(c[OP_MOVE]), "ROTATE": int(c[OP_ROTATE])}
+
+    def program_lengths(self) -> np.ndarray:
+        """Nombre d'instructions de chaque programme."""
+        return np.diff(self.offsets)
+
+    def program_index(self) -> np.ndarray:
+        """Pour chaque instruction, l'index de son programme."""
+        return np.repeat(np.arange(len(self), dtype=np.int64), self.program_lengths())
+
+    def string_index(self, s: str) -> int:
+        """Index de s dans la table de chaînes (-1 si absent)."""
+        try:
+            return self.strings.index(s)
+        except ValueError:
+            return -1
+
+    @property
+    def nbytes(self) -> int:
+        """Taille des colonnes NumPy (hors table de chaînes)."""
+        return sum(
+            a.nbytes for a in
+            (self.opcodes, self.ids, self.shapes, self.contents, self.values, self.offsets)
+        )
+
+
+__all__ = [
+    "ProgramBatch",
+    "OP_CREATE",
+    "OP_MOVE",
+    "OP_ROTATE",
+    "FIELDS",
+]
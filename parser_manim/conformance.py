@@ -0,0 +1,187 @@
+"""
+Suite de conformité : backends "lark-inline" et "fast" contre le backend
+"lark" (référence).
+
+Pour chaque entrée du corpus, chaque backend doit, comme la référence :
+- soit accepter l'entrée et produire exactement le même Program ;
+- soit la rejeter avec DslParseError.
+
+Le corpus contient des cas écrits à la main (acceptés et rejetés),
+puis des mutations aléatoires (déterministes) de ces cas : insertion /
+suppression / duplication de caractères et de tokens de la grammaire.
+
+Usage :
+    python -m parser_manim.conformance [nombre_de_mutations] [seed]
+"""
+
+from __future__ import annotations
+
+import random
+import sys
+from dataclasses import dataclass
+from typing import Iterable, Iterator, List, Optional
+
+from .ast_nodes import Program
+from .errors import DslParseError
+from .parser_engine import BACKENDS, parse_string
+
+REFERENCE = "lark"
+CANDIDATES = tuple(b for b in BACKENDS if b != REFERENCE)
+
+
+ACCEPTED = [
+    "CREATE circle(id=c1, radius=1, x=0, y=0)",
+    "CREATE square(id=s1, size=2, x=1, y=1)\nMOVE(id=s1, dx=1, dy=0, duration=2)",
+    "CREATE rectangle(id=r, width=2.5, height=1.)",
+    "CREATE triangle(id=t)",
+    "CREATE line(id=l, start=(0,0), end=(1.5,-2))",
+    "CREATE line(start = ( -.5 , +3e2 ) , end=(1E-3,2))",
+    'CREATE text(id=t1, content="Hello", x=-1, y=2)',
+    'CREATE text(content="a, b) \\" c")',
+    'CREATE text(content="")',
+    'CREATE text(content="\\\\")',
+    "CREATE circle()",
+    "CREATE circle(id=a, id=b, radius=1, radius=2)",
+    "CREATEcircle(id=a)MOVE(id=a)ROTATE(id=a,angle=1)",
+    "MOVE(id=a)",
+    "MOVE(id=a, duration=3)",
+    "MOVE(id=a, dy=1, dx=2, dy=3)",
+    "MOVE(id=CREATE, dx=1)",
+    "MOVE(id=x, dx=1)",
+    "MOVE(id=circle)",
+    "ROTATE(id=a, angle=90)",
+    "ROTATE(id=_a1, angle=-45.5, duration=0.5)",
+    "ROTATE ( id = a , angle = 1.e5 , duration = 2 )",
+    "\n\n  CREATE circle(id=c1)\t\r\n\f MOVE(id=c1)\n\n",
+    "CREATE circle(id=a, x=12345678901234567890, y=1e308)",
+]
+
+REJECTED = [
+    "",
+    "   \n\t",
+    "CREATE",
+    "CREATE circle",
+    "CREATE circle(",
+    "CREATE circle(id=a",
+    "CREATE circle(id=a,)",
+    "CREATE circle(,)",
+    "CREATE hexagon(id=a)",
+    "CREATE circles(id=a)",
+    "CREATE circle(id=1a)",
+    "CREATE circle(idx=1)",
+    "CREATE circle(radius=)",
+    "CREATE circle(radius=a)",
+    "CREATE circle(radius=1e)",
+    "CREATE circle(radius=- 1)",
+    "CREATE circle(radius=1.2.3)",
+    "CREATE circle(radius=1 2)",
+    "CREATE line(start=(1,2,3))",
+    "CREATE line(start=1)",
+    'CREATE text(content=Hello)',
+    'CREATE text(content="a)',
+    'CREATE text(content="a\nb")',
+    'CREATE text(content="\\")',
+    "create circle(id=a)",
+    "MOVE(id=a,)",
+    "MOVE(dx=1)",
+    "MOVE(id=a, angle=1)",
+    "MOVE id=a",
+    "ROTATE(id=a)",
+    "ROTATE(id=a, duration=1, angle=2)",
+    "ROTATE(id=a, angle=1, duration=2, x=1)",
+    "CREATE circle(id=a)\nMOVE(id=a",
+    "CREATE circle(id=a) garbage",
+    "CREATE circle(id=a)\v",
+    "CREATE circle(id=a, x=١)",
+]
+
+# Fragments utilisés par les mutations (tokens de la grammaire + bruit)
+_TOKENS = [
+    "CREATE", "MOVE", "ROTATE", "circle", "square", "rectangle", "line",
+    "text", "triangle", "id", "radius", "size", "width", "height", "x", "y",
+    "start", "end", "content", "dx", "dy", "duration", "angle",
+    "(", ")", ",", "=", '"', "\\", "-", "+", ".", "e", "1", "42", "0.5",
+    " ", "\n", "\t", "a", "_", "é",
+]
+
+
+@dataclass
+class Mismatch:
+    source: str
+    backend: str
+    expected: object    # résultat de la référence : Program ou DslParseError
+    got: object
+
+
+def _outcome(source: str, backend: str) -> object:
+    try:
+        return parse_string(source, backend=backend)
+    except DslParseError as e:
+        return e
+
+
+def check(source: str) -> Optional[Mismatch]:
+    """Compare chaque backend à la référence ; None si tous conformes."""
+    expected = _outcome(source, REFERENCE)
+    for backend in CANDIDATES:
+        got = _outcome(source, backend)
+        if isinstance(expected, Program) and isinstance(got, Program):
+            ok = expected == got
+        else:
+            ok = isinstance(expected, DslParseError) and isinstance(got, DslParseError)
+        if not ok:
+            return Mismatch(source, backend, expected, got)
+    return None
+
+
+def mutations(seeds: List[str], count: int, seed: int = 0) -> Iterator[str]:
+    """Produit count mutations déterministes des entrées seeds."""
+    rng = random.Random(seed)
+    for _ in range(count):
+        text = rng.choice(seeds)
+        for _ in range(rng.randint(1, 3)):
+            pos = rng.randint(0, len(text))
+            op = rng.random()
+            if op < 0.4:
+                text = text[:pos] + rng.choice(_TOKENS) + text[pos:]
+            elif op < 0.7:
+                text = text[:pos] + text[pos + rng.randint(1, 4):]
+            elif op < 0.85:
+                other = rng.randint(0, len(text))
+                lo, hi = min(pos, other), max(pos, other)
+                text = text[:hi] + text[lo:hi] + text[hi:]
+            else:
+                text = text + "\n" + rng.choice(seeds)
+        yield text
+
+
+def run(sources: Iterable[str]) -> List[Mismatch]:
+    return [m for m in map(check, sources) if m is not None]
+
+
+def main(argv: List[str]) -> int:
+    count = int(argv[0]) if argv else 20_000
+    seed = int(argv[1]) if len(argv) > 1 else 0
+
+    failures: List[Mismatch] = []
+    for source in ACCEPTED:
+        result = _outcome(source, REFERENCE)
+        if not isinstance(result, Program):
+            failures.append(Mismatch(source, REFERENCE, "(accepté)", result))
+    for source in REJECTED:
+        result = _outcome(source, REFERENCE)
+        if isinstance(result, Program):
+            failures.append(Mismatch(source, REFERENCE, "(rejeté)", result))
+
+    failures += run(ACCEPTED + REJECTED)
+    failures += run(mutations(ACCEPTED + REJECTED, count, seed))
+
+    total = len(ACCEPTED) + len(REJECTED) + count
+    for m in failures[:20]:
+        print(f"--- {m.source!r} [{m.backend}]\n  attendu : {m.expected}\n  obtenu  : {m.got}")
+    print(f"{total - len(failures)}/{total} entrées conformes")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -2,6 +2,50 @@
 Définition des erreurs spécifiques au parser DSL Manim.
 """
 
+from __future__ import annotations
+
+from typing import Optional, Sequence, Tuple
+
+
 class DslParseError(Exception):
-    """Erreur levée lorsque le parsing du DSL échoue."""
-    pass
+    """
+    Erreur levée lorsque le parsing du DSL échoue.
+
+    Quand l'erreur vient d'une erreur de syntaxe localisée, elle porte aussi :
+    - line / column : position (1-based) du token fautif ;
+    - expected : tokens attendus à cette position, ex. ('")"', '","', 'NUM').
+    """
+
+    def __init__(
+        self,
+        message: str,
+        line: Optional[int] = None,
+        column: Optional[int] = None,
+        expected: Sequence[str] = (),
+    ):
+        super().__init__(message)
+        self.line = line
+        self.column = column
+        self.expected: Tuple[str, ...] = tuple(expected)
+
+    def __reduce__(self):
+        # Conserve les attributs structurés à travers pickle (pool de workers)
+        return (type(self), (str(self), self.line, self.column, self.expected))
+
+
+class DslSemanticError(Exception):
+    """
+    Erreur levée par l'analyse sémantique (semantics.check) : programme
+    syntaxiquement valide mais incohérent (cible non créée, paramètre requis
+    manquant...).
+    - index : index (0-based) de l'instruction fautive ;
+    - code : code du diagnostic, ex. "undefined-target".
+    """
+
+    def __init__(self, message: str, index: Optional[int] = None, code: Optional[str] = None):
+        super().__init__(message)
+        self.index = index
+        self.code = code
+
+    def __reduce__(self):
+        return (type(self), (str(self), self.index, self.code))
@@ -0,0 +1,392 @@
+"""
+Backend "fast" : scanner + parseur à descente récursive écrits à la main.
+
+Le DSL est minuscule (CREATE / MOVE / ROTATE avec paramètres nommés) :
+plutôt que de passer par le lexer générique de Lark, un Tree puis un
+Transformer, on construit directement le Program.
+
+Deux niveaux :
+- chemin rapide : une seule regex par instruction (+ une passe sur les
+  paramètres de CREATE / MOVE), qui couvre toute instruction bien formée ;
+- chemin lent : descente récursive token par token, utilisée quand la
+  regex ne matche pas. Elle accepte exactement le langage de la
+  grammaire Lark et sert à localiser précisément l'erreur.
+
+Les terminaux reprennent les expressions que Lark compile pour DSL_GRAMMAR
+(WS, IDENT, SIGNED_NUMBER, ESCAPED_STRING, SHAPE) ; les mots-clés sont
+reconnus comme des littéraux, sans frontière de mot, comme le fait le
+lexer contextuel de Lark (ex. "CREATEcircle(id=a)" est accepté).
+
+La conformité avec le backend Lark est vérifiée par parser_manim.conformance.
+
+parse_recovering() est le mode tolérant : il reprend au mot-clé suivant
+après chaque erreur et renvoie toutes les erreurs d'un fichier en une passe.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from .ast_nodes import (
+    Program,
+    CreateInstruction,
+    MoveInstruction,
+    RotateInstruction,
+    Instruction,
+)
+from .errors import DslParseError
+
+
+# ---------- Terminaux ----------
+
+_WS = r"[ \t\f\r\n]*"
+_IDENT = r"[a-zA-Z_][a-zA-Z0-9_]*"
+_NUM = (
+    r"[+-]?(?:[0-9]+[eE][+-]?[0-9]+"
+    r"|(?:[0-9]+\.(?:[0-9]+)?|\.[0-9]+)(?:[eE][+-]?[0-9]+)?"
+    r"|[0-9]+)"
+)
+# Équivalent non ambigu de l'ESCAPED_STRING de Lark : se termine au premier
+# guillemet non échappé, sans traverser de fin de ligne.
+_STRING = r'"(?:[^"\\\n]|\\[^\n])*"'
+_SHAPE = r"(?:rectangle|triangle|circle|square|line|text)"
+
+_WS_RE = re.compile(_WS)
+_IDENT_RE = re.compile(_IDENT)
+_NUM_RE = re.compile(_NUM)
+_STRING_RE = re.compile(_STRING)
+_SHAPE_RE = re.compile(_SHAPE)
+
+_CREATE_NUM_PARAMS = ("radius", "size", "width", "height", "x", "y")
+_CREATE_PARAMS = ("id",) + _CREATE_NUM_PARAMS + ("start", "end", "content")
+_MOVE_PARAMS = ("dx", "dy", "duration")
+
+
+# ---------- Chemin rapide : une regex par instruction ----------
+
+def _create_param(named: bool) -> str:
+    def g(name: str) -> str:
+        return f"?P<{name}>" if named else "?:"
+
+    return (
+        rf"({g('num_name')}{'|'.join(_CREATE_NUM_PARAMS)}){_WS}={_WS}({g('num')}{_NUM})"
+        rf"|id{_WS}={_WS}({g('ident')}{_IDENT})"
+        rf"|({g('pt_name')}start|end){_WS}={_WS}\({_WS}"
+        rf"({g('px')}{_NUM}){_WS},{_WS}({g('py')}{_NUM}){_WS}\)"
+        rf"|content{_WS}={_WS}({g('string')}{_STRING})"
+    )
+
+
+def _move_param(named: bool) -> str:
+    name, num = ("?P<name>", "?P<num>") if named else ("?:", "?:")
+    return rf"({name}{'|'.join(_MOVE_PARAMS)}){_WS}={_WS}({num}{_NUM})"
+
+
+def _param_list(param: str) -> str:
+    return rf"(?:{param})(?:{_WS},{_WS}(?:{param}))*"
+
+
+def _compile_fast_paths() -> Dict[str, Tuple["re.Pattern[str]", Callable]]:
+    """
+    Compile les regex du chemin rapide. Appelé au premier parse seulement :
+    la compilation coûte plus que tout le reste de l'import du module.
+    """
+    global _CREATE_PARAM_RE, _MOVE_PARAM_RE
+
+    # Chaque regex consomme aussi les blancs qui suivent l'instruction.
+    create_re = re.compile(
+        rf"CREATE{_WS}(?P<shape>{_SHAPE}){_WS}\({_WS}"
+        rf"(?P<params>{_param_list(_create_param(False))})?{_WS}\){_WS}"
+    )
+    move_re = re.compile(
+        rf"MOVE{_WS}\({_WS}id{_WS}={_WS}(?P<id>{_IDENT})"
+        rf"(?:{_WS},{_WS}(?P<params>{_param_list(_move_param(False))}))?{_WS}\){_WS}"
+    )
+    rotate_re = re.compile(
+        rf"ROTATE{_WS}\({_WS}id{_WS}={_WS}(?P<id>{_IDENT}){_WS},{_WS}"
+        rf"angle{_WS}={_WS}(?P<angle>{_NUM})"
+        rf"(?:{_WS},{_WS}duration{_WS}={_WS}(?P<duration>{_NUM}))?{_WS}\){_WS}"
+    )
+    _CREATE_PARAM_RE = re.compile(_create_param(True))
+    _MOVE_PARAM_RE = re.compile(_move_param(True))
+
+    return {
+        "C": (create_re, _fast_create),
+        "M": (move_re, _fast_move),
+        "R": (rotate_re, _fast_rotate),
+    }
+
+
+# Remplis par _compile_fast_paths() au premier parse
+_FAST_PATHS: Optional[Dict[str, Tuple["re.Pattern[str]", Callable]]] = None
+_CREATE_PARAM_RE: Any = None
+_MOVE_PARAM_RE: Any = None
+
+
+def _fast_create(m: "re.Match[str]") -> CreateInstruction:
+    params: Dict[str, Any] = {}
+    text = m.group("params")
+    if text:
+        for p in _CREATE_PARAM_RE.finditer(text):
+            kind = p.lastgroup
+            if kind == "num":
+                params[p.group("num_name")] = float(p.group("num"))
+            elif kind == "ident":
+                params["id"] = p.group("ident")
+            elif kind == "py":
+                params[p.group("pt_name")] = (float(p.group("px")), float(p.group("py")))
+            else:
+                params["content"] = p.group("string")[1:-1]
+    return CreateInstruction(shape=m.group("shape"), **params)
+
+
+def _fast_move(m: "re.Match[str]") -> MoveInstruction:
+    params: Dict[str, float] = {}
+    text = m.group("params")
+    if text:
+        for p in _MOVE_PARAM_RE.finditer(text):
+            params[p.group("name")] = float(p.group("num"))
+    return MoveInstruction(
+        target_id=m.group("id"),
+        dx=params.get("dx", 0.0),
+        dy=params.get("dy", 0.0),
+        duration=params.get("duration"),
+    )
+
+
+def _fast_rotate(m: "re.Match[str]") -> RotateInstruction:
+    duration = m.group("duration")
+    return RotateInstruction(
+        target_id=m.group("id"),
+        angle=float(m.group("angle")),
+        duration=float(duration) if duration is not None else None,
+    )
+
+
+# ---------- Chemin lent : descente récursive ----------
+
+class _Parser:
+    """
+    Parseur token par token. Chaque méthode saute les blancs, lit un
+    terminal à self.pos ou lève DslParseError avec la position et la
+    liste des tokens attendus.
+    """
+
+    def __init__(self, text: str, pos: int = 0):
+        self.text = text
+        self.pos = pos
+
+    # --- Lecture des terminaux ---
+
+    def skip_ws(self) -> int:
+        self.pos = _WS_RE.match(self.text, self.pos).end()
+        return self.pos
+
+    def peek_literal(self, *literals: str) -> Optional[str]:
+        self.skip_ws()
+        for literal in literals:
+            if self.text.startswith(literal, self.pos):
+                return literal
+        return None
+
+    def literal(self, *literals: str) -> str:
+        found = self.peek_literal(*literals)
+        if found is None:
+            self.error([f'"{lit}"' for lit in literals])
+        self.pos += len(found)
+        return found
+
+    def terminal(self, regex: "re.Pattern[str]", name: str) -> str:
+        self.skip_ws()
+        m = regex.match(self.text, self.pos)
+        if m is None:
+            self.error([name])
+        self.pos = m.end()
+        return m.group()
+
+    def num(self) -> float:
+        return float(self.terminal(_NUM_RE, "NUM"))
+
+    def error(self, expected: Sequence[str]) -> None:
+        raise _syntax_error(self.text, self.pos, expected)
+
+    # --- Règles ---
+
+    def instruction(self) -> Instruction:
+        keyword = self.literal("CREATE", "MOVE", "ROTATE")
+        if keyword == "CREATE":
+            return self.instr_create()
+        if keyword == "MOVE":
+            return self.instr_move()
+        return self.instr_rotate()
+
+    def instr_create(self) -> CreateInstruction:
+        shape = self.terminal(_SHAPE_RE, "SHAPE")
+        self.literal("(")
+        params: Dict[str, Any] = {}
+        token = self.literal(")", *_CREATE_PARAMS)   # liste de paramètres optionnelle
+        while token != ")":
+            name = token
+            self.literal("=")
+            if name == "id":
+                params["id"] = self.terminal(_IDENT_RE, "IDENT")
+            elif name in ("start", "end"):
+                self.literal("(")
+                x = self.num()
+                self.literal(",")
+                y = self.num()
+                self.literal(")")
+                params[name] = (x, y)
+            elif name == "content":
+                params["content"] = self.terminal(_STRING_RE, "STRING")[1:-1]
+            else:
+                params[name] = self.num()
+            if self.literal(",", ")") == ")":
+                break
+            token = self.literal(*_CREATE_PARAMS)
+        return CreateInstruction(shape=shape, **params)
+
+    def instr_move(self) -> MoveInstruction:
+        self.literal("(")
+        self.literal("id")
+        self.literal("=")
+        target_id = self.terminal(_IDENT_RE, "IDENT")
+        params: Dict[str, float] = {}
+        if self.literal(",", ")") == ",":
+            while True:
+                name = self.literal(*_MOVE_PARAMS)
+                self.literal("=")
+                params[name] = self.num()
+                if self.literal(",", ")") == ")":
+                    break
+        return MoveInstruction(
+            target_id=target_id,
+            dx=params.get("dx", 0.0),
+            dy=params.get("dy", 0.0),
+            duration=params.get("duration"),
+        )
+
+    def instr_rotate(self) -> RotateInstruction:
+        self.literal("(")
+        self.literal("id")
+        self.literal("=")
+        target_id = self.terminal(_IDENT_RE, "IDENT")
+        self.literal(",")
+        self.literal("angle")
+        self.literal("=")
+        angle = self.num()
+        duration = None
+        if self.literal(",", ")") == ",":
+            self.literal("duration")
+            self.literal("=")
+            duration = self.num()
+            self.literal(")")
+        return RotateInstruction(target_id=target_id, angle=angle, duration=duration)
+
+
+# ---------- Erreurs ----------
+
+def _line_col(text: str, pos: int) -> Tuple[int, int]:
+    line = text.count("\n", 0, pos) + 1
+    column = pos - (text.rfind("\n", 0, pos) + 1) + 1
+    return line, column
+
+
+def _syntax_error(text: str, pos: int, expected: Sequence[str]) -> DslParseError:
+    line, column = _line_col(text, pos)
+    expected = sorted(expected)
+    found = f"{text[pos]!r} inattendu" if pos < len(text) else "fin de l'entrée inattendue"
+    return DslParseError(
+        f"Erreur de syntaxe dans le DSL : {found} "
+        f"(ligne {line}, colonne {column}) ; attendu : {', '.join(expected)}",
+        line=line,
+        column=column,
+        expected=expected,
+    )
+
+
+# ---------- API ----------
+
+def parse_instruction_at(text: str, pos: int) -> Tuple[Instruction, int]:
+    """
+    Parse une instruction qui commence à text[pos] (blancs initiaux déjà
+    sautés). Renvoie (instruction, position après les blancs qui suivent).
+    """
+    global _FAST_PATHS
+    if _FAST_PATHS is None:
+        _FAST_PATHS = _compile_fast_paths()
+
+    fast = _FAST_PATHS.get(text[pos:pos + 1])
+    if fast is not None:
+        regex, build = fast
+        m = regex.match(text, pos)
+        if m is not None:
+            return build(m), m.end()
+
+    parser = _Parser(text, pos)
+    instr = parser.instruction()
+    return instr, parser.skip_ws()
+
+
+def parse_fast(source: str) -> Program:
+    """
+    Parse une chaîne DSL avec le backend "fast" et renvoie un Program.
+    Lève DslParseError en cas d'erreur de syntaxe.
+    """
+    instructions: List[Instruction] = []
+    append = instructions.append
+    end = len(source)
+    pos = _WS_RE.match(source).end()
+
+    while pos < end:
+        instr, pos = parse_instruction_at(source, pos)
+        append(instr)
+
+    if not instructions:
+        # programme: instruction+
+        raise _syntax_error(source, pos, _KEYWORDS)
+    return Program(instructions=instructions)
+
+
+# Point de reprise : un mot-clé d'instruction qui ne prolonge pas un
+# identifiant (ex. "id=MOVEME" n'est pas une reprise)
+_RESYNC_RE = re.compile(r"(?<![A-Za-z0-9_])(?:CREATE|MOVE|ROTATE)")
+_KEYWORDS = ('"CREATE"', '"MOVE"', '"ROTATE"')
+
+
+def parse_recovering(source: str) -> Tuple[Program, List[DslParseError]]:
+    """
+    Parse en reprenant après chaque erreur de syntaxe : renvoie le Program
+    des instructions valides et la liste des DslParseError rencontrées
+    (line, column, expected), dans l'ordre du texte. Un fichier valide
+    donne exactement le Program de parse_fast et aucune erreur.
+
+    Après une erreur, le texte est ignoré jusqu'au prochain mot-clé
+    CREATE / MOVE / ROTATE (situé à la position de l'erreur ou après,
+    et pas au milieu d'un identifiant), où le parse reprend.
+    """
+    instructions: List[Instruction] = []
+    errors: List[DslParseError] = []
+    end = len(source)
+    pos = _WS_RE.match(source).end()
+    line_starts: Optional[List[int]] = None
+
+    while pos < end:
+        try:
+            instr, pos = parse_instruction_at(source, pos)
+        except DslParseError as e:
+            errors.append(e)
+            if line_starts is None:
+                line_starts = [0] + [m.end() for m in re.finditer("\n", source)]
+            error_pos = line_starts[e.line - 1] + e.column - 1
+            m = _RESYNC_RE.search(source, max(error_pos, pos + 1))
+            if m is None:
+                break
+            pos = m.start()
+        else:
+            instructions.append(instr)
+
+    if not instructions and not errors:
+        errors.append(_syntax_error(source, pos, _KEYWORDS))
+    return Program(instructions=instructions), errors
@@ -6,9 +6,24 @@ Ce fichier définit uniquement :
 - une petite fonction make_parser() pour construire un parseur Lark
 
 L’AST et la logique de transformation seront gérés dans parser_engine.py / ast_nodes.py.
+
+Les tables LALR sont mises en cache sur disque (cache de Lark) : un nouveau
+processus charge un fichier au lieu d'analyser la grammaire. Le nom du
+fichier contient une empreinte de DSL_GRAMMAR, et Lark revérifie l'empreinte
+(grammaire + options + version) au chargement : toute modification de la
+grammaire invalide le cache. Répertoire : $PARSER_MANIM_CACHE_DIR, sinon
+$XDG_CACHE_HOME/parser_manim (~/.cache/parser_manim) ; une valeur vide
+désactive le cache.
 """
 
-from lark import Lark
+from __future__ import annotations
+
+import hashlib
+import os
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    from lark import Lark, Transformer
 
 DSL_GRAMMAR = r"""
 // --------- Règle de départ ---------
@@ -20,7 +35,10 @@ programme: instruction+
 
 // --------- Instructions ---------
 
-instruction: instr_create
+// Les règles préfixées par "?" ne font que relayer leur unique enfant :
+// Lark les aplatit, aucun nœud intermédiaire n'est créé.
+
+?instruction: instr_create
            | instr_move
            | instr_rotate
 
@@ -29,7 +47,7 @@ instruction: instr_create
 
 instr_create: "CREATE" shape "(" create_param_list? ")"
 
-shape: SHAPE
+?shape: SHAPE
 
 SHAPE: "circle"
      | "square"
@@ -41,7 +59,7 @@ SHAPE: "circle"
 
 create_param_list: create_param ("," create_param)*
 
-create_param: param_id
+?create_param: param_id
             | param_radius
             | param_size
             | param_width
@@ -71,7 +89,7 @@ instr_move: "MOVE" "(" "id" "=" IDENT ("," move_param_list)? ")"
 
 move_param_list: move_param ("," move_param)*
 
-move_param: param_dx
+?move_param: param_dx
           | param_dy
           | param_duration
 
@@ -99,9 +117,46 @@ STRING: ESCAPED_STRING
 """
 
 
-def make_parser() -> Lark:
+GRAMMAR_DIGEST = hashlib.sha256(DSL_GRAMMAR.encode("utf-8")).hexdigest()[:16]
+
+
+def parser_cache_path() -> Optional[str]:
+    """
+    Chemin du fichier de tables LALR en cache, ou None si le cache est
+    désactivé (PARSER_MANIM_CACHE_DIR="").
+    """
+    directory = os.environ.get("PARSER_MANIM_CACHE_DIR")
+    if directory is None:
+        base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+        directory = os.path.join(base, "parser_manim")
+    if not directory:
+        return None
+    return os.path.join(directory, f"lalr-{GRAMMAR_DIGEST}.lark")
+
+
+def make_parser(transformer: Optional[Transformer] = None, cache: bool = True) -> Lark:
     """
     Construit et renvoie un parseur Lark pour le DSL Manim.
     (On utilisera cette fonction dans parser_engine.py)
+
+    Si un transformer est fourni, Lark l'applique pendant la passe LALR :
+    parse() renvoie directement son résultat, sans construire de Tree.
+    Le transformer ne fait pas partie de l'empreinte du cache : les deux
+    modes partagent le même fichier de tables.
     """
-    return Lark(DSL_GRAMMAR, start="programme", parser="lalr")
+    from lark import Lark
+
+    cache_path = parser_cache_path() if cache else None
+    if cache_path is not None:
+        try:
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+        except OSError:
+            cache_path = None  # répertoire non inscriptible : pas de cache
+
+    return Lark(
+        DSL_GRAMMAR,
+        start="programme",
+        parser="lalr",
+        transformer=transformer,
+        cache=cache_path or False,
+    )
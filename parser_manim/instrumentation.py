@@ -0,0 +1,205 @@
+"""
+Instrumentation optionnelle du pipeline DSL -> Manim.
+
+Timers par étape et compteurs, désactivés par défaut : chaque point de
+mesure se réduit alors à la lecture d'un booléen de module (ENABLED),
+sans appel de fonction ni lecture d'horloge.
+
+    from parser_manim import instrumentation
+    instrumentation.enable()
+    code = generate_manim_from_source(src)
+    print(instrumentation.format_stats())
+
+Étapes (secondes cumulées + nombre d'appels) :
+- parse.<backend>        : parse_string complet (parse.lark, parse.fast...) ;
+- parse.lark.tree        : passe LALR seule (backend "lark") ;
+- parse.lark.transform   : ASTBuilder.transform (backend "lark") ;
+- codegen                : generate_manim_scene ;
+- translate              : generate_manim_from_source (cache compris) ;
+- generate.sample / generate.unparse / generate.verify : générateur de paires.
+Les étapes s'emboîtent (translate contient parse.* et codegen) : leurs
+temps ne s'additionnent pas.
+
+Compteurs :
+- instructions.CREATE / instructions.MOVE / instructions.ROTATE (parsées) ;
+- bytes_in (source DSL parsée, UTF-8), bytes_out (code Manim émis, UTF-8) ;
+- errors.parse ; pairs (paires générées).
+
+Les statistiques sont propres au processus : les workers du générateur
+de paires renvoient les leurs, fusionnées dans le parent (merge). Le
+callback éventuel (set_callback) n'est appelé que dans le processus où
+il a été installé : les workers le retirent, et merge le rappelle dans le
+parent avec les totaux de chaque instantané fusionné (un appel par étape
+et par compteur, pour chaque shard).
+"""
+
+from __future__ import annotations
+
+from contextlib import contextmanager
+from time import perf_counter
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from .ast_nodes import CreateInstruction, MoveInstruction, Program
+
+
+# Lu directement par les points de mesure : `if instrumentation.ENABLED:`
+ENABLED = False
+
+# callback(kind, name, value) : kind = "stage" (value en secondes) ou "counter"
+Callback = Callable[[str, str, float], None]
+
+_callback: Optional[Callback] = None
+_stages: Dict[str, List[float]] = {}   # nom -> [appels, secondes]
+_counters: Dict[str, int] = {}
+
+
+# ---------- Activation ----------
+
+def enable(callback: Optional[Callback] = None) -> None:
+    """Active la collecte (et installe `callback` s'il est fourni)."""
+    global ENABLED
+    if callback is not None:
+        set_callback(callback)
+    ENABLED = True
+
+
+def disable() -> None:
+    """Désactive la collecte ; les statistiques déjà collectées sont gardées."""
+    global ENABLED
+    ENABLED = False
+
+
+def is_enabled() -> bool:
+    return ENABLED
+
+
+def set_callback(callback: Optional[Callback]) -> None:
+    """Installe (ou retire, avec None) le callback appelé à chaque mesure."""
+    global _callback
+    _callback = callback
+
+
+def reset() -> None:
+    _stages.clear()
+    _counters.clear()
+
+
+# ---------- Mesures ----------
+
+def record(stage: str, seconds: float) -> None:
+    """Ajoute une durée à une étape (à n'appeler que si ENABLED)."""
+    entry = _stages.get(stage)
+    if entry is None:
+        _stages[stage] = [1, seconds]
+    else:
+        entry[0] += 1
+        entry[1] += seconds
+    if _callback is not None:
+        _callback("stage", stage, seconds)
+
+
+def count(name: str, n: int = 1) -> None:
+    """Incrémente un compteur (à n'appeler que si ENABLED)."""
+    _counters[name] = _counters.get(name, 0) + n
+    if _callback is not None:
+        _callback("counter", name, n)
+
+
+def count_instructions(program: Program) -> None:
+    """Compte les instructions d'un programme par type."""
+    creates = moves = 0
+    for instr in program.instructions:
+        if isinstance(instr, CreateInstruction):
+            creates += 1
+        elif isinstance(instr, MoveInstruction):
+            moves += 1
+    rotates = len(program.instructions) - creates - moves
+    if creates:
+        count("instructions.CREATE", creates)
+    if moves:
+        count("instructions.MOVE", moves)
+    if rotates:
+        count("instructions.ROTATE", rotates)
+
+
+@contextmanager
+def timer(stage: str) -> Iterator[None]:
+    """
+    Chronomètre un bloc (sans effet si la collecte est désactivée).
+    Pratique hors des chemins critiques ; dans une boucle chaude, tester
+    ENABLED et appeler record() directement.
+    """
+    if not ENABLED:
+        yield
+        return
+    start = perf_counter()
+    try:
+        yield
+    finally:
+        record(stage, perf_counter() - start)
+
+
+# ---------- Lecture ----------
+
+def stats() -> Dict[str, Any]:
+    """
+    Instantané des statistiques :
+        {"stages": {nom: {"calls": int, "seconds": float}},
+         "counters": {nom: int}}
+    """
+    return {
+        "stages": {
+            name: {"calls": int(calls), "seconds": seconds}
+            for name, (calls, seconds) in _stages.items()
+        },
+        "counters": dict(_counters),
+    }
+
+
+def merge(snapshot: Dict[str, Any]) -> None:
+    """
+    Ajoute un instantané (ex. renvoyé par un worker) aux statistiques
+    courantes, et le transmet au callback éventuel (totaux de l'instantané).
+    """
+    for name, s in snapshot.get("stages", {}).items():
+        entry = _stages.setdefault(name, [0, 0.0])
+        entry[0] += s["calls"]
+        entry[1] += s["seconds"]
+        if _callback is not None:
+            _callback("stage", name, s["seconds"])
+    for name, n in snapshot.get("counters", {}).items():
+        _counters[name] = _counters.get(name, 0) + n
+        if _callback is not None:
+            _callback("counter", name, n)
+
+
+def format_stats(snapshot: Optional[Dict[str, Any]] = None) -> str:
+    """Tableau lisible des étapes et compteurs (instantané courant par défaut)."""
+    if snapshot is None:
+        snapshot = stats()
+    lines = [f"{'étape':<24} {'appels':>10} {'total (ms)':>12} {'moyenne (µs)':>14}"]
+    stages = sorted(snapshot["stages"].items(), key=lambda kv: kv[1]["seconds"], reverse=True)
+    for name, s in stages:
+        mean_us = s["seconds"] / s["calls"] * 1e6 if s["calls"] else 0.0
+        lines.append(f"{name:<24} {s['calls']:>10} {s['seconds'] * 1e3:>12.1f} {mean_us:>14.1f}")
+    if snapshot["counters"]:
+        lines.append("")
+        for name, n in sorted(snapshot["counters"].items()):
+            lines.append(f"{name:<24} {n:>10}")
+    return "\n".join(lines)
+
+
+__all__ = [
+    "enable",
+    "disable",
+    "is_enabled",
+    "set_callback",
+    "reset",
+    "record",
+    "count",
+    "count_instructions",
+    "timer",
+    "stats",
+    "merge",
+    "format_stats",
+]
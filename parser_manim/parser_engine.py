@@ -2,271 +2,45 @@
 Moteur de parsing pour le DSL Manim.
 
 - utilise la grammaire Lark définie dans grammar.py
-- transforme l'arbre de parse en AST défini dans ast_nodes.py
+- transforme l'arbre de parse en AST défini dans ast_nodes.py (builder.py)
+
+Lark n'est importé qu'au premier parse avec un backend Lark : importer ce
+module (ou utiliser le backend "fast") reste quasi instantané.
 """
 
 from __future__ import annotations
 
-from typing import Any, Dict, List, Tuple
-
-from lark import Lark, Transformer, Token, Tree, UnexpectedInput
+import functools
+import multiprocessing
+import os
+from time import perf_counter
+from typing import TYPE_CHECKING, Any, Iterable, List, Union
 
+from . import instrumentation as _instr
 from .grammar import make_parser
-from .ast_nodes import (
-    Program,
-    CreateInstruction,
-    MoveInstruction,
-    RotateInstruction,
-    Instruction,
-)
-from .errors import DslParseError
-
-
-
+from .ast_nodes import Program
+from .errors import DslParseError, DslSemanticError
+from .fast_parser import _line_col, parse_fast, parse_recovering
 
-class ASTBuilder(Transformer):
-    """
-    Transformer Lark -> AST Python.
+if TYPE_CHECKING:
+    from lark import Lark, Tree
 
-    On part de l'arbre brut fourni par Lark et on construit :
-    - Program
-    - CreateInstruction
-    - MoveInstruction
-    - RotateInstruction
-    """
-
-    # ---------- Terminaux ----------
-
-    def IDENT(self, token: Token) -> str:
-        # Identifiants -> str
-        return str(token)
-
-    def NUM(self, token: Token) -> float:
-        # Nombres -> float
-        return float(token)
-
-    def STRING(self, token: Token) -> str:
-        # ESCAPED_STRING inclut les guillemets, on les enlève
-        s = str(token)
-        if len(s) >= 2 and s[0] == s[-1] == '"':
-            return s[1:-1]
-        return s
-
-    # ---------- Règles de haut niveau ----------
-
-    def programme(self, children: List[Instruction]) -> Program:
-        # programme: instruction+
-        return Program(instructions=children)
-
-    def instruction(self, children: List[Instruction]) -> Instruction:
-        # instruction: instr_create | instr_move | instr_rotate
-        # Il n'y a qu'un seul enfant
-        return children[0]
-
-    # ---------- CREATE ----------
-
-    def SHAPE(self, token: Token) -> str:
-        # SHAPE: "circle" | "square" | ...
-        return str(token)
-
-    def shape(self, children: List[Any]) -> str:
-        # shape: SHAPE
-        # La règle shape ne contient qu'un enfant : le SHAPE déjà converti en str
-        return children[0]
-
-    def create_param_list(self, children: List[Tuple[str, Any]]) -> Dict[str, Any]:
-        # Liste de (nom, valeur) -> dict
-        params: Dict[str, Any] = {}
-        for name, value in children:
-            params[name] = value
-        return params
-
-    def create_param(self, children: List[Any]) -> Tuple[str, Any]:
-        """
-        create_param: param_id
-                    | param_radius
-                    | param_size
-                    | param_width
-                    | param_height
-                    | param_x
-                    | param_y
-                    | param_start
-                    | param_end
-                    | param_content
-
-        Chaque enfant est déjà un tuple (nom, valeur) renvoyé
-        par param_id / param_radius / etc. On renvoie donc cet enfant.
-        """
-        return children[0]
-
-    # --- Sous-paramètres de CREATE ---
-
-    def param_id(self, children: List[Any]) -> Tuple[str, Any]:
-        # param_id: "id" "=" IDENT
-        ident = children[0]  # déjà une str via IDENT()
-        return "id", ident
-
-    def param_radius(self, children: List[Any]) -> Tuple[str, Any]:
-        # param_radius: "radius" "=" NUM
-        value = children[0]  # déjà un float via NUM()
-        return "radius", value
-
-    def param_size(self, children: List[Any]) -> Tuple[str, Any]:
-        # param_size: "size" "=" NUM
-        value = children[0]
-        return "size", value
-
-    def param_width(self, children: List[Any]) -> Tuple[str, Any]:
-        # param_width: "width" "=" NUM
-        value = children[0]
-        return "width", value
-
-    def param_height(self, children: List[Any]) -> Tuple[str, Any]:
-        # param_height: "height" "=" NUM
-        value = children[0]
-        return "height", value
-
-    def param_x(self, children: List[Any]) -> Tuple[str, Any]:
-        # param_x: "x" "=" NUM
-        value = children[0]
-        return "x", value
-
-    def param_y(self, children: List[Any]) -> Tuple[str, Any]:
-        # param_y: "y" "=" NUM
-        value = children[0]
-        return "y", value
-
-    def param_start(self, children: List[Any]) -> Tuple[str, Any]:
-        # param_start: "start" "=" "(" NUM "," NUM ")"
-        x, y = children  # NUM -> déjà float
-        return "start", (x, y)
-
-    def param_end(self, children: List[Any]) -> Tuple[str, Any]:
-        # param_end: "end" "=" "(" NUM "," NUM ")"
-        x, y = children
-        return "end", (x, y)
-
-    def param_content(self, children: List[Any]) -> Tuple[str, Any]:
-        # param_content: "content" "=" STRING
-        text = children[0]  # déjà str via STRING()
-        return "content", text
-
-    def instr_create(self, children: List[Any]) -> CreateInstruction:
-        """
-        instr_create: "CREATE" shape "(" create_param_list? ")"
-        children = [shape, params_dict?]
-        """
-        shape = children[0]
-        params: Dict[str, Any] = children[1] if len(children) > 1 else {}
-
-        return CreateInstruction(
-            shape=shape,
-            id=params.get("id"),
-            radius=_maybe_float(params.get("radius")),
-            size=_maybe_float(params.get("size")),
-            width=_maybe_float(params.get("width")),
-            height=_maybe_float(params.get("height")),
-            x=_maybe_float(params.get("x")),
-            y=_maybe_float(params.get("y")),
-            start=params.get("start"),
-            end=params.get("end"),
-            content=params.get("content"),
-        )
-
-    # ---------- MOVE ----------
-
-    def move_param_list(self, children: List[Tuple[str, Any]]) -> Dict[str, Any]:
-        params: Dict[str, Any] = {}
-        for name, value in children:
-            params[name] = value
-        return params
-
-    def move_param(self, children: List[Any]) -> Tuple[str, Any]:
-        """
-        move_param: param_dx
-                  | param_dy
-                  | param_duration
-
-        Chaque enfant est déjà un tuple (nom, valeur)
-        renvoyé par param_dx / param_dy / param_duration.
-        """
-        return children[0]
-
-    def param_dx(self, children: List[Any]) -> Tuple[str, Any]:
-        # param_dx: "dx" "=" NUM
-        value = children[0]  # NUM déjà converti en float
-        return "dx", value
-
-    def param_dy(self, children: List[Any]) -> Tuple[str, Any]:
-        # param_dy: "dy" "=" NUM
-        value = children[0]
-        return "dy", value
-
-    def param_duration(self, children: List[Any]) -> Tuple[str, Any]:
-        # param_duration: "duration" "=" NUM
-        value = children[0]
-        return "duration", value
-
-    def instr_move(self, children: List[Any]) -> MoveInstruction:
-        """
-        instr_move: "MOVE" "(" "id" "=" IDENT ("," move_param_list)? ")"
-        children = [target_id, params_dict?]
-        """
-        target_id = children[0]
-        params: Dict[str, Any] = children[1] if len(children) > 1 else {}
-
-        dx = _maybe_float(params.get("dx"), default=0.0)
-        dy = _maybe_float(params.get("dy"), default=0.0)
-        duration = _maybe_float(params.get("duration"))
-
-        return MoveInstruction(
-            target_id=target_id,
-            dx=dx,
-            dy=dy,
-            duration=duration,
-        )
-
-    # ---------- ROTATE ----------
-
-    def instr_rotate(self, children: List[Any]) -> RotateInstruction:
-        """
-        instr_rotate: "ROTATE" "(" "id" "=" IDENT "," "angle" "=" NUM ("," "duration" "=" NUM)? ")"
-        children = [target_id, angle, (duration)?]
-        """
-        target_id = children[0]
-        angle = children[1]
-        duration = children[2] if len(children) > 2 else None
-
-        angle_f = _maybe_float(angle)
-        if angle_f is None:
-            raise DslParseError("ROTATE nécessite un paramètre angle=...")
-
-        duration_f = _maybe_float(duration)
-
-        return RotateInstruction(
-            target_id=target_id,
-            angle=angle_f,
-            duration=duration_f,
-        )
-
-
-# ---------- Helpers ----------
-
-def _maybe_float(value: Any, default: float | None = None) -> float | None:
-    if value is None:
-        return default
-    if isinstance(value, (int, float)):
-        return float(value)
-    try:
-        return float(value)
-    except (ValueError, TypeError):
-        return default
+    from .builder import ASTBuilder
 
 
 # ---------- API publique ----------
 
 _parser: Lark | None = None
-_builder = ASTBuilder()
+_inline_parser: Lark | None = None
+_builder: ASTBuilder | None = None
+
+
+def _get_builder() -> ASTBuilder:
+    global _builder
+    if _builder is None:
+        from .builder import ASTBuilder
+        _builder = ASTBuilder()
+    return _builder
 
 
 def _get_parser() -> Lark:
@@ -276,18 +50,207 @@ def _get_parser() -> Lark:
     return _parser
 
 
-def parse_string(source: str) -> Program:
+def _get_inline_parser() -> Lark:
+    # Parseur LALR qui applique ASTBuilder pendant le parse (pas de Tree)
+    global _inline_parser
+    if _inline_parser is None:
+        _inline_parser = make_parser(transformer=_get_builder())
+    return _inline_parser
+
+
+BACKENDS = ("lark", "lark-inline", "fast")
+
+
+def parse_string(source: str, backend: str = "lark") -> Program:
     """
     Parse une chaîne DSL et renvoie un objet Program (AST).
     Lève DslParseError en cas d'erreur de syntaxe.
+
+    backend :
+    - "lark" : parseur LALR Lark + transformation ASTBuilder (référence) ;
+    - "lark-inline" : même grammaire, mais ASTBuilder est appliqué pendant
+      la passe LALR : aucun Tree intermédiaire n'est construit ;
+    - "fast" : scanner / descente récursive dédiés (fast_parser.py),
+      même langage accepté et même AST, plusieurs fois plus rapide.
+
+    Avec parser_manim.instrumentation activé, le temps de parse (et, pour
+    "lark", le détail passe LALR / transformation), les instructions par
+    type, les octets lus et les erreurs sont comptabilisés.
     """
-    parser = _get_parser()
+    if _instr.ENABLED:
+        return _parse_instrumented(source, backend)
+    return _parse(source, backend)
+
+
+def _parse(source: str, backend: str) -> Program:
+    if backend == "fast":
+        return parse_fast(source)
+    if backend not in BACKENDS:
+        raise ValueError(f"Backend inconnu : {backend!r} (attendu : {', '.join(BACKENDS)})")
+
+    if backend == "lark-inline":
+        parser = _get_inline_parser()
+    else:
+        parser = _get_parser()
+    # Lark est chargé à ce stade : cet import ne coûte qu'un accès à sys.modules
+    from lark import UnexpectedInput
+
     try:
-        tree: Tree = parser.parse(source)
-        result = _builder.transform(tree)
+        if backend == "lark-inline":
+            result = parser.parse(source)
+        else:
+            tree: Tree = parser.parse(source)
+            result = _get_builder().transform(tree)
         if not isinstance(result, Program):
             raise DslParseError("Le parseur n'a pas retourné un Program.")
         return result
     except UnexpectedInput as e:
-        raise DslParseError(f"Erreur de syntaxe dans le DSL : {e}") from e
+        raise _lark_error(e, parser, source) from e
+
+
+def _parse_instrumented(source: str, backend: str) -> Program:
+    _instr.count("bytes_in", len(source.encode("utf-8")))
+    start = perf_counter()
+    try:
+        if backend == "lark":
+            parser = _get_parser()
+            from lark import UnexpectedInput
+            try:
+                tree: Tree = parser.parse(source)
+            except UnexpectedInput as e:
+                raise _lark_error(e, parser, source) from e
+            parsed = perf_counter()
+            program = _get_builder().transform(tree)
+            _instr.record("parse.lark.tree", parsed - start)
+            _instr.record("parse.lark.transform", perf_counter() - parsed)
+            if not isinstance(program, Program):
+                raise DslParseError("Le parseur n'a pas retourné un Program.")
+        else:
+            program = _parse(source, backend)
+    except DslParseError:
+        _instr.count("errors.parse")
+        raise
+    _instr.record(f"parse.{backend}", perf_counter() - start)
+    _instr.count_instructions(program)
+    return program
+
+
+def parse_string_recovering(source: str) -> tuple[Program, List[DslParseError]]:
+    """
+    Mode tolérant : toutes les erreurs de syntaxe en une passe.
+    Renvoie (Program des instructions valides, liste des DslParseError) ;
+    après chaque erreur, le parse reprend au mot-clé CREATE / MOVE /
+    ROTATE suivant (voir fast_parser.parse_recovering).
+    """
+    if _instr.ENABLED:
+        _instr.count("bytes_in", len(source.encode("utf-8")))
+        start = perf_counter()
+        program, errors = parse_recovering(source)
+        _instr.record("parse.recovering", perf_counter() - start)
+        _instr.count_instructions(program)
+        if errors:
+            _instr.count("errors.parse", len(errors))
+        return program, errors
+    return parse_recovering(source)
+
+
+def _lark_error(e: Any, parser: Lark, source: str) -> DslParseError:
+    """
+    Convertit une UnexpectedInput de Lark en DslParseError structurée.
+    Sur une fin d'entrée inattendue, Lark situe l'erreur au dernier token ;
+    elle est ramenée à la fin de la source, comme le backend "fast".
+    """
+    names = getattr(e, "expected", None) or getattr(e, "allowed", None) or ()
+    literals = {t.name: t.pattern for t in parser.terminals}
+    expected = []
+    for name in names:
+        pattern = literals.get(name)
+        # mots-clés / ponctuation : on affiche le littéral, comme le backend fast
+        if pattern is not None and pattern.type == "str":
+            expected.append(f'"{pattern.value}"')
+        else:
+            expected.append(name)
+    from lark import UnexpectedEOF
+
+    token = getattr(e, "token", None)
+    if isinstance(e, UnexpectedEOF) or getattr(token, "type", None) == "$END":
+        line, column = _line_col(source, len(source))
+    else:
+        line = e.line if getattr(e, "line", -1) > 0 else None
+        column = e.column if getattr(e, "column", -1) > 0 else None
+    return DslParseError(
+        f"Erreur de syntaxe dans le DSL : {e}",
+        line=line,
+        column=column,
+        expected=sorted(expected),
+    )
+
+
+# ---------- Parsing en lot ----------
+
+ParseResult = Union[Program, DslParseError, DslSemanticError]
+
+
+def parse_many(
+    sources: Iterable[str],
+    workers: int | None = 1,
+    chunksize: int | None = None,
+    backend: str = "lark",
+    validate: bool = False,
+) -> List[ParseResult]:
+    """
+    Parse un lot de sources DSL et renvoie, dans l'ordre, pour chacune
+    soit son Program, soit la DslParseError correspondante (avec line,
+    column, expected) : une source invalide n'interrompt pas le lot.
+
+    - workers : nombre de processus (None = tous les cœurs, 1 = sur place) ;
+      chaque worker construit son parseur une seule fois, à son démarrage ;
+    - chunksize : nombre de sources envoyées par paquet à un worker
+      (par défaut ~4 paquets par worker) ;
+    - backend : voir parse_string ("fast" pour la validation de masse) ;
+    - validate : applique aussi l'analyse sémantique en mode rejet rapide
+      (semantics.check) : un programme incohérent est remplacé par sa
+      DslSemanticError.
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Backend inconnu : {backend!r} (attendu : {', '.join(BACKENDS)})")
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    parse_one = functools.partial(_parse_or_error, backend=backend, validate=validate)
+    if workers <= 1:
+        return list(map(parse_one, sources))
+
+    sources = list(sources)
+    if chunksize is None:
+        chunksize = max(1, len(sources) // (workers * 4))
+    with multiprocessing.Pool(workers, initializer=warm_up, initargs=(backend,)) as pool:
+        return pool.map(parse_one, sources, chunksize=chunksize)
+
+
+def _parse_or_error(source: str, backend: str, validate: bool = False) -> ParseResult:
+    try:
+        program = parse_string(source, backend=backend)
+        if validate:
+            from .semantics import check
+            check(program)
+        return program
+    except (DslParseError, DslSemanticError) as e:
+        return e
+
+
+def warm_up(backend: str = "lark") -> None:
+    """
+    Construit le parseur du backend (ou compile ses regex) sans attendre
+    le premier vrai parse : à utiliser comme initializer d'un pool de
+    processus, pour que chaque worker paie ce coût une seule fois.
+    """
+    _parse_or_error("CREATE circle(id=warmup)", backend)
+
 
+def __getattr__(name: str) -> Any:
+    # Compatibilité : ASTBuilder était défini dans ce module
+    if name == "ASTBuilder":
+        from .builder import ASTBuilder
+        return ASTBuilder
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
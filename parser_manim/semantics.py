@@ -0,0 +1,171 @@
+"""
+Analyse sémantique d'un Program (après le parse, avant la génération).
+
+Un seul parcours des instructions avec une table des symboles
+(id -> index du CREATE qui le définit), donc en O(n). Diagnostics :
+
+- "missing-id"        (erreur)        : CREATE sans id (ignoré par le générateur) ;
+- "missing-param"     (erreur)        : paramètre requis absent pour la forme
+                                        (voir REQUIRED_PARAMS) ;
+- "undefined-target"  (erreur)        : MOVE / ROTATE sur un id qui n'a pas été
+                                        créé plus haut (s'il n'est jamais créé,
+                                        objects['...'] échoue au rendu) ;
+- "redefined-id"      (avertissement) : CREATE d'un id déjà créé (l'objet
+                                        précédent reste affiché, inaccessible) ;
+- "unused-object"     (avertissement) : objet créé mais jamais animé.
+
+Trois usages :
+- analyze(program)        : liste complète des diagnostics ;
+- check(program)          : rejet rapide, lève DslSemanticError à la première
+                            erreur (pipelines de traitement en lot) ;
+- prune_invalid(program)  : renvoie un Program sans les instructions en erreur
+                            (générateur de dataset), plus les diagnostics.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+from .ast_nodes import (
+    Program,
+    CreateInstruction,
+    MoveInstruction,
+    Instruction,
+)
+from .errors import DslSemanticError
+
+
+ERROR = "error"
+WARNING = "warning"
+
+# Paramètres sans lesquels le générateur retombe sur une valeur par défaut
+REQUIRED_PARAMS: Dict[str, Tuple[str, ...]] = {
+    "circle": ("radius",),
+    "square": ("size",),
+    "rectangle": ("width", "height"),
+    "line": ("start", "end"),
+    "text": ("content",),
+}
+
+
+@dataclass(slots=True)
+class Diagnostic:
+    code: str                   # "undefined-target", "redefined-id", ...
+    severity: str               # ERROR ou WARNING
+    message: str
+    index: int                  # index de l'instruction dans program.instructions
+    obj_id: Optional[str] = None
+
+    def __str__(self) -> str:
+        return f"instruction {self.index + 1} : {self.message} [{self.code}]"
+
+
+def analyze(program: Program, fail_fast: bool = False) -> List[Diagnostic]:
+    """
+    Renvoie les diagnostics du programme, dans l'ordre des instructions
+    (les "unused-object" en dernier). Avec fail_fast=True, s'arrête à la
+    première erreur (sans calculer les avertissements qui la suivent).
+    """
+    return _analyze(program, fail_fast, None)
+
+
+def check(program: Program) -> Program:
+    """Lève DslSemanticError à la première erreur ; renvoie le programme sinon."""
+    diagnostics = _analyze(program, True, None)
+    errors = [d for d in diagnostics if d.severity == ERROR]
+    if errors:
+        raise DslSemanticError(str(errors[0]), index=errors[0].index, code=errors[0].code)
+    return program
+
+
+def is_valid(program: Program) -> bool:
+    """True si le programme ne contient aucune erreur sémantique."""
+    return not any(d.severity == ERROR for d in _analyze(program, True, None))
+
+
+def prune_invalid(program: Program) -> Tuple[Program, List[Diagnostic]]:
+    """
+    Retire les instructions en erreur et renvoie (programme nettoyé,
+    diagnostics du programme d'origine). Un CREATE retiré ne définit pas
+    son id : les animations qui le visent sont retirées aussi.
+    """
+    keep: List[Instruction] = []
+    diagnostics = _analyze(program, False, keep)
+    return Program(instructions=keep), diagnostics
+
+
+def _analyze(
+    program: Program,
+    fail_fast: bool,
+    keep: Optional[List[Instruction]],
+) -> List[Diagnostic]:
+    diagnostics: List[Diagnostic] = []
+    defined: Dict[str, int] = {}    # id -> index du CREATE
+    used: set = set()
+    unused: List[Diagnostic] = []
+
+    for i, instr in enumerate(program.instructions):
+        valid = True
+        if isinstance(instr, CreateInstruction):
+            obj_id = instr.id
+            if not obj_id:
+                diagnostics.append(Diagnostic(
+                    "missing-id", ERROR, f"CREATE {instr.shape} sans id", i,
+                ))
+                valid = False
+            for param in REQUIRED_PARAMS.get(instr.shape, ()):
+                if getattr(instr, param) is None:
+                    diagnostics.append(Diagnostic(
+                        "missing-param", ERROR,
+                        f"CREATE {instr.shape} : paramètre '{param}' manquant", i, obj_id,
+                    ))
+                    valid = False
+            if valid:
+                previous = defined.get(obj_id)
+                if previous is not None:
+                    diagnostics.append(Diagnostic(
+                        "redefined-id", WARNING,
+                        f"id '{obj_id}' déjà créé (instruction {previous + 1})", i, obj_id,
+                    ))
+                    if obj_id not in used:
+                        unused.append(_unused(obj_id, previous))
+                    used.discard(obj_id)  # le nouvel objet n'a pas encore servi
+                defined[obj_id] = i
+        else:
+            target = instr.target_id
+            if target in defined:
+                used.add(target)
+            else:
+                kind = "MOVE" if isinstance(instr, MoveInstruction) else "ROTATE"
+                diagnostics.append(Diagnostic(
+                    "undefined-target", ERROR,
+                    f"{kind} sur '{target}', qui n'a pas été créé avant", i, target,
+                ))
+                valid = False
+
+        if not valid and fail_fast:
+            return diagnostics
+        if valid and keep is not None:
+            keep.append(instr)
+
+    unused.extend(_unused(obj_id, i) for obj_id, i in defined.items() if obj_id not in used)
+    unused.sort(key=lambda d: d.index)
+    diagnostics.extend(unused)
+    return diagnostics
+
+
+def _unused(obj_id: str, index: int) -> Diagnostic:
+    return Diagnostic("unused-object", WARNING, f"objet '{obj_id}' jamais animé", index, obj_id)
+
+
+__all__ = [
+    "ERROR",
+    "WARNING",
+    "REQUIRED_PARAMS",
+    "Diagnostic",
+    "analyze",
+    "check",
+    "is_valid",
+    "prune_invalid",
+]
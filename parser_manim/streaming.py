@@ -0,0 +1,172 @@
+"""
+Parse en flux : instructions produites une à une depuis un fichier, un
+itérable de lignes / morceaux ou un asyncio.StreamReader, sans jamais
+garder tout le texte ni tout le Program en mémoire.
+
+    with open("scene.dsl", encoding="utf-8") as f:
+        for instr in iter_instructions(f):
+            ...
+
+    async for instr in aiter_instructions(reader):
+        ...
+
+Principe (StreamParser) : le texte reçu est accumulé dans un tampon
+limité à la partie pas encore parsée. On ne parse que jusqu'à la dernière
+fin de ligne reçue : aucun terminal du DSL (ni chaîne) ne traverse une fin
+de ligne, donc tous les tokens avant cette limite sont complets. Une
+erreur avant la limite est une vraie erreur de syntaxe ; une erreur à la
+limite signifie que l'instruction continue plus loin (instruction sur
+plusieurs lignes) : on attend la suite.
+
+La mémoire reste bornée par la plus longue ligne (plus un morceau lu) ;
+les erreurs portent la ligne / colonne dans le flux complet. Comme
+parse_string, un flux sans aucune instruction est une erreur.
+"""
+
+from __future__ import annotations
+
+import codecs
+from typing import (
+    TYPE_CHECKING,
+    AsyncIterator,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Union,
+)
+
+from .ast_nodes import Instruction
+from .errors import DslParseError
+from .fast_parser import _KEYWORDS, _WS_RE, _line_col, _syntax_error, parse_instruction_at
+
+if TYPE_CHECKING:
+    import asyncio
+
+
+# Taille des lectures sur un StreamReader
+READ_SIZE = 1 << 16
+
+
+class StreamParser:
+    """
+    Parseur "push" : feed(morceau) renvoie les instructions complètes
+    contenues dans le texte reçu jusque-là ; close() termine le flux.
+    """
+
+    def __init__(self) -> None:
+        self._buffer = ""
+        self._line = 1        # ligne (dans le flux) du début du tampon
+        self._column = 1      # colonne (dans le flux) du début du tampon
+        self._count = 0       # instructions produites
+        self._closed = False
+
+    def feed(self, chunk: str) -> List[Instruction]:
+        if self._closed:
+            raise ValueError("StreamParser déjà fermé")
+        self._buffer += chunk
+        limit = self._buffer.rfind("\n") + 1
+        if limit == 0:
+            return []
+        return self._parse(limit, final=False)
+
+    def close(self) -> List[Instruction]:
+        """Parse le reste du tampon ; lève DslParseError s'il est incomplet."""
+        if self._closed:
+            return []
+        self._closed = True
+        instructions = self._parse(len(self._buffer), final=True)
+        if self._count == 0:
+            raise self._error(self._buffer, len(self._buffer), _KEYWORDS)
+        return instructions
+
+    def _parse(self, limit: int, final: bool) -> List[Instruction]:
+        text = self._buffer[:limit] if limit < len(self._buffer) else self._buffer
+        out: List[Instruction] = []
+        pos = _WS_RE.match(text).end()
+        while pos < limit:
+            try:
+                instr, pos = parse_instruction_at(text, pos)
+            except DslParseError as e:
+                error_pos = _offset(text, e.line, e.column)
+                if error_pos < limit or final:
+                    raise self._error(text, error_pos, e.expected) from None
+                break  # instruction incomplète : on attend la suite
+            out.append(instr)
+        self._advance(pos)
+        self._count += len(out)
+        return out
+
+    def _advance(self, pos: int) -> None:
+        # Retire pos caractères du tampon en suivant la position dans le flux
+        consumed = self._buffer[:pos]
+        newlines = consumed.count("\n")
+        if newlines:
+            self._line += newlines
+            self._column = pos - consumed.rfind("\n")
+        else:
+            self._column += pos
+        self._buffer = self._buffer[pos:]
+
+    def _error(self, text: str, pos: int, expected) -> DslParseError:
+        # Erreur construite sur le tampon, puis recalée dans le flux complet
+        line, column = _line_col(text, pos)
+        if line == 1:
+            column += self._column - 1
+        line += self._line - 1
+        e = _syntax_error(text, pos, expected)
+        message = str(e).replace(
+            f"(ligne {e.line}, colonne {e.column})", f"(ligne {line}, colonne {column})", 1,
+        )
+        return DslParseError(message, line=line, column=column, expected=e.expected)
+
+
+def _offset(text: str, line: int, column: int) -> int:
+    """Position dans text d'un couple (ligne, colonne) 1-based."""
+    start = 0
+    for _ in range(line - 1):
+        start = text.index("\n", start) + 1
+    return start + column - 1
+
+
+def iter_instructions(source: Union[str, Iterable[Union[str, bytes]]]) -> Iterator[Instruction]:
+    """
+    Produit les instructions d'un flux DSL une par une. `source` peut être
+    un fichier ouvert (texte ou binaire UTF-8), tout itérable de lignes ou
+    de morceaux (str ou bytes), ou une chaîne.
+    """
+    if isinstance(source, str):
+        source = (source,)
+    parser = StreamParser()
+    decoder: Optional[codecs.IncrementalDecoder] = None
+    for chunk in source:
+        if isinstance(chunk, bytes):
+            if decoder is None:
+                decoder = codecs.getincrementaldecoder("utf-8")()
+            chunk = decoder.decode(chunk)
+        yield from parser.feed(chunk)
+    if decoder is not None:
+        yield from parser.feed(decoder.decode(b"", final=True))
+    yield from parser.close()
+
+
+async def aiter_instructions(
+    reader: "asyncio.StreamReader",
+    read_size: int = READ_SIZE,
+) -> AsyncIterator[Instruction]:
+    """Variante asynchrone : lit un asyncio.StreamReader (octets UTF-8) par morceaux."""
+    parser = StreamParser()
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    while True:
+        data = await reader.read(read_size)
+        if not data:
+            break
+        for instr in parser.feed(decoder.decode(data)):
+            yield instr
+    for instr in parser.feed(decoder.decode(b"", final=True)):
+        yield instr
+    for instr in parser.close():
+        yield instr
+
+
+__all__ = ["StreamParser", "iter_instructions", "aiter_instructions"]
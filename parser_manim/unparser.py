@@ -0,0 +1,93 @@
+"""
+Unparser canonique : AST -> texte DSL.
+
+Forme canonique produite :
+- une instruction par ligne, sans ligne vide ;
+- paramètres CREATE dans un ordre fixe (id, radius, size, width, height,
+  start, end, content, x, y), uniquement ceux qui ne sont pas None ;
+- MOVE écrit toujours dx et dy, ROTATE toujours angle ;
+- nombres écrits avec repr(float) : parse_string(unparse(p)) == p.
+"""
+
+from __future__ import annotations
+
+import math
+from typing import List
+
+from .ast_nodes import (
+    Program,
+    CreateInstruction,
+    MoveInstruction,
+    RotateInstruction,
+    Instruction,
+    Point,
+)
+
+
+def unparse(program: Program) -> str:
+    """Renvoie le texte DSL canonique d'un Program."""
+    return "\n".join(unparse_instruction(instr) for instr in program.instructions)
+
+
+def unparse_instruction(instr: Instruction) -> str:
+    """Renvoie la ligne DSL canonique d'une instruction."""
+    if isinstance(instr, CreateInstruction):
+        return _unparse_create(instr)
+    if isinstance(instr, MoveInstruction):
+        return _unparse_move(instr)
+    if isinstance(instr, RotateInstruction):
+        return _unparse_rotate(instr)
+    raise TypeError(f"Instruction inconnue : {instr!r}")
+
+
+# ---------- Instructions ----------
+
+def _unparse_create(instr: CreateInstruction) -> str:
+    params: List[str] = []
+    if instr.id is not None:
+        params.append(f"id={instr.id}")
+    for name in ("radius", "size", "width", "height"):
+        value = getattr(instr, name)
+        if value is not None:
+            params.append(f"{name}={_num(value)}")
+    if instr.start is not None:
+        params.append(f"start={_point(instr.start)}")
+    if instr.end is not None:
+        params.append(f"end={_point(instr.end)}")
+    if instr.content is not None:
+        # le parseur garde le contenu brut (échappements compris)
+        params.append(f'content="{instr.content}"')
+    if instr.x is not None:
+        params.append(f"x={_num(instr.x)}")
+    if instr.y is not None:
+        params.append(f"y={_num(instr.y)}")
+    return f"CREATE {instr.shape}({', '.join(params)})"
+
+
+def _unparse_move(instr: MoveInstruction) -> str:
+    text = f"MOVE(id={instr.target_id}, dx={_num(instr.dx)}, dy={_num(instr.dy)}"
+    if instr.duration is not None:
+        text += f", duration={_num(instr.duration)}"
+    return text + ")"
+
+
+def _unparse_rotate(instr: RotateInstruction) -> str:
+    text = f"ROTATE(id={instr.target_id}, angle={_num(instr.angle)}"
+    if instr.duration is not None:
+        text += f", duration={_num(instr.duration)}"
+    return text + ")"
+
+
+# ---------- Helpers ----------
+
+def _num(value: float) -> str:
+    value = float(value)
+    if not math.isfinite(value):
+        # SIGNED_NUMBER n'a pas de forme pour inf / nan
+        raise ValueError(f"Nombre non représentable dans le DSL : {value}")
+    return repr(value)
+
+
+def _point(point: Point) -> str:
+    x, y = point
+    return f"({_num(x)},{_num(y)})"
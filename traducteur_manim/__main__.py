@@ -0,0 +1,7 @@
+"""Point d'entrée : python -m traducteur_manim SRC OUT (voir traducteur_manim.cli)."""
+
+import sys
+
+from .cli import main
+
+sys.exit(main())
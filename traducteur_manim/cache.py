@@ -0,0 +1,221 @@
+"""
+Cache de traductions DSL -> code Manim, adressé par contenu.
+
+La clé est un sha256 de (empreinte de la grammaire, GENERATOR_VERSION,
+class_name, niveau d'optimisation, source) : modifier la grammaire ou les templates du
+générateur invalide naturellement toutes les entrées.
+
+Deux niveaux :
+- mémoire : LRU borné en nombre d'entrées (max_entries) ;
+- disque (optionnel, `directory`) : un fichier par traduction, partagé
+  entre processus et entre exécutions ; quand la taille totale dépasse
+  max_bytes, les fichiers les moins récemment utilisés (mtime) sont
+  supprimés. Les écritures sont atomiques (fichier temporaire + rename).
+
+Le cache est opt-in :
+
+    cache = TranslationCache(directory=".manim_cache")
+    code = generate_manim_from_source(src, cache=cache)
+    print(cache.stats())
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import tempfile
+from collections import OrderedDict
+from typing import Dict, Optional
+
+from parser_manim.grammar import GRAMMAR_DIGEST
+
+from .generator import GENERATOR_VERSION
+
+
+class TranslationCache:
+    """Cache LRU mémoire + stockage disque optionnel (voir docstring du module)."""
+
+    def __init__(
+        self,
+        max_entries: int = 4096,
+        directory: Optional[str] = None,
+        max_bytes: int = 256 * 1024 * 1024,
+    ):
+        if max_entries < 0:
+            raise ValueError("max_entries doit être >= 0")
+        self.max_entries = max_entries
+        self.directory = directory
+        self.max_bytes = max_bytes
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._memory: "OrderedDict[str, str]" = OrderedDict()
+        self._disk_bytes: Optional[int] = None  # calculé au premier besoin
+
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    # ---------- API ----------
+
+    @staticmethod
+    def key(source: str, class_name: str = "GeneratedScene", opt_level: int = 0) -> str:
+        h = hashlib.sha256()
+        # opt_level n'entre dans la clé que s'il est non nul : les entrées
+        # existantes (non optimisées) restent valides
+        prefix = f"{GRAMMAR_DIGEST}\0{GENERATOR_VERSION}\0{class_name}\0"
+        if opt_level:
+            prefix += f"O{opt_level}\0"
+        h.update(prefix.encode("utf-8"))
+        h.update(source.encode("utf-8"))
+        return h.hexdigest()
+
+    def get(
+        self,
+        source: str,
+        class_name: str = "GeneratedScene",
+        opt_level: int = 0,
+    ) -> Optional[str]:
+        """Renvoie le code en cache, ou None (compte un hit / miss)."""
+        key = self.key(source, class_name, opt_level)
+
+        code = self._memory.get(key)
+        if code is not None:
+            self._memory.move_to_end(key)
+            self.memory_hits += 1
+            return code
+
+        code = self._disk_get(key)
+        if code is not None:
+            self._memory_put(key, code)
+            self.disk_hits += 1
+            return code
+
+        self.misses += 1
+        return None
+
+    def put(self, source: str, class_name: str, code: str, opt_level: int = 0) -> None:
+        key = self.key(source, class_name, opt_level)
+        self._memory_put(key, code)
+        self._disk_put(key, code)
+
+    def clear(self) -> None:
+        """Vide les deux niveaux."""
+        self._memory.clear()
+        if self.directory is not None:
+            # liste complète d'abord : les répertoires sont refermés avant les suppressions
+            for path, _, _ in list(self._disk_entries()):
+                _remove(path)
+            self._disk_bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "memory_entries": len(self._memory),
+        }
+
+    @property
+    def hit_rate(self) -> float:
+        hits = self.memory_hits + self.disk_hits
+        total = hits + self.misses
+        return hits / total if total else 0.0
+
+    # ---------- Mémoire ----------
+
+    def _memory_put(self, key: str, code: str) -> None:
+        if self.max_entries == 0:
+            return
+        self._memory[key] = code
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    # ---------- Disque ----------
+
+    def _path(self, key: str) -> str:
+        assert self.directory is not None
+        return os.path.join(self.directory, key[:2], key + ".py")
+
+    def _disk_get(self, key: str) -> Optional[str]:
+        if self.directory is None:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                code = f.read()
+        except OSError:
+            return None
+        try:
+            os.utime(path)  # mtime = dernier accès, pour l'éviction LRU
+        except OSError:
+            pass
+        return code
+
+    def _disk_put(self, key: str, code: str) -> None:
+        if self.directory is None:
+            return
+        path = self._path(key)
+        data = code.encode("utf-8")
+        try:
+            replaced = os.stat(path).st_size  # entrée écrasée : sa taille sort du total
+        except OSError:
+            replaced = 0
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except OSError:
+            return  # le cache disque est "best effort"
+
+        if self._disk_bytes is None:
+            self._disk_bytes = sum(size for _, size, _ in self._disk_entries())
+        else:
+            self._disk_bytes += len(data) - replaced
+        if self._disk_bytes > self.max_bytes:
+            self._evict()
+
+    def _disk_entries(self):
+        assert self.directory is not None
+        with os.scandir(self.directory) as subs:
+            for sub in subs:
+                if not sub.is_dir():
+                    continue
+                with os.scandir(sub.path) as entries:
+                    for entry in entries:
+                        if entry.name.endswith(".py"):
+                            try:
+                                st = entry.stat()
+                            except OSError:
+                                continue
+                            yield entry.path, st.st_size, st.st_mtime
+
+    def _evict(self) -> None:
+        """Supprime les entrées les plus anciennes jusqu'à 90 % de max_bytes."""
+        entries = sorted(self._disk_entries(), key=lambda e: e[2])
+        total = sum(size for _, size, _ in entries)
+        target = int(self.max_bytes * 0.9)
+        for path, size, _ in entries:
+            if total <= target:
+                break
+            if _remove(path):
+                total -= size
+                self.evictions += 1
+        self._disk_bytes = total
+
+
+def _remove(path: str) -> bool:
+    try:
+        os.remove(path)
+        return True
+    except OSError:
+        return False
+
+
+__all__ = ["TranslationCache"]
@@ -0,0 +1,348 @@
+"""
+Traduction en lot d'une arborescence de fichiers .dsl en modules Manim .py.
+
+    python -m traducteur_manim scripts/ build/ [--workers N] [--opt-level 2]
+
+Chaque SRC/chemin/nom.dsl donne OUT/chemin/nom.py. Les fichiers sont
+traduits en parallèle (pool de processus) et la construction est
+incrémentale, comme make : un manifeste (OUT/.manim_manifest.json) garde,
+pour chaque source traduite, sa taille, son mtime et le sha256 de son
+contenu. Au lancement suivant, une source est reconstruite seulement si :
+- elle est nouvelle, ou son .py a disparu ;
+- son contenu a changé (taille / mtime différents ET sha256 différent :
+  un simple touch ne reconstruit rien) ;
+- la configuration a changé (grammaire, GENERATOR_VERSION, class_name,
+  niveau d'optimisation, validation) : tout est reconstruit.
+Les .py des sources supprimées sont supprimés (aussi avec --force ou après
+un changement de configuration). Une source en erreur
+(syntaxe, ou sémantique avec --validate) n'a pas de .py et n'entre pas
+dans le manifeste : elle est retentée au lancement suivant.
+
+En fin de lancement : nombre de fichiers reconstruits / à jour / en
+erreur, débit (fichiers/s, Mo/s de source) et liste des erreurs. Le code
+de sortie vaut 1 s'il y a au moins une erreur (utilisable en CI).
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from parser_manim.errors import DslParseError, DslSemanticError
+from parser_manim.grammar import GRAMMAR_DIGEST
+from parser_manim.parser_engine import BACKENDS, parse_string, warm_up
+
+from .generator import GENERATOR_VERSION, generate_manim_scene
+from .optimizer import LEVELS, NONE
+
+
+MANIFEST_NAME = ".manim_manifest.json"
+MANIFEST_VERSION = 1
+SOURCE_SUFFIX = ".dsl"
+
+# (chemin relatif, source, sortie, class_name, opt_level, backend, validate)
+_Task = Tuple[str, str, str, str, int, str, bool]
+
+
+@dataclass(slots=True)
+class BuildReport:
+    total: int = 0                   # sources trouvées
+    built: int = 0                   # sources (re)traduites
+    up_to_date: int = 0
+    removed: int = 0                 # .py supprimés (sources disparues)
+    bytes_in: int = 0                # octets de source traduits
+    seconds: float = 0.0
+    failures: List[Tuple[str, str]] = field(default_factory=list)  # (chemin, message)
+
+    @property
+    def failed(self) -> int:
+        return len(self.failures)
+
+    def files_per_second(self) -> float:
+        return (self.built + self.failed) / self.seconds if self.seconds else 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "total": self.total,
+            "built": self.built,
+            "up_to_date": self.up_to_date,
+            "failed": self.failed,
+            "removed": self.removed,
+            "bytes_in": self.bytes_in,
+            "seconds": self.seconds,
+            "files_per_second": self.files_per_second(),
+            "failures": [{"path": p, "error": e} for p, e in self.failures],
+        }
+
+    def format(self, max_failures: int = 20) -> str:
+        lines = [
+            f"{self.total} sources : {self.built} traduites, {self.up_to_date} à jour, "
+            f"{self.failed} en erreur, {self.removed} sorties supprimées",
+        ]
+        if self.built or self.failed:
+            mb_per_s = self.bytes_in / self.seconds / 1e6 if self.seconds else 0.0
+            lines.append(
+                f"{self.seconds:.2f} s ; {self.files_per_second():.0f} fichiers/s ; "
+                f"{mb_per_s:.2f} Mo/s de source"
+            )
+        else:
+            lines.append(f"{self.seconds:.2f} s ; rien à traduire")
+        for path, error in self.failures[:max_failures]:
+            lines.append(f"  ERREUR {path} : {error}")
+        if self.failed > max_failures:
+            lines.append(f"  ... et {self.failed - max_failures} autre(s)")
+        return "\n".join(lines)
+
+
+def find_sources(root: str) -> List[str]:
+    """Chemins (relatifs à root, séparateur "/") des .dsl de l'arborescence, triés."""
+    found: List[str] = []
+    for directory, dirs, files in os.walk(root):
+        dirs[:] = sorted(d for d in dirs if not d.startswith("."))
+        for name in files:
+            if name.endswith(SOURCE_SUFFIX):
+                rel = os.path.relpath(os.path.join(directory, name), root)
+                found.append(rel.replace(os.sep, "/"))
+    return sorted(found)
+
+
+def build(
+    source_root: str,
+    output_root: str,
+    workers: Optional[int] = None,
+    opt_level: int = NONE,
+    class_name: str = "GeneratedScene",
+    backend: str = "fast",
+    validate: bool = False,
+    force: bool = False,
+) -> BuildReport:
+    """Traduit source_root vers output_root (voir docstring du module)."""
+    if opt_level not in LEVELS:
+        raise ValueError(f"Niveau d'optimisation inconnu : {opt_level!r} (attendu : {LEVELS})")
+    if backend not in BACKENDS:
+        raise ValueError(f"Backend inconnu : {backend!r} (attendu : {', '.join(BACKENDS)})")
+    if workers is None:
+        workers = os.cpu_count() or 1
+
+    start = time.perf_counter()
+    report = BuildReport()
+    manifest_path = os.path.join(output_root, MANIFEST_NAME)
+    config = {
+        "grammar": GRAMMAR_DIGEST,
+        "generator": GENERATOR_VERSION,
+        "class_name": class_name,
+        "opt_level": opt_level,
+        "validate": validate,
+    }
+    # Le manifeste précédent est toujours relu : sa liste de fichiers sert
+    # à supprimer les sorties des sources disparues, même quand ses
+    # entrées sont ignorées (--force, configuration changée).
+    previous_config, previous = _load_manifest(manifest_path)
+    entries = {} if force or previous_config != config else dict(previous)
+
+    sources = find_sources(source_root)
+    report.total = len(sources)
+    tasks: List[_Task] = []
+    for rel in sources:
+        src = os.path.join(source_root, rel)
+        out = _output_path(output_root, rel)
+        if _up_to_date(src, out, entries.get(rel)):
+            report.up_to_date += 1
+        else:
+            tasks.append((rel, src, out, class_name, opt_level, backend, validate))
+
+    # sources disparues : leurs sorties aussi
+    current = set(sources)
+    for rel in [rel for rel in previous if rel not in current]:
+        entries.pop(rel, None)
+        if _remove(_output_path(output_root, rel)):
+            report.removed += 1
+
+    try:
+        for rel, entry, error, size in _run(tasks, workers, backend):
+            report.bytes_in += size
+            if error is None:
+                entries[rel] = entry
+                report.built += 1
+            else:
+                entries.pop(rel, None)
+                _remove(_output_path(output_root, rel))
+                report.failures.append((rel, error))
+    finally:
+        # les traductions réussies restent acquises, même après une interruption
+        _save_manifest(manifest_path, config, entries)
+
+    report.failures.sort()
+    report.seconds = time.perf_counter() - start
+    return report
+
+
+# ---------- Traduction ----------
+
+def _run(tasks: List[_Task], workers: int, backend: str):
+    if workers <= 1 or len(tasks) <= 1:
+        yield from map(_translate_file, tasks)
+        return
+    workers = min(workers, len(tasks))
+    chunksize = max(1, min(64, len(tasks) // (workers * 4)))
+    with multiprocessing.Pool(workers, initializer=warm_up, initargs=(backend,)) as pool:
+        yield from pool.imap_unordered(_translate_file, tasks, chunksize=chunksize)
+
+
+def _translate_file(task: _Task) -> Tuple[str, Optional[Dict[str, Any]], Optional[str], int]:
+    """Traduit un fichier ; renvoie (chemin relatif, entrée du manifeste, erreur, taille)."""
+    rel, src, out, class_name, opt_level, backend, validate = task
+    try:
+        with open(src, "rb") as f:
+            data = f.read()
+            st = os.fstat(f.fileno())
+    except OSError as e:
+        return rel, None, f"lecture impossible : {e}", 0
+
+    try:
+        program = parse_string(data.decode("utf-8"), backend=backend)
+        if validate:
+            from parser_manim.semantics import check
+            check(program)
+        code = generate_manim_scene(program, class_name, opt_level)
+        _write_atomic(out, code.encode("utf-8"))
+    except (DslParseError, DslSemanticError) as e:
+        return rel, None, str(e).splitlines()[0], len(data)
+    except (UnicodeDecodeError, OSError) as e:
+        return rel, None, str(e), len(data)
+
+    entry = {
+        "sha256": hashlib.sha256(data).hexdigest(),
+        "size": st.st_size,
+        "mtime_ns": st.st_mtime_ns,
+    }
+    return rel, entry, None, len(data)
+
+
+# ---------- Manifeste ----------
+
+def _load_manifest(path: str) -> Tuple[Optional[Dict[str, Any]], Dict[str, Dict[str, Any]]]:
+    """(configuration, entrées) du manifeste, ou (None, {}) s'il manque ou est illisible."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None, {}
+    if not isinstance(manifest, dict) or manifest.get("version") != MANIFEST_VERSION:
+        return None, {}
+    return manifest.get("config"), manifest.get("files", {})
+
+
+def _save_manifest(path: str, config: Dict[str, Any], entries: Dict[str, Dict[str, Any]]) -> None:
+    manifest = {
+        "version": MANIFEST_VERSION,
+        "config": config,
+        "files": dict(sorted(entries.items())),
+    }
+    _write_atomic(path, json.dumps(manifest, indent=1).encode("utf-8"))
+
+
+def _up_to_date(src: str, out: str, entry: Optional[Dict[str, Any]]) -> bool:
+    if entry is None or not os.path.exists(out):
+        return False
+    try:
+        st = os.stat(src)
+    except OSError:
+        return False
+    if st.st_size == entry["size"] and st.st_mtime_ns == entry["mtime_ns"]:
+        return True
+    if st.st_size != entry["size"]:
+        return False
+    # même taille, mtime différent (touch, checkout) : on compare le contenu
+    try:
+        with open(src, "rb") as f:
+            digest = hashlib.sha256(f.read()).hexdigest()
+    except OSError:
+        return False
+    if digest != entry["sha256"]:
+        return False
+    entry["mtime_ns"] = st.st_mtime_ns
+    return True
+
+
+# ---------- Fichiers ----------
+
+def _output_path(output_root: str, rel: str) -> str:
+    return os.path.join(output_root, *rel[:-len(SOURCE_SUFFIX)].split("/")) + ".py"
+
+
+def _write_atomic(path: str, data: bytes) -> None:
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        _remove(tmp)
+        raise
+
+
+def _remove(path: str) -> bool:
+    try:
+        os.remove(path)
+        return True
+    except OSError:
+        return False
+
+
+# ---------- Ligne de commande ----------
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(
+        prog="python -m traducteur_manim",
+        description=__doc__.split("\n\n")[0].strip(),
+    )
+    ap.add_argument("source", help="répertoire des fichiers .dsl")
+    ap.add_argument("output", help="répertoire des modules .py générés")
+    ap.add_argument("-j", "--workers", type=int, default=None,
+                    help="nombre de processus (défaut : tous les cœurs, 1 = sur place)")
+    ap.add_argument("-O", "--opt-level", type=int, choices=LEVELS, default=NONE,
+                    help="niveau de l'optimiseur d'animations")
+    ap.add_argument("--class-name", default="GeneratedScene", help="nom de la classe Scene générée")
+    ap.add_argument("--backend", choices=BACKENDS, default="fast", help="backend de parse")
+    ap.add_argument("--validate", action="store_true",
+                    help="rejette aussi les programmes sémantiquement invalides")
+    ap.add_argument("--force", action="store_true", help="reconstruit tout (le manifeste sert encore au nettoyage)")
+    ap.add_argument("--report", help="écrit aussi le rapport en JSON dans ce fichier")
+    args = ap.parse_args(argv)
+
+    if not os.path.isdir(args.source):
+        ap.error(f"répertoire source introuvable : {args.source}")
+
+    report = build(
+        args.source,
+        args.output,
+        workers=args.workers,
+        opt_level=args.opt_level,
+        class_name=args.class_name,
+        backend=args.backend,
+        validate=args.validate,
+        force=args.force,
+    )
+    print(report.format())
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump(report.as_dict(), f, indent=2)
+    return 1 if report.failed else 0
+
+
+__all__ = ["BuildReport", "build", "find_sources", "main"]
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,18 +5,197 @@ On prend un Program (AST) et on génère une classe Manim
 avec une scène simple.
 """
 
+from __future__ import annotations
+
+from time import perf_counter
+from typing import (
+    TYPE_CHECKING,
+    AsyncIterable,
+    AsyncIterator,
+    Iterable,
+    Iterator,
+    Optional,
+    TextIO,
+    Union,
+)
+
+from parser_manim import instrumentation
+
 from parser_manim.ast_nodes import (
     Program,
     CreateInstruction,
     MoveInstruction,
     RotateInstruction,
+    Instruction,
 )
 from parser_manim.parser_engine import parse_string
 
+from .optimizer import NONE, PlayGroup, optimize
+
+if TYPE_CHECKING:
+    from .cache import TranslationCache
+
+
+# À incrémenter à chaque changement du code émis (invalide les caches)
+GENERATOR_VERSION = "1"
+
+
+def generate_manim_scene(
+    program: Program,
+    class_name: str = "GeneratedScene",
+    opt_level: int = NONE,
+) -> str:
+    """
+    opt_level : niveau de l'optimiseur d'animations appliqué avant
+    l'émission (traducteur_manim.optimizer : NONE, FUSE, GROUP).
+    """
+    if instrumentation.ENABLED:
+        start = perf_counter()
+        code = "".join(iter_manim_scene(program, class_name, opt_level))
+        instrumentation.record("codegen", perf_counter() - start)
+        instrumentation.count("bytes_out", len(code.encode("utf-8")))
+        return code
+    return "".join(iter_manim_scene(program, class_name, opt_level))
+
+
+def iter_manim_scene(
+    program: Union[Program, Iterable[Instruction]],
+    class_name: str = "GeneratedScene",
+    opt_level: int = NONE,
+) -> Iterator[str]:
+    """
+    Produit le code de la scène par morceaux, en un seul parcours du
+    programme : les créations sont émises au fil de l'eau, les animations
+    (MOVE / ROTATE / PlayGroup) sont mises de côté (simples références aux
+    nœuds) et émises à la fin, puisque la scène crée tous les objets d'abord.
+
+    `program` peut aussi être un itérable d'instructions, par ex. le flux
+    de parser_manim.streaming.iter_instructions : le texte source n'est
+    alors jamais entièrement en mémoire. L'optimiseur (opt_level != NONE)
+    a besoin du programme complet et matérialise l'itérable.
+
+    "".join(iter_manim_scene(p)) == generate_manim_scene(p).
+    """
+    instructions = _instructions(program, opt_level)
+    emitter = _SceneEmitter(class_name)
+    yield emitter.header()
+    for instr in instructions:
+        chunk = emitter.add(instr)
+        if chunk is not None:
+            yield chunk
+    yield from emitter.finish()
+
+
+async def aiter_manim_scene(
+    instructions: AsyncIterable[Instruction],
+    class_name: str = "GeneratedScene",
+    opt_level: int = NONE,
+) -> AsyncIterator[str]:
+    """
+    Variante asynchrone de iter_manim_scene, alimentée par un flux
+    asynchrone d'instructions (parser_manim.streaming.aiter_instructions).
+    """
+    emitter = _SceneEmitter(class_name)
+    yield emitter.header()
+    if opt_level != NONE:
+        # l'optimiseur a besoin du programme complet
+        program = Program(instructions=[instr async for instr in instructions])
+        for instr in optimize(program, opt_level).instructions:
+            chunk = emitter.add(instr)
+            if chunk is not None:
+                yield chunk
+    else:
+        async for instr in instructions:
+            chunk = emitter.add(instr)
+            if chunk is not None:
+                yield chunk
+    for chunk in emitter.finish():
+        yield chunk
+
+
+def write_manim_scene(
+    program: Union[Program, Iterable[Instruction]],
+    out: TextIO,
+    class_name: str = "GeneratedScene",
+    opt_level: int = NONE,
+) -> int:
+    """
+    Écrit la scène dans un flux texte (fichier, io.StringIO, sys.stdout...)
+    au fur et à mesure ; renvoie le nombre de caractères écrits.
+
+        with open("scene.dsl", encoding="utf-8") as src, open("scene.py", "w") as out:
+            write_manim_scene(iter_instructions(src), out)
+    """
+    written = 0
+    for chunk in iter_manim_scene(program, class_name, opt_level):
+        written += out.write(chunk)
+    return written
+
+
+def _instructions(
+    program: Union[Program, Iterable[Instruction]],
+    opt_level: int,
+) -> Iterable[Instruction]:
+    if opt_level != NONE:
+        if not isinstance(program, Program):
+            program = Program(instructions=list(program))
+        program = optimize(program, opt_level)
+    return program.instructions if isinstance(program, Program) else program
+
+
+class _SceneEmitter:
+    """
+    Émetteur incrémental : add(instr) par instruction, puis finish().
+    Les lignes sont regroupées en morceaux de _CHUNK_LINES lignes.
+    """
+
+    __slots__ = ("class_name", "lines", "animations")
+
+    def __init__(self, class_name: str):
+        self.class_name = class_name
+        self.lines: list[str] = []
+        self.animations: list[Instruction | PlayGroup] = []
+
+    def header(self) -> str:
+        lines: list[str] = []
+        _emit_header(lines, self.class_name)
+        return "\n".join(lines)
+
+    def add(self, instr: Instruction | PlayGroup) -> Optional[str]:
+        if isinstance(instr, CreateInstruction):
+            _emit_create(self.lines, instr)
+            if len(self.lines) >= _CHUNK_LINES:
+                return self._flush()
+        elif isinstance(instr, (MoveInstruction, RotateInstruction, PlayGroup)):
+            self.animations.append(instr)
+        return None
+
+    def finish(self) -> Iterator[str]:
+        lines = self.lines
+        for instr in self.animations:
+            if isinstance(instr, MoveInstruction):
+                _emit_move(lines, instr)
+            elif isinstance(instr, RotateInstruction):
+                _emit_rotate(lines, instr)
+            else:
+                _emit_play_group(lines, instr)
+            if len(lines) >= _CHUNK_LINES:
+                yield self._flush()
+        self.animations.clear()
+        if lines:
+            yield self._flush()
+
+    def _flush(self) -> str:
+        chunk = "\n" + "\n".join(self.lines)
+        self.lines.clear()
+        return chunk
 
-def generate_manim_scene(program: Program, class_name: str = "GeneratedScene") -> str:
-    lines: list[str] = []
 
+# Nombre de lignes regroupées par morceau émis par iter_manim_scene
+_CHUNK_LINES = 512
+
+
+def _emit_header(lines: list[str], class_name: str) -> None:
     lines.append("from manim import *")
     lines.append("")
     lines.append(f"class {class_name}(Scene):")
@@ -24,20 +203,6 @@ def generate_manim_scene(program: Program, class_name: str = "GeneratedScene") -
     lines.append("        objects = {}  # id -> mobject")
     lines.append("")
 
-    # Génération des créations d'objets
-    for instr in program.instructions:
-        if isinstance(instr, CreateInstruction):
-            _emit_create(lines, instr)
-
-    # Génération des animations (MOVE / ROTATE)
-    for instr in program.instructions:
-        if isinstance(instr, MoveInstruction):
-            _emit_move(lines, instr)
-        elif isinstance(instr, RotateInstruction):
-            _emit_rotate(lines, instr)
-
-    return "\n".join(lines)
-
 
 def _emit_create(lines: list[str], instr: CreateInstruction) -> None:
     obj_id = instr.id
@@ -77,30 +242,68 @@ def _emit_create(lines: list[str], instr: CreateInstruction) -> None:
 
 
 def _emit_move(lines: list[str], instr: MoveInstruction) -> None:
-    dx = instr.dx or 0.0
-    dy = instr.dy or 0.0
     duration = instr.duration or 1.0
-
-    lines.append(
-        f"        self.play(objects['{instr.target_id}'].animate.shift(RIGHT*{dx} + UP*{dy}), "
-        f"run_time={duration})"
-    )
+    lines.append(f"        self.play({_move_animation(instr)}, run_time={duration})")
 
 
 def _emit_rotate(lines: list[str], instr: RotateInstruction) -> None:
-    angle = instr.angle or 0.0
     duration = instr.duration or 1.0
+    lines.append(f"        self.play({_rotate_animation(instr)}, run_time={duration})")
+
 
-    lines.append(
-        f"        self.play(objects['{instr.target_id}'].animate.rotate({angle}*DEGREES), "
-        f"run_time={duration})"
+def _emit_play_group(lines: list[str], group: PlayGroup) -> None:
+    # Animations d'objets distincts jouées simultanément (optimizer.GROUP)
+    animations = ", ".join(
+        _move_animation(a) if isinstance(a, MoveInstruction) else _rotate_animation(a)
+        for a in group.animations
     )
+    lines.append(f"        self.play({animations}, run_time={group.duration})")
+
+
+def _move_animation(instr: MoveInstruction) -> str:
+    dx = instr.dx or 0.0
+    dy = instr.dy or 0.0
+    return f"objects['{instr.target_id}'].animate.shift(RIGHT*{dx} + UP*{dy})"
 
 
-def generate_manim_from_source(src: str, class_name: str = "GeneratedScene") -> str:
+def _rotate_animation(instr: RotateInstruction) -> str:
+    angle = instr.angle or 0.0
+    return f"objects['{instr.target_id}'].animate.rotate({angle}*DEGREES)"
+
+
+def generate_manim_from_source(
+    src: str,
+    class_name: str = "GeneratedScene",
+    cache: Optional[TranslationCache] = None,
+    opt_level: int = NONE,
+) -> str:
     """
     Helper pratique : prend directement du DSL en entrée,
     parse -> AST -> code Manim.
+
+    Avec un TranslationCache (traducteur_manim.cache), une source déjà
+    traduite (même texte, même class_name) n'est ni re-parsée ni ré-émise.
     """
+    if instrumentation.ENABLED:
+        with instrumentation.timer("translate"):
+            return _translate(src, class_name, cache, opt_level)
+    return _translate(src, class_name, cache, opt_level)
+
+
+def _translate(
+    src: str,
+    class_name: str,
+    cache: Optional[TranslationCache],
+    opt_level: int,
+) -> str:
+    if cache is not None:
+        code = cache.get(src, class_name, opt_level)
+        if code is not None:
+            return code
+
     program = parse_string(src)
-    return generate_manim_scene(program, class_name)
+    code = generate_manim_scene(program, class_name, opt_level)
+
+    if cache is not None:
+        cache.put(src, class_name, code, opt_level)
+    return code
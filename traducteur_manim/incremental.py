@@ -0,0 +1,284 @@
+"""
+Traduction incrémentale pour l'aperçu en direct (éditeur).
+
+Chaque instruction DSL tient sur sa propre ligne : une session garde, pour
+chaque ligne, son résultat de parse et les fragments de code Manim émis
+(_emit_create / _emit_move / _emit_rotate), indexés par le contenu de la
+ligne. À chaque modification, seules les lignes dont le contenu est
+nouveau sont re-parsées et ré-émises.
+
+Le code émis est l'en-tête, suivi des fragments "créations" de chaque
+ligne, puis des fragments "animations" de chaque ligne (même ordre que
+generate_manim_scene). Une édition ne change donc que deux plages
+contiguës du code : patch() les renvoie sous forme de CodeEdit (offsets
+dans le code précédent), sans réassembler le document. Les résultats
+des lignes sont rangés par blocs d'au plus _BLOCK_LINES lignes, avec la
+longueur cumulée de leurs fragments : situer une ligne dans le code coûte
+un parcours des blocs, pas des lignes, et le coût d'une édition ne dépend
+plus que de sa taille (à une somme d'entiers par bloc près).
+
+    session = IncrementalTranslator(class_name="Preview")
+    code = session.update(texte_complet)             # document entier
+    edits = session.patch(3, 4, "MOVE(id=c1, dx=2)")  # remplace la ligne 3
+    code = apply_edits(code, edits)                  # == session.code
+
+edit() fait la même chose que patch() mais renvoie le code complet, mis
+à jour en appliquant les CodeEdit au code précédent (une copie de chaîne,
+sans ré-assemblage des fragments).
+
+Une ligne invalide n'interrompt pas l'aperçu : elle est ignorée dans le
+code et son erreur est disponible dans session.errors (numéro de ligne
+du document). Limite : une instruction répartie sur plusieurs lignes
+n'est pas supportée (contrairement à parse_string).
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+from parser_manim.ast_nodes import (
+    CreateInstruction,
+    MoveInstruction,
+    RotateInstruction,
+    Instruction,
+)
+from parser_manim.errors import DslParseError
+from parser_manim.parser_engine import parse_string
+
+from .generator import _emit_create, _emit_header, _emit_move, _emit_rotate
+
+
+@dataclass(slots=True)
+class CodeEdit:
+    """Remplacement de code[start:end] par text (offsets dans le code précédent)."""
+
+    start: int
+    end: int
+    text: str
+
+
+def apply_edits(code: str, edits: Sequence[CodeEdit]) -> str:
+    """Applique des CodeEdit (triés, disjoints, relatifs à `code`)."""
+    parts: List[str] = []
+    pos = 0
+    for e in edits:
+        parts.append(code[pos:e.start])
+        parts.append(e.text)
+        pos = e.end
+    parts.append(code[pos:])
+    return "".join(parts)
+
+
+@dataclass(slots=True)
+class _LineResult:
+    instructions: List[Instruction]
+    creates: str       # fragment de la section "créations" ("\n" + code, ou "")
+    animations: str    # fragment de la section "animations" ("\n" + code, ou "")
+    error: Optional[DslParseError] = None
+
+
+_BLANK = _LineResult([], "", "")
+
+# Taille cible des blocs de lignes (découpés au-delà de 2 * _BLOCK_LINES)
+_BLOCK_LINES = 256
+
+
+class IncrementalTranslator:
+    """Session de traduction incrémentale DSL -> code Manim."""
+
+    def __init__(self, class_name: str = "GeneratedScene", backend: str = "fast"):
+        self.class_name = class_name
+        self.backend = backend
+        self.reparsed = 0   # lignes re-parsées lors de la dernière mise à jour
+
+        header: List[str] = []
+        _emit_header(header, class_name)
+        self._header = "\n".join(header)
+
+        self._lines: List[str] = []
+        # Résultats par blocs de lignes, avec pour chaque bloc la longueur
+        # totale de ses fragments "créations" et "animations"
+        self._blocks: List[List[_LineResult]] = [[]]
+        self._creates_len: List[int] = [0]
+        self._animations_len: List[int] = [0]
+        self._cache: Dict[str, _LineResult] = {}
+        self._code: Optional[str] = None
+
+    # ---------- Mises à jour ----------
+
+    def update(self, source: str) -> str:
+        """Remplace tout le document ; renvoie le code Manim à jour."""
+        lines = source.split("\n")
+        self._lines = lines
+        self._code = None
+        self._set_blocks(0, len(self._blocks), self._translate_lines(lines))
+        self._prune_cache()
+        return self.code
+
+    def edit(self, start: int, end: int, text: str) -> str:
+        """
+        Remplace les lignes [start, end) (0-based) par `text` (qui peut
+        contenir plusieurs lignes) ; renvoie le code Manim à jour.
+        """
+        code = self._code
+        edits = self.patch(start, end, text)
+        if code is not None:
+            self._code = apply_edits(code, edits)
+        return self.code
+
+    def patch(self, start: int, end: int, text: str) -> List[CodeEdit]:
+        """
+        Comme edit(), mais renvoie seulement les changements du code :
+        au plus deux CodeEdit (section créations, section animations),
+        triés, relatifs au code d'avant l'édition. Seules les lignes
+        insérées sont examinées ; le document n'est pas réassemblé.
+        """
+        if not 0 <= start <= end <= len(self._lines):
+            raise IndexError(f"Plage de lignes invalide : [{start}, {end})")
+        lines = text.split("\n")
+        self._lines[start:end] = lines
+        new = self._translate_lines(lines)
+
+        b0, i0, creates_before, animations_before = self._locate(start)
+        b1, i1 = b0, i0 + (end - start)
+        while b1 < len(self._blocks) - 1 and i1 > len(self._blocks[b1]):
+            i1 -= len(self._blocks[b1])
+            b1 += 1
+        blocks = self._blocks
+        if b0 == b1:
+            old = blocks[b0][i0:i1]
+        else:
+            old = blocks[b0][i0:]
+            for b in range(b0 + 1, b1):
+                old.extend(blocks[b])
+            old.extend(blocks[b1][:i1])
+        merged = blocks[b0][:i0] + new + blocks[b1][i1:]
+        if len(merged) < _BLOCK_LINES // 2 and b1 + 1 < len(blocks):
+            b1 += 1   # bloc trop petit : fusionné avec le suivant
+            merged += blocks[b1]
+
+        old_creates = sum(len(r.creates) for r in old)
+        old_animations = sum(len(r.animations) for r in old)
+        # offsets calculés avant la mise à jour des blocs (code précédent)
+        creates_at = len(self._header) + creates_before
+        animations_at = len(self._header) + sum(self._creates_len) + animations_before
+        self._set_blocks(b0, b1 + 1, merged)
+        self._code = None
+
+        edits = []
+        creates = "".join(r.creates for r in new)
+        if creates or old_creates:
+            edits.append(CodeEdit(creates_at, creates_at + old_creates, creates))
+        animations = "".join(r.animations for r in new)
+        if animations or old_animations:
+            edits.append(CodeEdit(animations_at, animations_at + old_animations, animations))
+
+        if len(self._cache) > 2 * len(self._lines) + 64:
+            self._prune_cache()
+        return edits
+
+    # ---------- Résultats ----------
+
+    @property
+    def code(self) -> str:
+        """Code Manim du document courant (mis en cache jusqu'à la prochaine édition)."""
+        if self._code is None:
+            results = list(self._results())
+            self._code = "".join([
+                self._header,
+                *(r.creates for r in results),
+                *(r.animations for r in results),
+            ])
+        return self._code
+
+    @property
+    def instructions(self) -> List[Instruction]:
+        return [instr for r in self._results() for instr in r.instructions]
+
+    @property
+    def errors(self) -> List[DslParseError]:
+        """Erreurs de syntaxe du document, numérotées par ligne du document."""
+        errors = []
+        for lineno, r in enumerate(self._results(), start=1):
+            if r.error is not None:
+                e = r.error
+                errors.append(DslParseError(
+                    f"Ligne {lineno} : {e}", line=lineno, column=e.column, expected=e.expected,
+                ))
+        return errors
+
+    # ---------- Interne ----------
+
+    def _results(self) -> Iterator[_LineResult]:
+        for block in self._blocks:
+            yield from block
+
+    def _locate(self, line: int) -> Tuple[int, int, int, int]:
+        """(bloc, index dans le bloc, longueur des créations et des animations avant la ligne)."""
+        creates = animations = 0
+        last = len(self._blocks) - 1
+        for b, block in enumerate(self._blocks):
+            if line <= len(block) and (line < len(block) or b == last):
+                for r in block[:line]:
+                    creates += len(r.creates)
+                    animations += len(r.animations)
+                return b, line, creates, animations
+            line -= len(block)
+            creates += self._creates_len[b]
+            animations += self._animations_len[b]
+        raise IndexError(line)
+
+    def _set_blocks(self, b0: int, b1: int, results: List[_LineResult]) -> None:
+        """Remplace les blocs [b0, b1) par `results`, redécoupés si besoin."""
+        if len(results) > 2 * _BLOCK_LINES:
+            chunks = [results[i:i + _BLOCK_LINES] for i in range(0, len(results), _BLOCK_LINES)]
+        elif results or b0 == 0 and b1 == len(self._blocks):
+            chunks = [results]   # il reste toujours au moins un bloc
+        else:
+            chunks = []
+        self._blocks[b0:b1] = chunks
+        self._creates_len[b0:b1] = [sum(len(r.creates) for r in c) for c in chunks]
+        self._animations_len[b0:b1] = [sum(len(r.animations) for r in c) for c in chunks]
+
+    def _translate_lines(self, lines: List[str]) -> List[_LineResult]:
+        self.reparsed = 0
+        cache = self._cache
+        results = []
+        for line in lines:
+            r = cache.get(line)
+            if r is None:
+                r = cache[line] = self._translate_line(line)
+                self.reparsed += 1
+            results.append(r)
+        return results
+
+    def _translate_line(self, line: str) -> _LineResult:
+        if not line.strip():
+            return _BLANK
+        try:
+            program = parse_string(line, backend=self.backend)
+        except DslParseError as e:
+            return _LineResult([], "", "", e)
+
+        creates: List[str] = []
+        animations: List[str] = []
+        for instr in program.instructions:
+            if isinstance(instr, CreateInstruction):
+                _emit_create(creates, instr)
+            elif isinstance(instr, MoveInstruction):
+                _emit_move(animations, instr)
+            elif isinstance(instr, RotateInstruction):
+                _emit_rotate(animations, instr)
+        return _LineResult(
+            program.instructions,
+            "\n" + "\n".join(creates) if creates else "",
+            "\n" + "\n".join(animations) if animations else "",
+        )
+
+    def _prune_cache(self) -> None:
+        # On ne garde que les lignes encore présentes dans le document
+        self._cache = {line: r for line, r in zip(self._lines, self._results())}
+
+
+__all__ = ["CodeEdit", "IncrementalTranslator", "apply_edits"]
@@ -0,0 +1,146 @@
+"""
+Optimiseur d'animations : moins d'appels self.play dans la scène générée.
+
+Chaque self.play est un segment de rendu Manim (boucle de frames, cache
+partiel) : réduire leur nombre réduit le temps de rendu. Les CREATE sont
+toujours émis avant toutes les animations (voir generator.py), donc seules
+les animations (MOVE / ROTATE) sont réordonnées ou fusionnées ici.
+
+Niveaux :
+- NONE (0)  : programme inchangé ;
+- FUSE (1)  : fusion des animations consécutives d'un même objet :
+              MOVE + MOVE -> un seul MOVE (dx, dy et durées additionnés),
+              ROTATE + ROTATE -> un seul ROTATE (angles et durées additionnés) ;
+- GROUP (2) : en plus, les animations consécutives de même durée portant
+              sur des objets distincts sont jouées ensemble : un PlayGroup,
+              émis comme un seul self.play(anim1, anim2, ..., run_time=d).
+
+L'état final de la scène (position et orientation de chaque objet) est
+inchangé : les translations s'additionnent, les rotations (autour du
+centre de l'objet) aussi, et deux animations d'objets distincts sont
+indépendantes. Seul le déroulé dans le temps change (durée totale plus
+courte au niveau GROUP). Une durée absente vaut 1.0, comme dans le
+générateur.
+
+Le Program renvoyé est destiné à generate_manim_scene : au niveau GROUP
+il contient des PlayGroup, que unparse() ne sait pas écrire.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import List, Union
+
+from parser_manim.ast_nodes import (
+    Program,
+    CreateInstruction,
+    MoveInstruction,
+    RotateInstruction,
+    Instruction,
+)
+
+
+NONE = 0
+FUSE = 1
+GROUP = 2
+LEVELS = (NONE, FUSE, GROUP)
+
+Animation = Union[MoveInstruction, RotateInstruction]
+
+
+@dataclass(slots=True)
+class PlayGroup:
+    """Animations d'objets distincts jouées dans un même self.play."""
+    animations: List[Animation]
+    duration: float
+
+
+def optimize(program: Program, level: int = GROUP) -> Program:
+    """Renvoie un Program optimisé au niveau demandé (l'original n'est pas modifié)."""
+    if level not in LEVELS:
+        raise ValueError(f"Niveau d'optimisation inconnu : {level!r} (attendu : {LEVELS})")
+    if level == NONE:
+        return program
+
+    creates: List[Instruction] = []
+    animations: List[Animation] = []
+    for instr in program.instructions:
+        if isinstance(instr, CreateInstruction):
+            creates.append(instr)
+        else:
+            animations.append(instr)
+
+    fused = _fuse(animations)
+    if level >= GROUP:
+        return Program(instructions=creates + _group(fused))
+    return Program(instructions=creates + fused)
+
+
+def _duration(instr: Animation) -> float:
+    return instr.duration or 1.0
+
+
+def _fuse(animations: List[Animation]) -> List[Animation]:
+    """Fusionne les MOVE (resp. ROTATE) consécutifs d'un même objet."""
+    out: List[Animation] = []
+    for instr in animations:
+        last = out[-1] if out else None
+        if (
+            last is not None
+            and type(last) is type(instr)
+            and last.target_id == instr.target_id
+        ):
+            if isinstance(instr, MoveInstruction):
+                out[-1] = MoveInstruction(
+                    target_id=instr.target_id,
+                    dx=(last.dx or 0.0) + (instr.dx or 0.0),
+                    dy=(last.dy or 0.0) + (instr.dy or 0.0),
+                    duration=_duration(last) + _duration(instr),
+                )
+            else:
+                out[-1] = RotateInstruction(
+                    target_id=instr.target_id,
+                    angle=(last.angle or 0.0) + (instr.angle or 0.0),
+                    duration=_duration(last) + _duration(instr),
+                )
+        else:
+            out.append(instr)
+    return out
+
+
+def _group(animations: List[Animation]) -> List[Union[Animation, PlayGroup]]:
+    """
+    Regroupe les animations consécutives de même durée sur des objets
+    distincts. Un groupe d'une seule animation reste une instruction simple.
+    """
+    out: List[Union[Animation, PlayGroup]] = []
+    group: List[Animation] = []
+    targets: set = set()
+    duration = 0.0
+
+    def flush() -> None:
+        if len(group) == 1:
+            out.append(group[0])
+        elif group:
+            out.append(PlayGroup(animations=list(group), duration=duration))
+        group.clear()
+        targets.clear()
+
+    for instr in animations:
+        d = _duration(instr)
+        if group and (d != duration or instr.target_id in targets):
+            flush()
+        if not group:
+            duration = d
+        group.append(instr)
+        targets.add(instr.target_id)
+    flush()
+    return out
+
+
+def play_count(program: Program) -> int:
+    """Nombre d'appels self.play qu'émettra generate_manim_scene."""
+    return sum(not isinstance(instr, CreateInstruction) for instr in program.instructions)
+
+
+__all__ = ["NONE", "FUSE", "GROUP", "LEVELS", "PlayGroup", "optimize", "play_count"]
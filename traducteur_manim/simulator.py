@@ -0,0 +1,242 @@
+"""
+Simulateur NumPy des scènes générées : position et rotation de chaque
+objet à tout instant, sans Manim.
+
+Sémantique (celle du code émis par generate_manim_scene) :
+- tous les CREATE sont placés avant la première animation ; objects[id]
+  désigne le dernier objet créé avec cet id, centré en (x or 0, y or 0) ;
+  les CREATE sans id sont ignorés ;
+- chaque MOVE / ROTATE est un self.play séquentiel de durée
+  run_time = duration or 1.0 ; un PlayGroup (optimizer.GROUP) anime
+  plusieurs objets pendant un même segment ;
+- la progression suit la rate_func par défaut de Manim (smooth) ;
+- ROTATE tourne l'objet autour de son centre : la position ne change pas,
+  l'angle (en degrés) progresse comme une translation. Manim interpole les
+  points de .animate.rotate linéairement : seul l'état en fin de segment
+  est une vraie rotation, l'angle intermédiaire est nominal.
+
+Index temporel (précalculé une fois par programme) :
+- seg_end    : fin cumulée de chaque segment (self.play), triée ;
+- par animation : objet, segment et delta (dx, dy, dangle), rangés par
+  (objet, segment), avec la somme cumulée des deltas.
+Évaluer N instants pour K objets se fait alors par quelques
+searchsorted et opérations vectorisées sur une grille (K, N).
+
+    timeline = Timeline.from_program(program)
+    timeline.final_positions()            # {"c1": (x, y, angle), ...}
+    times = timeline.frame_times(fps=30)
+    states = timeline.sample(times)       # (len(times), K, 3)
+"""
+
+from __future__ import annotations
+
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+
+from parser_manim.ast_nodes import (
+    Program,
+    CreateInstruction,
+    MoveInstruction,
+    RotateInstruction,
+)
+
+from .optimizer import PlayGroup
+
+
+def smooth(t: np.ndarray, inflection: float = 10.0) -> np.ndarray:
+    """rate_func "smooth" de Manim (par défaut pour .animate), vectorisée."""
+    error = 1.0 / (1.0 + np.exp(inflection / 2))
+    s = 1.0 / (1.0 + np.exp(-inflection * (np.asarray(t, dtype=np.float64) - 0.5)))
+    return np.clip((s - error) / (1.0 - 2.0 * error), 0.0, 1.0)
+
+
+class Timeline:
+    """Index temporel d'une scène (voir docstring du module)."""
+
+    __slots__ = (
+        "ids", "initial", "seg_start", "seg_end",
+        "_obj", "_seg", "_delta", "_cum", "_key", "_n_segments",
+    )
+
+    def __init__(
+        self,
+        ids: List[str],
+        initial: np.ndarray,
+        seg_durations: np.ndarray,
+        entries: List[Tuple[int, int, float, float, float]],
+    ):
+        self.ids = ids
+        self.initial = initial                       # (K, 3) : x, y, angle
+        self.seg_end = np.cumsum(seg_durations)
+        self.seg_start = self.seg_end - seg_durations
+        self._n_segments = len(seg_durations)
+
+        # Animations rangées par (objet, segment)
+        entries.sort(key=lambda e: (e[0], e[1]))
+        table = np.array(entries, dtype=np.float64).reshape(-1, 5)
+        self._obj = table[:, 0].astype(np.int64)
+        self._seg = table[:, 1].astype(np.int64)
+        self._delta = table[:, 2:5]
+        # somme cumulée exclusive : _cum[i] = somme des deltas [0, i)
+        self._cum = np.vstack([np.zeros((1, 3)), np.cumsum(self._delta, axis=0)])
+        # clé de recherche globale (objet, segment) -> un seul searchsorted
+        self._key = self._obj * (self._n_segments + 1) + self._seg
+
+    # ---------- Construction ----------
+
+    @classmethod
+    def from_program(cls, program: Program, strict: bool = True) -> "Timeline":
+        """
+        strict=True : lève ValueError pour une animation sur un id jamais
+        créé (objects['...'] échouerait au rendu) ou une durée <= 0.
+        strict=False : ces animations sont ignorées.
+        """
+        index: Dict[str, int] = {}
+        initial: List[List[float]] = []
+        for instr in program.instructions:
+            if isinstance(instr, CreateInstruction) and instr.id:
+                pos = [instr.x or 0.0, instr.y or 0.0, 0.0]
+                if instr.id in index:
+                    initial[index[instr.id]] = pos  # objects[id] = dernier créé
+                else:
+                    index[instr.id] = len(initial)
+                    initial.append(pos)
+
+        durations: List[float] = []
+        entries: List[Tuple[int, int, float, float, float]] = []
+        for instr in program.instructions:
+            if isinstance(instr, CreateInstruction):
+                continue
+            if isinstance(instr, PlayGroup):
+                animations, run_time = instr.animations, instr.duration
+            else:
+                animations, run_time = [instr], instr.duration or 1.0
+
+            segment: Dict[int, List[float]] = {}
+            for anim in animations:
+                obj = index.get(anim.target_id)
+                if obj is None:
+                    if strict:
+                        raise ValueError(f"Animation sur '{anim.target_id}', objet jamais créé")
+                    continue
+                delta = segment.setdefault(obj, [0.0, 0.0, 0.0])
+                if isinstance(anim, MoveInstruction):
+                    delta[0] += anim.dx or 0.0
+                    delta[1] += anim.dy or 0.0
+                elif isinstance(anim, RotateInstruction):
+                    delta[2] += anim.angle or 0.0
+            if not segment:
+                continue
+            if run_time <= 0:
+                if strict:
+                    raise ValueError(f"run_time invalide : {run_time}")
+                run_time = 0.0
+
+            seg = len(durations)
+            durations.append(run_time)
+            entries.extend((obj, seg, d[0], d[1], d[2]) for obj, d in segment.items())
+
+        return cls(
+            ids=list(index),
+            initial=np.array(initial, dtype=np.float64).reshape(-1, 3),
+            seg_durations=np.array(durations, dtype=np.float64),
+            entries=entries,
+        )
+
+    # ---------- Évaluation ----------
+
+    @property
+    def duration(self) -> float:
+        """Durée totale de la scène (somme des run_time)."""
+        return float(self.seg_end[-1]) if self._n_segments else 0.0
+
+    def frame_times(self, fps: float = 60.0) -> np.ndarray:
+        """Grille d'instants 0, 1/fps, ... jusqu'à la fin de la scène incluse."""
+        n = int(np.floor(self.duration * fps + 1e-9))
+        times = np.arange(n + 1, dtype=np.float64) / fps
+        if times[-1] < self.duration:
+            times = np.append(times, self.duration)
+        return times
+
+    def sample(self, times: Union[float, Iterable[float], np.ndarray]) -> np.ndarray:
+        """
+        États (x, y, angle en degrés) de tous les objets aux instants donnés :
+        tableau (len(times), K, 3), objets dans l'ordre de self.ids.
+        """
+        t = np.atleast_1d(np.asarray(times, dtype=np.float64))
+        n_obj = len(self.ids)
+        out = np.broadcast_to(self.initial, (len(t), n_obj, 3)).copy()
+        if not len(self._obj) or not n_obj:
+            return out
+
+        # segment en cours à chaque instant (= nombre de segments terminés)
+        current = np.searchsorted(self.seg_end, t, side="right")           # (N,)
+        objs = np.arange(n_obj)
+
+        # première animation de chaque objet, puis première au segment courant ou après
+        first = np.searchsorted(self._key, objs * (self._n_segments + 1))  # (K,)
+        query = objs[:, None] * (self._n_segments + 1) + current[None, :]  # (K, N)
+        idx = np.searchsorted(self._key, query)                             # (K, N)
+        done = self._cum[idx] - self._cum[first][:, None, :]                # (K, N, 3)
+
+        # animation de l'objet en cours pendant le segment courant
+        safe = np.minimum(idx, len(self._key) - 1)
+        playing = (idx < len(self._key)) & (self._key[safe] == query)
+        seg = np.minimum(current, self._n_segments - 1)
+        length = self.seg_end[seg] - self.seg_start[seg]
+        alpha = np.where(
+            length > 0,
+            (t - self.seg_start[seg]) / np.where(length > 0, length, 1.0),
+            1.0,
+        )
+        progress = np.where(playing, smooth(np.clip(alpha, 0.0, 1.0))[None, :], 0.0)
+        done += progress[:, :, None] * self._delta[safe]
+
+        out += done.transpose(1, 0, 2)
+        return out
+
+    def state_at(self, t: float) -> Dict[str, Tuple[float, float, float]]:
+        """{id: (x, y, angle)} à l'instant t."""
+        return self._as_dict(self.sample(t)[0])
+
+    def final_state(self) -> np.ndarray:
+        """États (K, 3) en fin de scène, sans interpolation."""
+        final = self.initial.copy()
+        np.add.at(final, self._obj, self._delta)
+        return final
+
+    def final_positions(self) -> Dict[str, Tuple[float, float, float]]:
+        """{id: (x, y, angle)} en fin de scène (étiquettes de dataset)."""
+        return self._as_dict(self.final_state())
+
+    def _as_dict(self, states: np.ndarray) -> Dict[str, Tuple[float, float, float]]:
+        return {obj_id: tuple(map(float, row)) for obj_id, row in zip(self.ids, states)}
+
+
+def simulate(program: Program, strict: bool = True) -> Timeline:
+    return Timeline.from_program(program, strict=strict)
+
+
+def equivalent(
+    a: Program,
+    b: Program,
+    atol: float = 1e-9,
+    times: Optional[np.ndarray] = None,
+) -> bool:
+    """
+    True si les deux scènes ont les mêmes objets et le même état final
+    (par ex. un programme et sa version optimisée). Avec `times`, compare
+    aussi les états à ces instants (mêmes déroulés temporels).
+    """
+    ta, tb = Timeline.from_program(a, strict=False), Timeline.from_program(b, strict=False)
+    if ta.ids != tb.ids:
+        return False
+    if not np.allclose(ta.final_state(), tb.final_state(), atol=atol, rtol=0.0):
+        return False
+    if times is not None:
+        return bool(np.allclose(ta.sample(times), tb.sample(times), atol=atol, rtol=0.0))
+    return True
+
+
+__all__ = ["Timeline", "simulate", "equivalent", "smooth"]